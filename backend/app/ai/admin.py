@@ -1,6 +1,6 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\admin.py
 from django.contrib import admin
-from .models import DocumentAnalysis
+from .models import DocumentAnalysis, AnalysisCacheEntry
 
 # gera interface para gerenciar os Dados.
 
@@ -11,3 +11,18 @@ class DocumentAnalysisAdmin(admin.ModelAdmin):
     list_filter = ("status", "model_used")
     search_fields = ("document__name", "summary")
     readonly_fields = ("created_at", "last_updated_at")
+
+
+@admin.register(AnalysisCacheEntry)
+class AnalysisCacheEntryAdmin(admin.ModelAdmin):
+    list_display = (
+        "text_hash",
+        "model_name",
+        "prompt_version",
+        "hit_count",
+        "created_at",
+        "last_accessed_at",
+    )
+    list_filter = ("model_name", "prompt_version")
+    search_fields = ("text_hash",)
+    readonly_fields = ("created_at", "last_accessed_at", "hit_count")
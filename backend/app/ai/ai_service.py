@@ -2,12 +2,79 @@
 import os
 import json
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+
+from app.ai.chunking import estimate_tokens, split_into_chunks
+from app.ai.streaming import PartialResultParser
 
 
 # Configuração de logging
 logger = logging.getLogger(__name__)
 
+PROMPT_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "prompt_template.txt")
+REDUCE_PROMPT_TEMPLATE_PATH = os.path.join(
+    os.path.dirname(__file__), "reduce_prompt_template.txt"
+)
+RESULT_KEYS = ("summary", "missing_topics", "insights")
+# Marca resultados de fallback (JSON inválido, consolidação local): não vão para o cache
+DEGRADED_KEY = "degraded"
+
+
+@lru_cache(maxsize=None)
+def load_prompt_template(path: str = PROMPT_TEMPLATE_PATH) -> str:
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def build_prompt(document_content: str) -> str:
+    return load_prompt_template().format(document_content=document_content)
+
+
+def build_reduce_prompt(partial_results: list) -> str:
+    return load_prompt_template(REDUCE_PROMPT_TEMPLATE_PATH).format(
+        chunk_count=len(partial_results),
+        partial_results=json.dumps(partial_results, ensure_ascii=False, indent=2),
+    )
+
+
+def _unique(items):
+    seen = set()
+    unique_items = []
+    for item in items:
+        key = str(item).strip().casefold()
+        if key and key not in seen:
+            seen.add(key)
+            unique_items.append(item)
+    return unique_items
+
+
+def merge_results(partial_results: list) -> dict:
+    """
+    Consolidação local (determinística) das análises parciais: concatena os
+    resumos e une tópicos faltantes e insights sem repetições.
+    """
+    return {
+        "summary": "\n\n".join(
+            result.get("summary") for result in partial_results if result.get("summary")
+        ),
+        "missing_topics": _unique(
+            topic
+            for result in partial_results
+            for topic in (result.get("missing_topics") or [])
+        ),
+        "insights": _unique(
+            insight
+            for result in partial_results
+            for insight in (result.get("insights") or [])
+        ),
+    }
+
 
 class AIService(ABC):
     """
@@ -15,26 +82,156 @@ class AIService(ABC):
     Define a interface comum para diferentes modelos de IA.
     """
 
+    model_id = None
+    provider_label = "IA"
+
     def __init__(self, api_key: str):
         self.api_key = api_key
         if not self.api_key:
             raise ValueError(f"API Key não configurada para {self.__class__.__name__}.")
 
     @abstractmethod
-    def analyze_document(self, document_content: str) -> dict:
+    def generate(self, prompt: str) -> str:
         """
-        Método abstrato para analisar o conteúdo de um documento.
+        Envia o prompt ao modelo e retorna o texto bruto da resposta.
         Deve ser implementado por cada modelo de IA específico.
-        Retorna um dicionário com 'summary', 'missing_topics', 'insights'.
         """
         pass
 
+    def generate_stream(self, prompt: str):
+        """
+        Gera o texto da resposta em partes, à medida que o modelo responde.
+        Padrão: a resposta inteira em uma única parte.
+        """
+        yield self.generate(prompt)
+
+    def analyze_document(self, document_content: str, on_partial=None) -> dict:
+        """
+        Analisa o conteúdo de um documento.
+        Retorna um dicionário com 'summary', 'missing_topics', 'insights'.
+        Documentos acima do orçamento de tokens são analisados em blocos
+        (map-reduce), ver analyze_document_chunked.
+
+        Com `on_partial`, a resposta é gerada em streaming e o callback recebe
+        o resultado parcial (resumo e itens já concluídos) a cada mudança.
+        """
+        logger.info(
+            f"Analisando documento com {self.provider_label}. Conteúdo: {document_content[:100]}..."
+        )
+
+        chunking_enabled = getattr(settings, "AI_CHUNKING_ENABLED", True)
+        max_tokens = getattr(settings, "AI_CHUNK_MAX_TOKENS", 30000)
+        if chunking_enabled and estimate_tokens(document_content) > max_tokens:
+            return self.analyze_document_chunked(document_content, on_partial=on_partial)
+
+        return self._analyze_prompt(build_prompt(document_content), on_partial=on_partial)
+
+    def _generate_streaming(self, prompt: str, on_partial) -> str:
+        parser = PartialResultParser()
+        for delta in self.generate_stream(prompt):
+            if not delta:
+                continue
+            partial = parser.feed(delta)
+            if partial:
+                on_partial(partial)
+        return parser.text
+
+    def _analyze_prompt(self, prompt: str, on_partial=None) -> dict:
+        try:
+            if on_partial is not None and getattr(settings, "AI_STREAMING_ENABLED", True):
+                response_text = self._generate_streaming(prompt, on_partial)
+            else:
+                response_text = self.generate(prompt)
+            result = self.parse_response(response_text)
+            logger.info(f"Análise {self.provider_label} concluída com sucesso")
+            return result
+        except Exception as e:
+            logger.error(f"Erro na análise com {self.provider_label}: {e}")
+            raise
+
+    def parse_response(self, response_text: str) -> dict:
+        """Converte a resposta do modelo no dicionário de resultados."""
+        # Limpar possíveis markdown code blocks
+        if "```json" in response_text:
+            response_text = response_text.split("```json")[1].split("```")[0].strip()
+        elif "```" in response_text:
+            response_text = response_text.split("```")[1].split("```")[0].strip()
+
+        try:
+            result = json.loads(response_text)
+        except json.JSONDecodeError as e:
+            logger.error(
+                f"Erro ao parsear resposta JSON do {self.provider_label}: {e}"
+            )
+            # Fallback: retornar resposta estruturada manualmente
+            return {
+                "summary": response_text[:500],
+                "missing_topics": [],
+                "insights": ["Análise gerada mas formato JSON inválido"],
+                DEGRADED_KEY: True,
+            }
+
+        # Validar estrutura esperada
+        if not all(key in result for key in RESULT_KEYS):
+            raise ValueError("Resposta da IA não contém todas as chaves esperadas")
+        return result
+
+    # ========================================================================
+    # Map-reduce para documentos maiores que o orçamento de tokens
+    # ========================================================================
+    def analyze_document_chunked(self, document_content: str, on_partial=None) -> dict:
+        """
+        Divide o documento em blocos (limites de cláusulas/seções), analisa os
+        blocos em paralelo e consolida os resultados em uma etapa de redução.
+        O tempo total passa a depender do número de blocos em paralelo, não do
+        tamanho do documento. Apenas a etapa de redução é transmitida em
+        streaming (`on_partial`).
+        """
+        chunks = split_into_chunks(document_content)
+        if len(chunks) == 1:
+            return self._analyze_prompt(build_prompt(chunks[0]), on_partial=on_partial)
+
+        concurrency = getattr(settings, "AI_CHUNK_CONCURRENCY", 4)
+        logger.info(
+            f"Documento dividido em {len(chunks)} blocos para análise com "
+            f"{self.provider_label} (concorrência {concurrency})"
+        )
+
+        prompts = [
+            build_prompt(f"[Trecho {index} de {len(chunks)}]\n{chunk}")
+            for index, chunk in enumerate(chunks, start=1)
+        ]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as executor:
+            partial_results = list(executor.map(self._analyze_prompt, prompts))
+
+        result = self.reduce_results(partial_results, on_partial=on_partial)
+        # Um bloco com resposta inválida contamina o resultado consolidado
+        if any(partial.get(DEGRADED_KEY) for partial in partial_results):
+            result[DEGRADED_KEY] = True
+        return result
+
+    def reduce_results(self, partial_results: list, on_partial=None) -> dict:
+        """Consolida as análises parciais com o modelo; em falha, usa merge local."""
+        try:
+            return self._analyze_prompt(
+                build_reduce_prompt(partial_results), on_partial=on_partial
+            )
+        except Exception as e:
+            logger.warning(
+                f"Falha na etapa de redução com {self.provider_label}, "
+                f"usando consolidação local: {e}"
+            )
+            return {**merge_results(partial_results), DEGRADED_KEY: True}
+
 
 class GeminiAIService(AIService):
     """
     Serviço de IA para integração com o modelo Gemini.
     """
 
+    model_id = "gemini-2.5-flash"
+    provider_label = "Gemini"
+
     def __init__(self, api_key: str = None):
         gemini_api_key = api_key or os.getenv("GEMINI_API_KEY")
         super().__init__(gemini_api_key)
@@ -44,7 +241,7 @@ class GeminiAIService(AIService):
             import google.generativeai as genai
 
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel("gemini-2.5-flash")
+            self.model = genai.GenerativeModel(self.model_id)
             logger.info("Serviço Gemini AI inicializado com sucesso.")
         except ImportError:
             logger.error(
@@ -55,69 +252,17 @@ class GeminiAIService(AIService):
             logger.error(f"Erro ao inicializar Gemini AI: {e}")
             raise
 
-    def analyze_document(self, document_content: str) -> dict:
+    def generate(self, prompt: str) -> str:
         """
-        Implementação da análise de documento usando o modelo Gemini.
+        Chamada ao modelo Gemini.
         """
-        logger.info(
-            f"Analisando documento com Gemini AI. Conteúdo: {document_content[:100]}..."
-        )
-
-        try:
-            # Carregar o template de prompt
-            prompt_template_path = os.path.join(
-                os.path.dirname(__file__), "prompt_template.txt"
-            )
-
-            with open(prompt_template_path, "r", encoding="utf-8") as f:
-                prompt_template = f.read()
-
-            # Formatar o prompt com o conteúdo do documento
-            prompt = prompt_template.format(document_content=document_content)
-
-            # Chamar a API do Gemini
-            response = self.model.generate_content(prompt)
-
-            # Extrair o texto da resposta
-            response_text = response.text
+        response = self.model.generate_content(prompt)
+        return response.text
 
-            # Tentar parsear como JSON
-            try:
-                # Limpar possíveis markdown code blocks
-                if "```json" in response_text:
-                    response_text = (
-                        response_text.split("```json")[1].split("```")[0].strip()
-                    )
-                elif "```" in response_text:
-                    response_text = (
-                        response_text.split("```")[1].split("```")[0].strip()
-                    )
-
-                result = json.loads(response_text)
-
-                # Validar estrutura esperada
-                if not all(
-                    key in result for key in ["summary", "missing_topics", "insights"]
-                ):
-                    raise ValueError(
-                        "Resposta da IA não contém todas as chaves esperadas"
-                    )
-
-                logger.info("Análise Gemini concluída com sucesso")
-                return result
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro ao parsear resposta JSON do Gemini: {e}")
-                # Fallback: retornar resposta estruturada manualmente
-                return {
-                    "summary": response_text[:500],
-                    "missing_topics": [],
-                    "insights": ["Análise gerada mas formato JSON inválido"],
-                }
-
-        except Exception as e:
-            logger.error(f"Erro na análise com Gemini: {e}")
-            raise
+    def generate_stream(self, prompt: str):
+        """Chamada ao modelo Gemini em streaming (partes da resposta)."""
+        for chunk in self.model.generate_content(prompt, stream=True):
+            yield chunk.text
 
 
 class OpenAIAIService(AIService):
@@ -125,6 +270,9 @@ class OpenAIAIService(AIService):
     Serviço de IA para integração com o modelo OpenAI.
     """
 
+    model_id = "gpt-4-turbo-preview"  # ou "gpt-3.5-turbo" para economia
+    provider_label = "OpenAI"
+
     def __init__(self, api_key: str = None):
         openai_api_key = api_key or os.getenv("OPENAI_API_KEY")
         super().__init__(openai_api_key)
@@ -142,71 +290,36 @@ class OpenAIAIService(AIService):
             logger.error(f"Erro ao inicializar OpenAI: {e}")
             raise
 
-    def analyze_document(self, document_content: str) -> dict:
+    def generate(self, prompt: str) -> str:
         """
-        Implementação da análise de documento usando o modelo OpenAI.
+        Chamada ao modelo OpenAI.
         """
-        logger.info(
-            f"Analisando documento com OpenAI. Conteúdo: {document_content[:100]}..."
-        )
-
-        try:
-            # Carregar o template de prompt
-            prompt_template_path = os.path.join(
-                os.path.dirname(__file__), "prompt_template.txt"
-            )
+        response = self.client.chat.completions.create(**self._completion_kwargs(prompt))
+        return response.choices[0].message.content
 
-            with open(prompt_template_path, "r", encoding="utf-8") as f:
-                prompt_template = f.read()
-
-            # Formatar o prompt com o conteúdo do documento
-            prompt = prompt_template.format(document_content=document_content)
-
-            # Chamar a API do OpenAI
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",  # ou "gpt-3.5-turbo" para economia
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Você é um assistente especializado em análise de documentos legais.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},  # Força resposta em JSON
-                temperature=0.3,  # Mais determinístico
-                max_tokens=2000,
-            )
-
-            # Extrair o texto da resposta
-            response_text = response.choices[0].message.content
-
-            # Parsear JSON
-            try:
-                result = json.loads(response_text)
-
-                # Validar estrutura esperada
-                if not all(
-                    key in result for key in ["summary", "missing_topics", "insights"]
-                ):
-                    raise ValueError(
-                        "Resposta da IA não contém todas as chaves esperadas"
-                    )
-
-                logger.info("Análise OpenAI concluída com sucesso")
-                return result
-
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro ao parsear resposta JSON do OpenAI: {e}")
-                # Fallback
-                return {
-                    "summary": response_text[:500],
-                    "missing_topics": [],
-                    "insights": ["Análise gerada mas formato JSON inválido"],
-                }
-
-        except Exception as e:
-            logger.error(f"Erro na análise com OpenAI: {e}")
-            raise
+    def generate_stream(self, prompt: str):
+        """Chamada ao modelo OpenAI em streaming (deltas da resposta)."""
+        stream = self.client.chat.completions.create(
+            **self._completion_kwargs(prompt), stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    def _completion_kwargs(self, prompt: str) -> dict:
+        return {
+            "model": self.model_id,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Você é um assistente especializado em análise de documentos legais.",
+                },
+                {"role": "user", "content": prompt},
+            ],
+            "response_format": {"type": "json_object"},  # Força resposta em JSON
+            "temperature": 0.3,  # Mais determinístico
+            "max_tokens": getattr(settings, "AI_OPENAI_MAX_OUTPUT_TOKENS", 2000),
+        }
 
 
 # Adicione outras classes de serviço de IA conforme necessário (e.g., HuggingFaceAIService, SpaCyAIService)
@@ -225,6 +338,16 @@ class AIProvider:
             # Adicione outros provedores aqui
         }
 
+    def get_model_id(self, model_name: str = None) -> str:
+        """
+        Retorna o identificador do modelo concreto (ex: 'gemini-2.5-flash')
+        sem instanciar o serviço.
+        """
+        model_to_use = model_name or self.default_model
+        if model_to_use not in self.providers:
+            raise ValueError(f"Modelo de IA '{model_to_use}' não suportado.")
+        return self.providers[model_to_use].model_id
+
     def get_service(self, model_name: str = None) -> AIService:
         """
         Retorna uma instância do serviço de IA para o modelo especificado.
@@ -249,3 +372,76 @@ class AIProvider:
 
         # As API Keys serão lidas do ambiente dentro do construtor de cada serviço
         return service_class()
+
+
+class AIServiceRegistry:
+    """
+    Registro de serviços de IA compartilhado pelo processo (um por modelo).
+    O cliente (GenerativeModel / OpenAI) é construído uma única vez por
+    processo worker e reutilizado pelas tasks, mantendo as conexões HTTP
+    abertas entre as análises.
+    """
+
+    _lock = threading.Lock()
+    _services = {}
+    _stats = {}
+
+    @classmethod
+    def get_service(cls, model_name: str = "gemini") -> AIService:
+        service = cls._services.get(model_name)
+        if service is not None:
+            cls._stats[model_name]["uses"] += 1
+            return service
+
+        with cls._lock:
+            service = cls._services.get(model_name)
+            if service is None:
+                started_at = time.perf_counter()
+                service = AIProvider(default_model=model_name).get_service(model_name)
+                cls._services[model_name] = service
+                cls._stats[model_name] = {
+                    "created_at": time.time(),
+                    "build_seconds": round(time.perf_counter() - started_at, 4),
+                    "uses": 0,
+                }
+                logger.info(f"Serviço de IA '{model_name}' criado para o processo {os.getpid()}.")
+            cls._stats[model_name]["uses"] += 1
+        return service
+
+    @classmethod
+    def warm_up(cls, model_names=None):
+        """
+        Constrói antecipadamente os serviços (ex: no worker_process_init do
+        Celery) e carrega os templates de prompt. Modelos sem API Key
+        configurada são ignorados.
+        """
+        model_names = model_names or getattr(settings, "AI_WARMUP_MODELS", ["gemini"])
+        load_prompt_template()
+        load_prompt_template(REDUCE_PROMPT_TEMPLATE_PATH)
+
+        for model_name in model_names:
+            try:
+                cls.get_service(model_name)
+            except Exception as e:
+                logger.warning(f"Não foi possível pré-carregar o serviço de IA '{model_name}': {e}")
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {"pid": os.getpid(), "services": dict(cls._stats)}
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._services = {}
+            cls._stats = {}
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # Clientes gRPC/HTTP não podem ser compartilhados com o processo pai
+        cls._lock = threading.Lock()
+        cls._services = {}
+        cls._stats = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=AIServiceRegistry._reset_after_fork)
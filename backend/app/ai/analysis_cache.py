@@ -0,0 +1,203 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\analysis_cache.py
+import hashlib
+import logging
+import re
+from datetime import timedelta
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from app.ai.ai_service import (
+    DEGRADED_KEY,
+    PROMPT_TEMPLATE_PATH,
+    REDUCE_PROMPT_TEMPLATE_PATH,
+)
+from app.ai.models import AnalysisCacheEntry
+
+logger = logging.getLogger(__name__)
+
+# Template principal e template da etapa de redução (análise em blocos)
+PROMPT_TEMPLATE_PATHS = (PROMPT_TEMPLATE_PATH, REDUCE_PROMPT_TEMPLATE_PATH)
+
+# Contadores compartilhados entre processos (via Django cache)
+HITS_COUNTER_KEY = "ai_analysis_cache:hits"
+MISSES_COUNTER_KEY = "ai_analysis_cache:misses"
+# Marca a última evicção: no máximo uma a cada intervalo, entre todos os processos
+EVICTION_MARKER_KEY = "ai_analysis_cache:evicted"
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normaliza o texto para que variações irrelevantes (espaços, quebras de
+    linha, extração do mesmo template em PDFs diferentes) gerem o mesmo hash.
+    """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_prompt_template_version() -> str:
+    """
+    Versão dos templates de prompt. Pode ser fixada via settings; por padrão é
+    derivada do conteúdo dos arquivos, invalidando o cache quando o prompt muda.
+    """
+    configured = getattr(settings, "AI_PROMPT_TEMPLATE_VERSION", None)
+    if configured:
+        return configured
+
+    templates_hash = hashlib.sha256()
+    for template_path in PROMPT_TEMPLATE_PATHS:
+        with open(template_path, "rb") as template_file:
+            templates_hash.update(template_file.read())
+    return templates_hash.hexdigest()[:12]
+
+
+class AnalysisCache:
+    """
+    Cache de análises de IA por (hash do texto normalizado, modelo, versão do
+    prompt), persistido no banco para ser compartilhado entre workers.
+    Entradas expiram após o TTL e, acima do limite, as menos acessadas
+    recentemente são removidas (LRU).
+    """
+
+    def __init__(self, ttl_seconds=None, max_entries=None):
+        self.enabled = getattr(settings, "AI_ANALYSIS_CACHE_ENABLED", True)
+        self.ttl_seconds = ttl_seconds or getattr(
+            settings, "AI_ANALYSIS_CACHE_TTL_SECONDS", 7 * 24 * 3600
+        )
+        self.max_entries = max_entries or getattr(
+            settings, "AI_ANALYSIS_CACHE_MAX_ENTRIES", 10000
+        )
+
+    @staticmethod
+    def build_key(text_hash: str, model_name: str, prompt_version: str) -> str:
+        raw_key = f"{text_hash}:{model_name}:{prompt_version}"
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def _expires_before(self):
+        return timezone.now() - timedelta(seconds=self.ttl_seconds)
+
+    # ========================================================================
+    # Leitura
+    # ========================================================================
+    def get(self, document_content: str, model_name: str):
+        """Retorna o resultado em cache ou None (miss)."""
+        if not self.enabled:
+            return None
+
+        text_hash = hash_text(document_content)
+        cache_key = self.build_key(text_hash, model_name, get_prompt_template_version())
+
+        entry = AnalysisCacheEntry.objects.filter(cache_key=cache_key).first()
+
+        if entry and entry.created_at < self._expires_before():
+            entry.delete()
+            entry = None
+
+        if entry is None:
+            self._increment(MISSES_COUNTER_KEY)
+            return None
+
+        AnalysisCacheEntry.objects.filter(pk=entry.pk).update(
+            hit_count=F("hit_count") + 1, last_accessed_at=timezone.now()
+        )
+        self._increment(HITS_COUNTER_KEY)
+        logger.info(f"Cache de análise de IA: hit para texto {text_hash[:12]}")
+        return entry.as_results()
+
+    # ========================================================================
+    # Escrita + evicção LRU
+    # ========================================================================
+    def set(self, document_content: str, model_name: str, results: dict):
+        if not self.enabled:
+            return
+        # Resultado de fallback não pode ser servido a outros documentos por dias
+        if results.get(DEGRADED_KEY):
+            logger.info("Cache de análise de IA: resultado degradado não armazenado")
+            return
+
+        text_hash = hash_text(document_content)
+        prompt_version = get_prompt_template_version()
+
+        _, created = AnalysisCacheEntry.objects.update_or_create(
+            cache_key=self.build_key(text_hash, model_name, prompt_version),
+            defaults={
+                "text_hash": text_hash,
+                "model_name": model_name,
+                "prompt_version": prompt_version,
+                "summary": results.get("summary"),
+                "missing_topics": results.get("missing_topics"),
+                "insights": results.get("insights"),
+                "created_at": timezone.now(),
+                "last_accessed_at": timezone.now(),
+            },
+        )
+        # Atualizar uma entrada existente não aumenta o cache
+        if created:
+            self.evict_if_due()
+
+    def evict_if_due(self):
+        """Executa a evicção se a última foi há mais de AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS."""
+        interval = getattr(settings, "AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS", 300)
+        if interval > 0:
+            try:
+                if not cache.add(EVICTION_MARKER_KEY, 1, timeout=interval):
+                    return
+            except Exception as e:
+                logger.warning(f"Falha ao verificar o intervalo de evicção do cache de IA: {e}")
+                return
+        self.evict()
+
+    def evict(self):
+        """Remove entradas expiradas e, acima do limite, as menos usadas (LRU)."""
+        AnalysisCacheEntry.objects.filter(
+            created_at__lt=self._expires_before()
+        ).delete()
+
+        overflow = AnalysisCacheEntry.objects.count() - self.max_entries
+        if overflow <= 0:
+            return
+
+        overflow_ids = list(
+            AnalysisCacheEntry.objects.order_by("last_accessed_at").values_list(
+                "id", flat=True
+            )[:overflow]
+        )
+        if overflow_ids:
+            AnalysisCacheEntry.objects.filter(id__in=overflow_ids).delete()
+            logger.info(
+                f"Cache de análise de IA: {len(overflow_ids)} entradas removidas (LRU)"
+            )
+
+    # ========================================================================
+    # Métricas
+    # ========================================================================
+    @staticmethod
+    def _increment(counter_key: str):
+        # Falha no backend de cache não pode impedir a análise
+        try:
+            cache.add(counter_key, 0, timeout=None)
+            cache.incr(counter_key)
+        except Exception as e:
+            logger.warning(f"Falha ao atualizar contador {counter_key}: {e}")
+
+    def stats(self) -> dict:
+        hits = cache.get(HITS_COUNTER_KEY, 0)
+        misses = cache.get(MISSES_COUNTER_KEY, 0)
+        lookups = hits + misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": AnalysisCacheEntry.objects.count(),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "prompt_version": get_prompt_template_version(),
+        }
@@ -0,0 +1,79 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\chunking.py
+import math
+import re
+
+from django.conf import settings
+
+# Quebras de seção: linha em branco ou início de cláusula/artigo/seção/item
+# numerado ("CLÁUSULA 3", "Art. 5", "SEÇÃO II", "4.1 ").
+SECTION_BOUNDARY = re.compile(
+    r"\n\s*\n"
+    r"|\n(?=[ \t]*(?:CL[ÁA]USULA|Cl[áa]usula|ARTIGO|Artigo|Art\.|SE[ÇC][ÃA]O|"
+    r"Se[çc][ãa]o|CAP[ÍI]TULO|Cap[íi]tulo|\d+(?:\.\d+)*[.)]?\s))"
+)
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.;:!?])\s+")
+CHUNK_SEPARATOR = "\n\n"
+
+
+def _chars_per_token() -> float:
+    return getattr(settings, "AI_CHARS_PER_TOKEN", 4)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa de tokens sem tokenizer (≈ 4 caracteres por token)."""
+    return math.ceil(len(text or "") / _chars_per_token())
+
+
+def split_sections(text: str) -> list:
+    return [section.strip() for section in SECTION_BOUNDARY.split(text) if section.strip()]
+
+
+def _split_oversized(section: str, max_chars: int):
+    """Seção maior que o orçamento: divide por frases e, em último caso, por tamanho."""
+    if len(section) <= max_chars:
+        yield section
+        return
+
+    current = ""
+    for sentence in SENTENCE_BOUNDARY.split(section):
+        while len(sentence) > max_chars:
+            if current:
+                yield current
+                current = ""
+            yield sentence[:max_chars]
+            sentence = sentence[max_chars:]
+
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            yield current
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        yield current
+
+
+def split_into_chunks(text: str, max_tokens: int = None) -> list:
+    """
+    Divide o texto em blocos de até `max_tokens` (estimados), respeitando
+    os limites de cláusulas/seções sempre que possível.
+    """
+    max_tokens = max_tokens or getattr(settings, "AI_CHUNK_MAX_TOKENS", 30000)
+    max_chars = int(max_tokens * _chars_per_token())
+
+    chunks = []
+    current = []
+    current_chars = 0
+    for section in split_sections(text):
+        for piece in _split_oversized(section, max_chars):
+            added_chars = len(piece) + (len(CHUNK_SEPARATOR) if current else 0)
+            if current and current_chars + added_chars > max_chars:
+                chunks.append(CHUNK_SEPARATOR.join(current))
+                current, current_chars = [], 0
+                added_chars = len(piece)
+            current.append(piece)
+            current_chars += added_chars
+
+    if current:
+        chunks.append(CHUNK_SEPARATOR.join(current))
+    return chunks
@@ -0,0 +1,42 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\inflight.py
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+INFLIGHT_KEY_PREFIX = "ai_analysis_inflight"
+
+
+def inflight_key(document_id: int, text_ref: str, model_name: str) -> str:
+    return f"{INFLIGHT_KEY_PREFIX}:{document_id}:{text_ref}:{model_name}"
+
+
+def claim_analysis_run(document_id: int, text_ref: str, model_name: str) -> tuple:
+    """
+    Reserva a execução da análise para (documento, hash do conteúdo, modelo).
+    Retorna (run_id, criado). Se já houver uma execução em andamento para a
+    mesma chave, retorna o run_id dela e criado=False: o pedido é anexado à
+    execução existente, sem nova chamada à IA.
+    """
+    key = inflight_key(document_id, text_ref, model_name)
+    run_id = str(uuid.uuid4())
+    timeout = getattr(settings, "AI_ANALYSIS_INFLIGHT_TTL_SECONDS", 1800)
+
+    if cache.add(key, run_id, timeout=timeout):
+        return run_id, True
+
+    current_run_id = cache.get(key)
+    if current_run_id is None:
+        # A execução anterior terminou entre o add e o get
+        return claim_analysis_run(document_id, text_ref, model_name)
+    return current_run_id, False
+
+
+def release_analysis_run(document_id: int, text_ref: str, model_name: str, run_id):
+    """Libera a chave somente se ela ainda pertence a esta execução."""
+    key = inflight_key(document_id, text_ref, model_name)
+    if run_id and cache.get(key) == run_id:
+        cache.delete(key)
@@ -0,0 +1,66 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.ai.ai_service import (
+    PROMPT_TEMPLATE_PATH,
+    AIProvider,
+    AIServiceRegistry,
+    build_prompt,
+)
+
+API_KEY_ENV = {"gemini": "GEMINI_API_KEY", "openai": "OPENAI_API_KEY"}
+
+
+def _per_call_ms(func, iterations):
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - started_at) * 1000 / iterations
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o custo por task da preparação do serviço de IA: cliente novo + "
+        "template lido do disco (antes) vs. registro do processo (depois). "
+        "Não faz chamadas à API do modelo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--models", default="gemini,openai")
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **kwargs):
+        iterations = kwargs["iterations"]
+        document_content = "Cláusula de exemplo. " * 200
+
+        for model_name in kwargs["models"].split(","):
+            # Construir o cliente não faz chamadas de rede; uma chave fictícia basta
+            if model_name in API_KEY_ENV:
+                os.environ.setdefault(API_KEY_ENV[model_name], "benchmark-key")
+
+            def cold_path():
+                AIProvider(default_model=model_name).get_service(model_name)
+                with open(PROMPT_TEMPLATE_PATH, "r", encoding="utf-8") as f:
+                    f.read().format(document_content=document_content)
+
+            def warm_path():
+                AIServiceRegistry.get_service(model_name)
+                build_prompt(document_content)
+
+            try:
+                AIServiceRegistry.warm_up([model_name])
+                cold_ms = _per_call_ms(cold_path, iterations)
+                warm_ms = _per_call_ms(warm_path, iterations)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"{model_name}: ignorado ({e})"))
+                continue
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model_name}: cliente novo {cold_ms:.3f} ms/task | "
+                    f"registro {warm_ms:.3f} ms/task | "
+                    f"{cold_ms / warm_ms:.0f}x mais rápido"
+                )
+            )
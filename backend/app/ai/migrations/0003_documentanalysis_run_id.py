@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0002_analysiscacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='documentanalysis',
+            name='run_id',
+            field=models.UUIDField(blank=True, help_text='Execução vigente da análise; resultados de execuções substituídas são descartados.', null=True),
+        ),
+    ]
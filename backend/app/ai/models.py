@@ -40,8 +40,42 @@ class DocumentAnalysis(models.Model):
         blank=True,
         help_text="Modelo de IA utilizado para a análise (e.g., 'gemini', 'openai').",
     )
+    run_id = models.UUIDField(
+        null=True,
+        blank=True,
+        help_text="Execução vigente da análise; resultados de execuções substituídas são descartados.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     last_updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Análise de IA para Documento {self.document.name} ({self.document.id})"
+
+
+class AnalysisCacheEntry(models.Model):
+    """
+    Cache de resultados de análise de IA, compartilhado entre documentos e
+    empresas. A chave combina o hash do texto normalizado, o modelo de IA e a
+    versão do template de prompt.
+    """
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    text_hash = models.CharField(max_length=64)
+    model_name = models.CharField(max_length=100)
+    prompt_version = models.CharField(max_length=64)
+    summary = models.TextField(null=True, blank=True)
+    missing_topics = models.JSONField(null=True, blank=True)
+    insights = models.JSONField(null=True, blank=True)
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_accessed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def as_results(self) -> dict:
+        return {
+            "summary": self.summary,
+            "missing_topics": self.missing_topics,
+            "insights": self.insights,
+        }
+
+    def __str__(self):
+        return f"Cache de análise {self.model_name}/{self.prompt_version} ({self.text_hash[:12]})"
@@ -0,0 +1,291 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\rate_limiter.py
+import logging
+import math
+import threading
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+
+from app.ai.chunking import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ai_rate_limit"
+
+# Consome todos os baldes de uma vez (ou nenhum). ARGV: agora, e para cada
+# chave: capacidade, reposição por segundo e custo. Retorna a espera em
+# segundos (texto: o Redis truncaria números Lua para inteiro).
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local base = 1 + (i - 1) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    level = math.min(capacity, level + math.max(0, now - ts) * rate)
+    levels[i] = level
+    if level < cost then
+        wait = math.max(wait, (cost - level) / rate)
+    end
+end
+if wait > 0 then
+    return tostring(wait)
+end
+for i, key in ipairs(KEYS) do
+    local base = 1 + (i - 1) * 3
+    local capacity = tonumber(ARGV[base + 1])
+    local rate = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+    redis.call('HSET', key, 'level', levels[i] - cost, 'ts', now,
+               'capacity', capacity, 'rate', rate)
+    redis.call('EXPIRE', key, math.ceil(capacity / rate) * 2 + 60)
+end
+return '0'
+"""
+
+
+def _refilled(level, ts, capacity, rate, now):
+    return min(capacity, level + max(0.0, now - ts) * rate)
+
+
+# ========================================================================
+# Backends
+# ========================================================================
+class MemoryBucketBackend:
+    """
+    Baldes no próprio processo. Usado nos testes (cache em memória) e como
+    contingência quando o Redis está indisponível; não coordena workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def consume(self, buckets, now) -> float:
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key, capacity, rate, cost in buckets:
+                state = self._buckets.get(key)
+                level = capacity if state is None else _refilled(
+                    state["level"], state["ts"], capacity, rate, now
+                )
+                levels.append(level)
+                if level < cost:
+                    wait = max(wait, (cost - level) / rate)
+
+            if wait > 0:
+                return wait
+
+            for (key, capacity, rate, cost), level in zip(buckets, levels):
+                self._buckets[key] = {
+                    "level": level - cost,
+                    "ts": now,
+                    "capacity": capacity,
+                    "rate": rate,
+                }
+            return 0.0
+
+    def levels(self, now) -> dict:
+        with self._lock:
+            return {
+                key: {
+                    "level": round(_refilled(
+                        state["level"], state["ts"], state["capacity"], state["rate"], now
+                    ), 2),
+                    "capacity": state["capacity"],
+                }
+                for key, state in self._buckets.items()
+            }
+
+    def clear(self):
+        with self._lock:
+            self._buckets = {}
+
+
+class RedisBucketBackend:
+    """Baldes no Redis, atualizados atomicamente por um script Lua."""
+
+    def __init__(self, client):
+        self.client = client
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def consume(self, buckets, now) -> float:
+        args = [now]
+        for _, capacity, rate, cost in buckets:
+            args.extend([capacity, rate, cost])
+        wait = self.script(keys=[bucket[0] for bucket in buckets], args=args)
+        return float(wait)
+
+    def levels(self, now) -> dict:
+        levels = {}
+        for key in self.client.scan_iter(match=f"{KEY_PREFIX}:*", count=500):
+            state = self.client.hgetall(key)
+            if not state:
+                continue
+            key = key.decode() if isinstance(key, bytes) else key
+            state = {
+                (field.decode() if isinstance(field, bytes) else field): float(value)
+                for field, value in state.items()
+            }
+            levels[key] = {
+                "level": round(_refilled(
+                    state["level"], state["ts"], state["capacity"], state["rate"], now
+                ), 2),
+                "capacity": state["capacity"],
+            }
+        return levels
+
+
+# ========================================================================
+# Limitador
+# ========================================================================
+def provider_for_model(model_name: str) -> str:
+    return "openai" if (model_name or "").lower() == "openai" else "gemini"
+
+
+def estimate_request_cost(document_content: str) -> tuple:
+    """
+    Custo estimado da análise em (requisições, tokens): entrada + saída
+    esperada por chamada. Documentos em blocos fazem uma chamada por bloco
+    e mais uma de redução.
+    """
+    input_tokens = estimate_tokens(document_content)
+    max_tokens = getattr(settings, "AI_CHUNK_MAX_TOKENS", 30000)
+    requests = 1
+    if getattr(settings, "AI_CHUNKING_ENABLED", True) and input_tokens > max_tokens:
+        requests = math.ceil(input_tokens / max_tokens) + 1
+
+    output_tokens = getattr(settings, "AI_RATE_LIMIT_OUTPUT_TOKENS", 2000)
+    return requests, input_tokens + requests * output_tokens
+
+
+class AIRateLimiter:
+    """
+    Token bucket distribuído por provedor e por empresa, com dois orçamentos:
+    requisições/minuto (rpm) e tokens/minuto (tpm). Limites com valor 0 são
+    desativados. Os baldes ficam no Redis do cache (compartilhados entre os
+    workers do Celery); sem Redis, cada processo usa baldes em memória.
+    """
+
+    _lock = threading.Lock()
+    _backend = None
+    _fallback = MemoryBucketBackend()
+
+    def __init__(self, provider: str, company_id=None, clock=time.time):
+        self.provider = provider
+        self.company_id = company_id
+        self.clock = clock
+
+    @classmethod
+    def get_backend(cls):
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    client = cls._redis_client()
+                    if client is not None:
+                        cls._backend = RedisBucketBackend(client)
+                    else:
+                        cls._backend = cls._fallback
+        return cls._backend
+
+    @staticmethod
+    def _redis_client():
+        """Conexão própria com o Redis do cache "default" (None sem Redis)."""
+        config = settings.CACHES.get("default", {})
+        backend = config.get("BACKEND", "")
+        if backend != f"{RedisCache.__module__}.{RedisCache.__qualname__}":
+            return None
+        location = config["LOCATION"]
+        # Com vários servidores, o primeiro é o de escrita (mesma regra do RedisCache)
+        if isinstance(location, (list, tuple)):
+            location = location[0]
+        else:
+            location = location.split(",")[0]
+        return redis.Redis.from_url(location)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls._backend = None
+            cls._fallback.clear()
+
+    def _buckets(self, requests: int, tokens: int) -> list:
+        provider_limits = getattr(settings, "AI_RATE_LIMITS", {}).get(self.provider, {})
+        scopes = [(f"{KEY_PREFIX}:{self.provider}", provider_limits)]
+        if self.company_id is not None:
+            scopes.append(
+                (
+                    f"{KEY_PREFIX}:{self.provider}:company:{self.company_id}",
+                    getattr(settings, "AI_COMPANY_RATE_LIMITS", {}),
+                )
+            )
+
+        buckets = []
+        for prefix, limits in scopes:
+            for budget, cost in (("rpm", requests), ("tpm", tokens)):
+                capacity = limits.get(budget) or 0
+                if capacity <= 0:
+                    continue
+                # Custo acima da capacidade nunca caberia: consome o balde cheio
+                buckets.append(
+                    (f"{prefix}:{budget}", capacity, capacity / 60.0, min(cost, capacity))
+                )
+        return buckets
+
+    def acquire(self, requests: int = 1, tokens: int = 0) -> float:
+        """
+        Tenta consumir o custo em todos os baldes aplicáveis. Retorna 0 quando
+        liberado ou os segundos até haver saldo suficiente (nada é consumido).
+        """
+        if not getattr(settings, "AI_RATE_LIMIT_ENABLED", True):
+            return 0.0
+
+        buckets = self._buckets(requests, tokens)
+        if not buckets:
+            return 0.0
+
+        try:
+            return self.get_backend().consume(buckets, self.clock())
+        except Exception as e:
+            logger.warning(f"Rate limiter distribuído indisponível, usando memória local: {e}")
+            return self._fallback.consume(buckets, self.clock())
+
+    @classmethod
+    def levels(cls, clock=time.time) -> dict:
+        """Saldo atual de cada balde (já considerando a reposição)."""
+        try:
+            return cls.get_backend().levels(clock())
+        except Exception as e:
+            logger.warning(f"Não foi possível ler os baldes do rate limiter: {e}")
+            return cls._fallback.levels(clock())
+
+    def acquire_or_wait(self, requests: int = 1, tokens: int = 0, max_wait=None) -> float:
+        """
+        Como acquire, mas esperas curtas (até `max_wait` segundos) são feitas no
+        próprio worker. Retorna 0 quando liberado ou a espera restante, para que
+        a task seja reagendada em vez de ocupar o worker.
+        """
+        if max_wait is None:
+            max_wait = getattr(settings, "AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS", 5)
+
+        deadline = self.clock() + max_wait
+        while True:
+            wait_seconds = self.acquire(requests, tokens)
+            if not wait_seconds or self.clock() + wait_seconds > deadline:
+                return wait_seconds
+            time.sleep(wait_seconds)
+
+
+def is_provider_rate_limit_error(error: Exception) -> bool:
+    """HTTP 429 do provedor (openai.RateLimitError / google ResourceExhausted)."""
+    if type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests"):
+        return True
+    return getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429
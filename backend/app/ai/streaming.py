@@ -0,0 +1,128 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\streaming.py
+import json
+
+# Campos do JSON de resposta extraídos enquanto o texto ainda está chegando
+STRING_FIELDS = ("summary",)
+LIST_FIELDS = ("missing_topics", "insights")
+
+
+def _decode_json_string(raw: str) -> str:
+    """
+    Decodifica o conteúdo (possivelmente incompleto) de uma string JSON.
+    Escapes cortados no fim do buffer (ex: '\\' ou '\\u00') são descartados.
+    """
+    for cut in range(0, 6):
+        candidate = raw[: len(raw) - cut] if cut else raw
+        try:
+            return json.loads(f'"{candidate}"')
+        except json.JSONDecodeError:
+            continue
+    return ""
+
+
+def parse_partial_result(text: str) -> dict:
+    """
+    Extrai do JSON ainda incompleto o resumo parcial e os itens de lista já
+    fechados (tópicos faltantes e insights). Campos ausentes são omitidos.
+    """
+    return PartialResultParser().feed(text) or {}
+
+
+class PartialResultParser:
+    """
+    Acumula os trechos do streaming e informa o resultado parcial quando muda.
+
+    O texto é percorrido uma única vez: cada trecho continua a leitura de
+    onde o anterior parou (estado de string/escape, profundidade e chave
+    corrente), em vez de reprocessar o texto inteiro a cada delta.
+    Só os campos do objeto raiz são considerados.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self._last = {}
+        self._partial = {}
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._raw = []  # string em leitura (ainda codificada)
+        self._string_role = None  # "key", campo de texto, "item" ou None
+        self._expect_key = False
+        self._key = None  # última chave lida no objeto raiz
+        self._list_field = None  # campo de lista aberto
+
+    def feed(self, delta: str):
+        self.parts.append(delta)
+        self._scan(delta)
+
+        # Texto do campo ainda aberto: só a string corrente é decodificada
+        if self._in_string and self._string_role in STRING_FIELDS:
+            self._partial[self._string_role] = _decode_json_string("".join(self._raw))
+
+        partial = {
+            field: list(value) if isinstance(value, list) else value
+            for field, value in self._partial.items()
+        }
+        if not partial or partial == self._last:
+            return None
+        self._last = partial
+        return partial
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def _scan(self, delta: str):
+        for char in delta:
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string()
+                    continue
+                self._raw.append(char)
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._raw = []
+                self._string_role = self._role_for_string()
+            elif char in "{[":
+                self._depth += 1
+                if char == "{" and self._depth == 1:
+                    self._expect_key = True
+                elif char == "[" and self._depth == 2 and self._key in LIST_FIELDS:
+                    self._list_field = self._key
+                    self._partial[self._key] = []
+            elif char in "}]":
+                if self._depth == 2:
+                    self._list_field = None
+                self._depth = max(self._depth - 1, 0)
+            elif self._depth == 1 and char == ":":
+                self._expect_key = False
+            elif self._depth == 1 and char == ",":
+                self._expect_key = True
+
+    def _role_for_string(self):
+        if self._depth == 1:
+            if self._expect_key:
+                return "key"
+            return self._key if self._key in STRING_FIELDS else None
+        if self._depth == 2 and self._list_field:
+            return "item"
+        return None
+
+    def _close_string(self):
+        role = self._string_role
+        if role is None:
+            return
+        value = _decode_json_string("".join(self._raw))
+        if role == "key":
+            self._key = value
+        elif role == "item":
+            self._partial[self._list_field].append(value)
+        else:
+            self._partial[role] = value
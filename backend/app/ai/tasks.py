@@ -1,18 +1,107 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\ai\tasks.py
 import logging
+import math
+import random
 from celery import shared_task
+from celery.exceptions import Retry
 from django.apps import apps
-from app.ai.ai_service import AIProvider
+from django.conf import settings
+from django.db import transaction
+from app.ai.ai_service import AIProvider, AIServiceRegistry
+from app.ai.analysis_cache import AnalysisCache
+from app.ai.inflight import release_analysis_run
 from app.ai.models import DocumentAnalysis
+from app.ai.rate_limiter import (
+    AIRateLimiter,
+    estimate_request_cost,
+    is_provider_rate_limit_error,
+    provider_for_model,
+)
+from app.core.websocket.coalescing import CoalescingBroadcaster
 from app.core.websocket.services import WebSocketService
+from app.services.text_store import DocumentTextStore
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+class AIRateLimitExceeded(Exception):
+    """Limite de reagendamentos por rate limit esgotado."""
+
+
+def _is_superseded(analysis, run_id) -> bool:
+    # Mensagens sem run_id (enfileiradas antes do controle de execuções) seguem valendo
+    return bool(run_id) and analysis.run_id is not None and str(analysis.run_id) != run_id
+
+
+def _requeue_countdown(wait_seconds: float) -> int:
+    # Jitter evita que as tasks represadas voltem todas no mesmo instante
+    jitter = getattr(settings, "AI_RATE_LIMIT_JITTER_SECONDS", 5)
+    return math.ceil(wait_seconds + random.uniform(0, jitter))
+
+
+def _requeue_for_rate_limit(
+    task, analysis, ws_service, document_id, wait_seconds, requeues, exc=None
+):
+    """
+    Devolve a análise para 'pending' e reagenda a task após a espera, em vez
+    de marcá-la como 'failed'.
+
+    Os reagendamentos são contados à parte (kwarg `rate_limit_requeues`):
+    não consomem `task.request.retries`, reservado para erros reais.
+    """
+    max_requeues = getattr(settings, "AI_RATE_LIMIT_MAX_REQUEUES", 20)
+    if requeues >= max_requeues:
+        raise AIRateLimitExceeded(
+            f"Limite de requisições da IA ainda esgotado após {max_requeues} tentativas"
+        ) from exc
+
+    countdown = _requeue_countdown(wait_seconds)
+    analysis.status = "pending"
+    analysis.save()
+
+    ws_service.broadcast_document_update(
+        document_id,
+        "analysis_status_update",
+        {"status": "pending", "document_id": document_id, "retry_in": countdown},
+    )
+    logger.info(
+        f"Análise do documento {document_id} reagendada em {countdown}s (rate limit)"
+    )
+
+    request = task.request
+    signature = task.signature_from_request(
+        request,
+        kwargs={**(request.kwargs or {}), "rate_limit_requeues": requeues + 1},
+        countdown=countdown,
+        retries=request.retries,
+    )
+    # Chamada direta/eager (testes): não há broker para reenviar
+    if not request.called_directly and not request.is_eager:
+        signature.apply_async()
+    raise Retry(exc=exc, when=countdown, sig=signature)
+
+
+# acks_late: com prefetch 1 no worker da fila "ai", uma análise só sai do
+# broker quando termina (e volta para a fila se o processo morrer)
+@shared_task(bind=True, max_retries=3, default_retry_delay=60, acks_late=True)
 def analyze_document_content_task(
-    self, document_id: int, document_content: str, model_name: str = "gemini"
+    self,
+    document_id: int,
+    text_ref: str,
+    model_name: str = "gemini",
+    run_id: str = None,
+    rate_limit_requeues: int = 0,
 ):
+    """
+    Analisa o texto de um documento com a IA.
+    Recebe apenas a referência (SHA-256 do PDF) do texto no DocumentTextStore,
+    mantendo a mensagem do broker com tamanho constante.
+
+    `run_id` identifica a execução (ver enqueue_document_analysis): uma
+    execução substituída por outra mais recente não chama a IA e tem o
+    resultado descartado. `rate_limit_requeues` conta os reagendamentos por
+    rate limit (ver _requeue_for_rate_limit).
+    """
     Document = apps.get_model("document", "Document")
     ws_service = WebSocketService()
 
@@ -24,9 +113,18 @@ def analyze_document_content_task(
             defaults={
                 "status": "processing",
                 "model_used": model_name,
+                "run_id": run_id,
             },
         )
 
+        if _is_superseded(analysis, run_id):
+            logger.info(
+                f"Execução {run_id} da análise do documento {document_id} "
+                f"foi substituída por {analysis.run_id}; ignorando."
+            )
+            release_analysis_run(document_id, text_ref, model_name, run_id)
+            return None
+
         analysis.status = "processing"
         analysis.model_used = model_name
         analysis.save()
@@ -37,14 +135,85 @@ def analyze_document_content_task(
             {"status": "processing", "document_id": document_id},
         )
 
-        ai_service = AIProvider(default_model=model_name).get_service(model_name)
-        results = ai_service.analyze_document(document_content)
+        document_content = DocumentTextStore().load(text_ref)
 
-        analysis.summary = results.get("summary")
-        analysis.missing_topics = results.get("missing_topics")
-        analysis.insights = results.get("insights")
-        analysis.status = "completed"
-        analysis.save()
+        # Mesmo texto + modelo + versão do prompt já analisado: evita chamar a IA
+        provider = AIProvider(default_model=model_name)
+        cache_model_name = f"{model_name}:{provider.get_model_id(model_name)}"
+        analysis_cache = AnalysisCache()
+        results = analysis_cache.get(document_content, cache_model_name)
+        from_cache = results is not None
+
+        if not from_cache:
+            # Orçamento de requisições/tokens por provedor e por empresa
+            requests, tokens = estimate_request_cost(document_content)
+            limiter = AIRateLimiter(
+                provider_for_model(model_name), company_id=document.company_id
+            )
+            wait_seconds = limiter.acquire_or_wait(requests, tokens)
+            if wait_seconds:
+                _requeue_for_rate_limit(
+                    self,
+                    analysis,
+                    ws_service,
+                    document_id,
+                    wait_seconds,
+                    rate_limit_requeues,
+                )
+
+            # Cliente reutilizado entre tasks do mesmo processo worker
+            ai_service = AIServiceRegistry.get_service(model_name)
+            # Resumo/insights parciais enviados em lotes (~100ms) durante a geração
+            partial_broadcaster = CoalescingBroadcaster(
+                ws_service,
+                document_id,
+                "analysis_partial",
+                extra={"status": "streaming", "document_id": document_id},
+            )
+            try:
+                try:
+                    results = ai_service.analyze_document(
+                        document_content,
+                        on_partial=lambda partial: partial_broadcaster.push(
+                            {"partial": partial}
+                        ),
+                    )
+                finally:
+                    # Último parcial retido pelo agrupamento sai antes do status final
+                    partial_broadcaster.flush()
+            except Exception as e:
+                # 429 do provedor: aguarda a reposição do balde e tenta de novo
+                if not is_provider_rate_limit_error(e):
+                    raise
+                _requeue_for_rate_limit(
+                    self,
+                    analysis,
+                    ws_service,
+                    document_id,
+                    getattr(settings, "AI_RATE_LIMIT_PROVIDER_BACKOFF_SECONDS", 30),
+                    rate_limit_requeues,
+                    exc=e,
+                )
+            analysis_cache.set(document_content, cache_model_name, results)
+
+        # Grava o resultado apenas se esta ainda for a execução vigente
+        with transaction.atomic():
+            analysis = DocumentAnalysis.objects.select_for_update().get(pk=analysis.pk)
+            if _is_superseded(analysis, run_id):
+                logger.info(
+                    f"Resultado da execução {run_id} do documento {document_id} "
+                    f"descartado: execução vigente é {analysis.run_id}."
+                )
+                release_analysis_run(document_id, text_ref, model_name, run_id)
+                return None
+
+            analysis.summary = results.get("summary")
+            analysis.missing_topics = results.get("missing_topics")
+            analysis.insights = results.get("insights")
+            analysis.status = "completed"
+            analysis.save()
+
+        release_analysis_run(document_id, text_ref, model_name, run_id)
 
         ws_service.broadcast_document_update(
             document_id,
@@ -53,12 +222,42 @@ def analyze_document_content_task(
                 "status": "completed",
                 "document_id": document_id,
                 "analysis": results,
+                "cached": from_cache,
             },
         )
 
         return analysis.id
 
-    except Document.DoesNotExist:
+    except (Document.DoesNotExist, Retry):
+        raise
+
+    except AIRateLimitExceeded as e:
+        # Falha definitiva: um retry levaria o mesmo contador de reagendamentos
+        # e seria rejeitado de imediato. O usuário pode reanalisar depois.
+        logger.warning(f"Análise do documento {document_id} abandonada: {e}")
+        release_analysis_run(document_id, text_ref, model_name, run_id)
+
+        analysis = DocumentAnalysis.objects.get(document_id=document_id)
+        if _is_superseded(analysis, run_id):
+            raise
+
+        analysis.status = "failed"
+        analysis.summary = (
+            "Falha na análise: limite de requisições da IA esgotado. "
+            "Tente reanalisar o documento mais tarde."
+        )
+        analysis.save()
+
+        ws_service.broadcast_document_update(
+            document_id,
+            "analysis_status_update",
+            {
+                "status": "failed",
+                "document_id": document_id,
+                "summary": analysis.summary,
+                "reason": "rate_limited",
+            },
+        )
         raise
 
     except Exception as e:
@@ -72,6 +271,14 @@ def analyze_document_content_task(
             defaults={"model_used": model_name},
         )
 
+        # Última tentativa por erro real (reagendamentos por rate limit não contam)
+        if self.request.retries >= self.max_retries:
+            release_analysis_run(document_id, text_ref, model_name, run_id)
+
+        # Falha de uma execução já substituída não sobrescreve a vigente
+        if _is_superseded(analysis, run_id):
+            raise
+
         analysis.status = "failed"
         analysis.summary = f"Falha na análise: {e}"
         analysis.save()
@@ -1,8 +1,18 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from .models import ApiKey
 
 
 @admin.register(ApiKey)
 class ApiKeyAdmin(admin.ModelAdmin):
-    list_display = ("name", "key", "created_at")
-    readonly_fields = ("key",)
+    list_display = ("name", "prefix", "created_at")
+    fields = ("name", "prefix", "created_at")
+    readonly_fields = ("prefix", "created_at")
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            # Só o hash é gravado: a chave é exibida uma única vez
+            obj.key = ApiKey.generate_key()
+            messages.warning(
+                request, f"API Key criada (copie agora, ela não será exibida de novo): {obj.key}"
+            )
+        super().save_model(request, obj, form, change)
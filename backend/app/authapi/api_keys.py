@@ -0,0 +1,61 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\authapi\api_keys.py
+import time
+
+from django.conf import settings
+from django.db import router
+
+from app.authapi.models import ApiKey
+from app.core.local_cache import LocalTTLCache, model_snapshot, restore_model
+
+# Contador compartilhado: incrementado a cada criação/remoção de chave
+GENERATION_KEY = "api_keys:generation"
+
+
+class ApiKeyResolver:
+    """
+    Resolve a API Key enviada no header para a instância de ApiKey (ou None),
+    consultando o banco apenas na primeira vez. Chaves válidas e inválidas
+    ficam em cache no processo, com TTLs separados. O cache guarda só os
+    valores dos campos: cada chamada recebe uma instância própria.
+    """
+
+    _cache = LocalTTLCache(GENERATION_KEY, "API_KEY_CACHE_MAX_ENTRIES")
+
+    @classmethod
+    def resolve(cls, raw_key, clock=time.monotonic):
+        if not raw_key:
+            return None
+
+        key_hash = ApiKey.hash_key(raw_key)
+        found, snapshot = cls._cache.get(key_hash, clock)
+        if found:
+            return restore_model(ApiKey, snapshot, router.db_for_read(ApiKey))
+
+        api_key = ApiKey.objects.filter(key_hash=key_hash).first()
+
+        if api_key:
+            ttl = getattr(settings, "API_KEY_CACHE_TTL_SECONDS", 300)
+        else:
+            ttl = getattr(settings, "API_KEY_NEGATIVE_CACHE_TTL_SECONDS", 30)
+        # Chaves aleatórias (tentativas inválidas) não crescem o cache sem limite
+        cls._cache.set(key_hash, model_snapshot(api_key), ttl, clock)
+        return api_key
+
+    @classmethod
+    def invalidate(cls):
+        cls._cache.invalidate()
+
+    @classmethod
+    def reset(cls):
+        cls._cache.reset()
+
+
+def api_key_from_request(request):
+    """
+    API Key do header X-API-KEY, resolvida uma única vez por requisição
+    (middleware e autenticação do DRF compartilham o resultado).
+    """
+    request = getattr(request, "_request", request)
+    if not hasattr(request, "api_key"):
+        request.api_key = ApiKeyResolver.resolve(request.headers.get("X-API-KEY"))
+    return request.api_key
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class AuthapiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.authapi'
+
+    def ready(self):
+        # Invalida o cache de API Keys ao criar/remover chaves
+        from app.authapi import signals  # noqa: F401
@@ -2,7 +2,12 @@
 
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from app.authapi.models import ApiKey
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+from app.authapi.api_keys import api_key_from_request
+from app.company.tenant import TenantCache
 
 
 class ApiKeyAuthentication(BaseAuthentication):
@@ -12,10 +17,49 @@ class ApiKeyAuthentication(BaseAuthentication):
         if not api_key:
             return None  # deixa o DRF seguir
 
-        try:
-            key = ApiKey.objects.get(key=api_key)
-        except ApiKey.DoesNotExist:
+        # Resolvida uma vez por requisição e cacheada entre requisições
+        key = api_key_from_request(request)
+        if key is None:
             raise AuthenticationFailed("Invalid API Key")
 
         # Não temos usuário, mas o DRF exige uma tupla
         return (key, None)
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que carrega o usuário junto com perfil e empresa
+    (TenantCache): em regime, autenticar e resolver o tenant não consulta o banco.
+    Mantém as verificações do simplejwt (USER_ID_FIELD/CLAIM, usuário ativo e
+    CHECK_REVOKE_TOKEN).
+    """
+
+    def get_user(self, validated_token):
+        # O TenantCache é indexado pela pk: outro campo de identificação
+        # segue o caminho padrão do simplejwt
+        if api_settings.USER_ID_FIELD not in ("id", "pk"):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        tenant = TenantCache.get(user_id)
+        if tenant is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+
+        user = tenant.user
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        # Senha alterada depois da emissão do token (hash cacheado é
+        # invalidado pelo signal de alteração do usuário)
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                "The user's password has been changed.", code="password_changed"
+            )
+
+        return user
@@ -1,10 +1,18 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\authapi\middleware.py
 from django.http import JsonResponse
-from app.authapi.models import ApiKey
-import logging
+from app.authapi.api_keys import api_key_from_request
+from app.core.request_logging import request_logger, security_logger
 
-# Usando o logger 'django' para garantir que as mensagens apareçam no console (INFO level)
-logger = logging.getLogger("django")
+# Rotas públicas (não exigem API Key)
+PUBLIC_PATHS = (
+    "/admin/",
+    "/swagger/",
+    "/docs/",
+    "/auth/",
+    "/webhook/",
+    "/api/",
+    "/static/",
+)
 
 
 class ApiKeyMiddleware:
@@ -12,70 +20,22 @@ class ApiKeyMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        # Rotas públicas (não exigem API Key)
-        public_paths = [
-            "/admin/",
-            "/swagger/",
-            "/docs/",
-            "/auth/",
-            "/webhook/",
-            "/api/",
-            "/static/",
-        ]
-
-        if any(request.path.startswith(p) for p in public_paths):
+        if request.path.startswith(PUBLIC_PATHS):
             return self.get_response(request)
 
-        # --- INÍCIO DA LÓGICA DE LOGGING PARA DIAGNÓSTICO ---
-        # Acessar diretamente os headers não normalizados do request.
-        # Ele só funciona se o servidor (Daphne/Gunicorn) e o DRF expuserem os headers no 'request.headers'
-        raw_api_key_header_upper = request.headers.get("X-API-KEY")
-        raw_api_key_header_title = request.headers.get("X-Api-Key")
-        raw_api_key_header_lower = request.headers.get("x-api-key")
-
-        # Forma padrão do Django para cabeçalhos HTTP (HTTP_ prefixo e tudo em MAIÚSCULAS)
-        meta_api_key = request.META.get("HTTP_X_API_KEY")
-
-        logger.warning(f"MIDDLWARE DIAG - PATH: {request.path}")
-        logger.warning(
-            f"MIDDLWARE DIAG - X-API-KEY (Upper): {raw_api_key_header_upper}"
-        )
-        logger.warning(
-            f"MIDDLWARE DIAG - X-Api-Key (Title): {raw_api_key_header_title}"
-        )
-        logger.warning(
-            f"MIDDLWARE DIAG - x-api-key (Lower): {raw_api_key_header_lower}"
-        )
-        logger.warning(f"MIDDLWARE DIAG - HTTP_X_API_KEY (META): {meta_api_key}")
-        # --- FIM DA LÓGICA DE LOGGING PARA DIAGNÓSTICO ---
-
-        # Aceita header em qualquer formato
-        api_key = (
-            raw_api_key_header_upper  # 1. Forma exata enviada (Maiúsculas)
-            or raw_api_key_header_title  # 2. Title Case (comum)
-            or raw_api_key_header_lower  # 3. Minúsculas (comum)
-            or meta_api_key  # 4. Forma padrão do Django (MAIÚSCULAS no META)
-        )
-
-        # --- LOG DE RESULTADO DA BUSCA ---
-        if api_key:
-            logger.warning(
-                f"MIDDLWARE RESULT - API Key ENCONTRADA (iniciando em {api_key[:4]}...)"
-            )
-        else:
-            logger.warning(
-                "MIDDLWARE RESULT - NENHUMA API Key encontrada após todas as tentativas. Retornando 401."
-            )
-        # --- FIM LOG DE RESULTADO ---
-
-        if not api_key:
+        # request.headers não diferencia maiúsculas/minúsculas (X-API-KEY, x-api-key...)
+        if not request.headers.get("X-API-KEY"):
+            security_logger.warning("api_key rejected reason=missing path=%s", request.path)
             return JsonResponse(
                 {"success": False, "message": "API Key required"}, status=401
             )
 
-        if not ApiKey.objects.filter(key=api_key).exists():
+        api_key = api_key_from_request(request)
+        if api_key is None:
+            security_logger.warning("api_key rejected reason=invalid path=%s", request.path)
             return JsonResponse(
                 {"success": False, "message": "Invalid API Key"}, status=403
             )
 
+        request_logger.debug("api_key accepted name=%s path=%s", api_key.name, request.path)
         return self.get_response(request)
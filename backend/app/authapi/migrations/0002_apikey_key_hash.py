@@ -0,0 +1,57 @@
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_keys(apps, schema_editor):
+    ApiKey = apps.get_model("authapi", "ApiKey")
+    for api_key in ApiKey.objects.all():
+        api_key.key_hash = hashlib.sha256(api_key.key.encode("utf-8")).hexdigest()
+        api_key.prefix = api_key.key[:8]
+        api_key.save(update_fields=["key_hash", "prefix"])
+
+
+def revoke_restored_keys(apps, schema_editor):
+    # Reversão: o texto original não é recuperável a partir do hash. Cada
+    # chave recebe um valor único e inutilizável e precisa ser gerada de novo.
+    ApiKey = apps.get_model("authapi", "ApiKey")
+    for api_key in ApiKey.objects.all():
+        api_key.key = f"revogada-{api_key.pk}-{api_key.key_hash}"
+        api_key.save(update_fields=["key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='apikey',
+            name='prefix',
+            field=models.CharField(blank=True, max_length=8),
+        ),
+        migrations.RunPython(hash_existing_keys, migrations.RunPython.noop),
+        # Nula só durante a reversão, até revoke_restored_keys preencher a coluna
+        migrations.AlterField(
+            model_name='apikey',
+            name='key',
+            field=models.CharField(max_length=255, null=True, unique=True),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, revoke_restored_keys),
+        migrations.RemoveField(
+            model_name='apikey',
+            name='key',
+        ),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.CharField(max_length=64, unique=True),
+        ),
+    ]
@@ -1,15 +1,19 @@
 ## AUTHAPI MODELS
 from django.db import models
+import hashlib
 import secrets
 
 
 class ApiKey(models.Model):
     """
     Armazena chaves de API autorizadas para consumir a aplicação.
+    Apenas o hash SHA-256 da chave é gravado; o texto é exibido uma única vez.
     """
 
     name = models.CharField(max_length=100)
-    key = models.CharField(max_length=255, unique=True)
+    key_hash = models.CharField(max_length=64, unique=True)
+    # Início da chave, só para identificação no admin
+    prefix = models.CharField(max_length=8, blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -17,5 +21,21 @@ class ApiKey(models.Model):
     def generate_key():
         return secrets.token_hex(32)
 
+    @staticmethod
+    def hash_key(raw_key):
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    @property
+    def key(self):
+        """Chave em texto: disponível apenas na instância em que foi definida."""
+        return getattr(self, "_raw_key", None)
+
+    @key.setter
+    def key(self, raw_key):
+        # Permite ApiKey.objects.create(name=..., key=...) gravando só o hash
+        self._raw_key = raw_key
+        self.key_hash = self.hash_key(raw_key)
+        self.prefix = raw_key[:8]
+
     def __str__(self):
         return f"{self.name}"
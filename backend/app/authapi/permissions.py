@@ -0,0 +1,17 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\authapi\permissions.py
+from rest_framework.permissions import BasePermission
+
+from app.authapi.models import ApiKey
+
+
+class HasApiKeyOrIsStaff(BasePermission):
+    """
+    Libera requisições autenticadas por API Key (ApiKeyAuthentication coloca a
+    ApiKey em request.user) ou por um usuário staff (JWT).
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if isinstance(user, ApiKey):
+            return True
+        return bool(getattr(user, "is_authenticated", False) and user.is_staff)
@@ -0,0 +1,13 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\authapi\signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from app.authapi.api_keys import ApiKeyResolver
+from app.authapi.models import ApiKey
+
+
+@receiver(post_save, sender=ApiKey)
+@receiver(post_delete, sender=ApiKey)
+def invalidate_api_key_cache(sender, instance, **kwargs):
+    # Chave criada, alterada ou removida: nenhum processo pode servir o cache antigo
+    ApiKeyResolver.invalidate()
@@ -2,7 +2,7 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from app.authapi.models import ApiKey
+from app.authapi.api_keys import api_key_from_request
 from rest_framework import generics
 from rest_framework.permissions import AllowAny
 from .serializers import RegisterSerializer
@@ -93,7 +93,7 @@ class ValidateAPIKeyView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if ApiKey.objects.filter(key=api_key).exists():
+        if api_key_from_request(request) is not None:
             return Response(
                 {"success": True, "message": "API Key válida."},
                 status=status.HTTP_200_OK,
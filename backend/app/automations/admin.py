@@ -1 +1,10 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\admin.py
+from django.contrib import admin
+from .models import DocumentDailyRollup
+
+
+@admin.register(DocumentDailyRollup)
+class DocumentDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("company", "day", "dimension", "value", "count", "total_seconds")
+    list_filter = ("dimension", "company")
+    date_hierarchy = "day"
@@ -5,3 +5,7 @@ from django.apps import AppConfig
 class AutomationsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.automations"
+
+    def ready(self):
+        # Registra os signals que mantêm os rollups dos relatórios
+        from app.automations import signals  # noqa: F401
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from app.automations.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula os rollups diários usados nos relatórios agregados"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--company-id",
+            type=int,
+            default=None,
+            help="Recalcula apenas a empresa informada",
+        )
+
+    def handle(self, *args, **kwargs):
+        company_id = kwargs["company_id"]
+        total = rebuild_rollups(company_id=company_id)
+
+        scope = f"empresa {company_id}" if company_id else "todas as empresas"
+        self.stdout.write(
+            self.style.SUCCESS(f"{total} rollups recalculados ({scope}).")
+        )
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('company', '0002_userprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('dimension', models.CharField(choices=[('document_status', 'Status do documento'), ('signer_status', 'Status do signatário'), ('ai_status', 'Status da análise de IA'), ('signing_latency', 'Latência de assinatura')], max_length=30)),
+                ('value', models.CharField(max_length=100)),
+                ('count', models.IntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to='company.company')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('company', 'day', 'dimension', 'value'), name='unique_daily_rollup')],
+            },
+        ),
+    ]
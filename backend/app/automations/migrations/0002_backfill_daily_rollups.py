@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def backfill_rollups(apps, schema_editor):
+    # Documentos existentes antes dos rollups: contadores iniciais via GROUP BY
+    from app.automations.rollups import rebuild_rollups
+
+    rebuild_rollups(apps=apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('automations', '0001_initial'),
+        ('ai', '0003_documentanalysis_run_id'),
+        ('document', '0008_document_token_and_open_status_indexes'),
+        ('signer', '0002_signer_document_token_uniq'),
+    ]
+
+    operations = [
+        # Reverter remove a tabela na 0001: nada a desfazer aqui
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\models.py
+from django.db import models
+from app.company.models import Company
+
+
+class DocumentDailyRollup(models.Model):
+    """
+    Contadores diários pré-agregados por empresa, usados pelos relatórios.
+    O dia é a data de criação do documento. Cada linha guarda a quantidade
+    de itens com um valor (ex: status "signed") em uma dimensão
+    (status do documento, dos signatários, da análise de IA ou latência de
+    assinatura). Mantida de forma incremental a cada mudança de status.
+    """
+
+    DOCUMENT_STATUS = "document_status"
+    SIGNER_STATUS = "signer_status"
+    AI_STATUS = "ai_status"
+    SIGNING_LATENCY = "signing_latency"
+
+    DIMENSION_CHOICES = [
+        (DOCUMENT_STATUS, "Status do documento"),
+        (SIGNER_STATUS, "Status do signatário"),
+        (AI_STATUS, "Status da análise de IA"),
+        (SIGNING_LATENCY, "Latência de assinatura"),
+    ]
+
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name="daily_rollups"
+    )
+    day = models.DateField()
+    dimension = models.CharField(max_length=30, choices=DIMENSION_CHOICES)
+    value = models.CharField(max_length=100)
+    count = models.IntegerField(default=0)
+    # Soma dos segundos (usado apenas em signing_latency)
+    total_seconds = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["company", "day", "dimension", "value"],
+                name="unique_daily_rollup",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.company_id} {self.day} {self.dimension}={self.value}: {self.count}"
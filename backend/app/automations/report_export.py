@@ -0,0 +1,102 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\report_export.py
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from app.document.serializers import DocumentSerializer
+
+# Formatos de saída do relatório. "json" mantém a resposta completa (envelope
+# success/data); os demais são transmitidos em partes (streaming).
+REPORT_FORMATS = ("json", "ndjson", "csv")
+STREAMING_FORMATS = ("ndjson", "csv")
+
+CSV_COLUMNS = [
+    "id",
+    "name",
+    "status",
+    "externalID",
+    "token",
+    "created_at",
+    "last_updated_at",
+    "signers_count",
+    "signers",
+    "ai_status",
+    "ai_summary",
+]
+
+
+class _Echo:
+    """Pseudo-buffer: csv.writer devolve a linha formatada em vez de gravá-la."""
+
+    def write(self, value):
+        return value
+
+
+def iter_serialized_documents(queryset, chunk_size=None):
+    """
+    Percorre o queryset com .iterator(chunk_size) e serializa em blocos,
+    mantendo em memória apenas um bloco de documentos por vez.
+    O prefetch de signatários é feito por bloco pelo próprio Django.
+    """
+    chunk_size = chunk_size or getattr(settings, "REPORT_STREAM_CHUNK_SIZE", 500)
+    documents = queryset.iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(documents, chunk_size))
+        if not chunk:
+            break
+        yield from DocumentSerializer(chunk, many=True).data
+
+
+def _csv_row(document_data):
+    signers = document_data.get("signers_db") or []
+    ai_analysis = document_data.get("ai_analysis") or {}
+    return [
+        document_data.get("id"),
+        document_data.get("name"),
+        document_data.get("status"),
+        document_data.get("externalID"),
+        document_data.get("token"),
+        document_data.get("created_at"),
+        document_data.get("last_updated_at"),
+        len(signers),
+        "; ".join(signer["name"] for signer in signers),
+        ai_analysis.get("status"),
+        ai_analysis.get("summary"),
+    ]
+
+
+def _ndjson_lines(queryset):
+    for document_data in iter_serialized_documents(queryset):
+        yield json.dumps(document_data, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(queryset):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for document_data in iter_serialized_documents(queryset):
+        yield writer.writerow(_csv_row(document_data))
+
+
+def build_streaming_report(queryset, output_format, report_type, company_id):
+    """Monta a StreamingHttpResponse do relatório em NDJSON ou CSV."""
+    if output_format == "csv":
+        response = StreamingHttpResponse(
+            _csv_lines(queryset), content_type="text/csv; charset=utf-8"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{report_type}_{company_id}.csv"'
+        )
+    else:
+        response = StreamingHttpResponse(
+            _ndjson_lines(queryset), content_type="application/x-ndjson"
+        )
+
+    response["X-Report-Type"] = report_type
+    # Evita que proxies (nginx) acumulem a resposta inteira antes de enviá-la
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,114 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\reports.py
+from collections import defaultdict
+
+from django.db.models import Sum
+
+from app.automations.models import DocumentDailyRollup
+
+
+def _rollups(company_id, start_date, end_date, dimension):
+    return DocumentDailyRollup.objects.filter(
+        company_id=company_id,
+        day__gte=start_date,
+        day__lte=end_date,
+        dimension=dimension,
+    )
+
+
+def _totals_by_value(company_id, start_date, end_date, dimension) -> dict:
+    rows = (
+        _rollups(company_id, start_date, end_date, dimension)
+        .values("value")
+        .annotate(total=Sum("count"))
+        .filter(total__gt=0)
+        .order_by("value")
+    )
+    return {row["value"]: row["total"] for row in rows}
+
+
+def status_breakdown(company_id, start_date, end_date) -> dict:
+    by_day = defaultdict(dict)
+    daily_rows = (
+        _rollups(company_id, start_date, end_date, DocumentDailyRollup.DOCUMENT_STATUS)
+        .filter(count__gt=0)
+        .values("day", "value", "count")
+        .order_by("day", "value")
+    )
+    for row in daily_rows:
+        by_day[row["day"].isoformat()][row["value"]] = row["count"]
+
+    document_status = _totals_by_value(
+        company_id, start_date, end_date, DocumentDailyRollup.DOCUMENT_STATUS
+    )
+    return {
+        "total_documents": sum(document_status.values()),
+        "document_status": document_status,
+        "signer_status": _totals_by_value(
+            company_id, start_date, end_date, DocumentDailyRollup.SIGNER_STATUS
+        ),
+        "ai_status": _totals_by_value(
+            company_id, start_date, end_date, DocumentDailyRollup.AI_STATUS
+        ),
+        "by_day": [
+            {"day": day, "document_status": statuses}
+            for day, statuses in by_day.items()
+        ],
+    }
+
+
+def signing_latency(company_id, start_date, end_date) -> dict:
+    rows = _rollups(
+        company_id, start_date, end_date, DocumentDailyRollup.SIGNING_LATENCY
+    ).order_by("day")
+
+    by_day = []
+    signed_documents = 0
+    total_seconds = 0
+    for row in rows:
+        if row.count <= 0:
+            continue
+        signed_documents += row.count
+        total_seconds += row.total_seconds
+        by_day.append(
+            {
+                "day": row.day.isoformat(),
+                "signed_documents": row.count,
+                "average_seconds": round(row.total_seconds / row.count, 2),
+            }
+        )
+
+    return {
+        "signed_documents": signed_documents,
+        "average_seconds": (
+            round(total_seconds / signed_documents, 2) if signed_documents else None
+        ),
+        "by_day": by_day,
+    }
+
+
+def ai_failure_rate(company_id, start_date, end_date) -> dict:
+    ai_status = _totals_by_value(
+        company_id, start_date, end_date, DocumentDailyRollup.AI_STATUS
+    )
+    completed = ai_status.get("completed", 0)
+    failed = ai_status.get("failed", 0)
+    finished = completed + failed
+    return {
+        "completed": completed,
+        "failed": failed,
+        "in_progress": sum(ai_status.values()) - finished,
+        "failure_rate": round(failed / finished, 4) if finished else 0.0,
+    }
+
+
+# Relatórios respondidos a partir dos rollups diários (sem varrer documentos)
+REPORT_BUILDERS = {
+    "status_breakdown": status_breakdown,
+    "signing_latency": signing_latency,
+    "ai_failure_rate": ai_failure_rate,
+}
+ROLLUP_REPORT_TYPES = tuple(REPORT_BUILDERS)
+
+
+def build_rollup_report(report_type, company_id, start_date, end_date) -> dict:
+    return REPORT_BUILDERS[report_type](company_id, start_date, end_date)
@@ -0,0 +1,223 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\rollups.py
+import logging
+from functools import partial
+
+from django.apps import apps as global_apps
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from app.ai.models import DocumentAnalysis
+from app.automations.models import DocumentDailyRollup
+from app.document.models import Document
+from app.signer.models import Signer
+
+logger = logging.getLogger(__name__)
+
+# Marcadores do status "anterior" guardado na instância (ver signals.py)
+NOT_COUNTED = "__not_counted__"  # instância nova, ainda não contabilizada
+UNKNOWN = "__unknown__"  # status não carregado (campo adiado com .only())
+
+UNKNOWN_STATUS_VALUE = "unknown"
+
+DIMENSION_BY_MODEL = {
+    Document: DocumentDailyRollup.DOCUMENT_STATUS,
+    Signer: DocumentDailyRollup.SIGNER_STATUS,
+    DocumentAnalysis: DocumentDailyRollup.AI_STATUS,
+}
+
+
+def _status_value(status):
+    return status or UNKNOWN_STATUS_VALUE
+
+
+def _signing_seconds(created_at, signed_at) -> int:
+    return max(int((signed_at - created_at).total_seconds()), 0)
+
+
+# ========================================================================
+# Atualização incremental
+# ========================================================================
+def _bump(company_id, day, dimension, value, delta, seconds=0):
+    filters = {
+        "company_id": company_id,
+        "day": day,
+        "dimension": dimension,
+        "value": value,
+    }
+    changes = {
+        "count": F("count") + delta,
+        "total_seconds": F("total_seconds") + seconds,
+    }
+
+    if DocumentDailyRollup.objects.filter(**filters).update(**changes):
+        return
+
+    try:
+        with transaction.atomic():
+            DocumentDailyRollup.objects.create(
+                count=delta, total_seconds=seconds, **filters
+            )
+    except IntegrityError:
+        # Outro processo criou a linha em paralelo
+        DocumentDailyRollup.objects.filter(**filters).update(**changes)
+
+
+def _document_context(instance):
+    """Empresa, dia e dados de assinatura do documento ao qual a instância pertence."""
+    if isinstance(instance, Document):
+        return {
+            "company_id": instance.company_id,
+            "created_at": instance.created_at,
+            "signed_at": instance.signed_at,
+        }
+    # Documento já carregado junto com a instância (ex: document.signers): sem consulta
+    if type(instance).document.is_cached(instance):
+        return _document_context(instance.document)
+    return (
+        Document.objects.filter(pk=instance.document_id)
+        .values("company_id", "created_at", "signed_at")
+        .first()
+    )
+
+
+def _apply_bumps(bumps, label):
+    try:
+        with transaction.atomic():
+            for bump in bumps:
+                _bump(*bump)
+    except Exception as e:
+        logger.warning(f"Falha ao atualizar rollup de {label}: {e}")
+
+
+def record_status_transition(instance, old_status, new_status, count=1):
+    """
+    Aplica nos contadores a mudança de status de um documento, signatário ou
+    análise de IA: decrementa o status anterior e incrementa o novo.
+    `count` aplica de uma vez a mesma transição de várias instâncias do mesmo
+    documento. Os contadores só são alterados após o commit da transação
+    (um rollback não deixa contagem fantasma). Falhas são registradas em log
+    e não interrompem o fluxo principal.
+    """
+    if old_status == UNKNOWN or old_status == new_status:
+        return
+
+    label = f"{type(instance).__name__} {instance.pk}"
+    try:
+        context = _document_context(instance)
+        if not context:
+            return
+
+        company_id = context["company_id"]
+        day = timezone.localdate(context["created_at"])
+        dimension = DIMENSION_BY_MODEL[type(instance)]
+
+        bumps = []
+        if old_status != NOT_COUNTED:
+            bumps.append((company_id, day, dimension, _status_value(old_status), -count))
+        if new_status != NOT_COUNTED:
+            bumps.append((company_id, day, dimension, _status_value(new_status), count))
+
+        if dimension == DocumentDailyRollup.DOCUMENT_STATUS and context["signed_at"]:
+            seconds = _signing_seconds(context["created_at"], context["signed_at"])
+            if new_status == "signed":
+                bumps.append((company_id, day, DocumentDailyRollup.SIGNING_LATENCY, "signed", count, seconds * count))
+            elif old_status == "signed":
+                bumps.append((company_id, day, DocumentDailyRollup.SIGNING_LATENCY, "signed", -count, -seconds * count))
+
+        if bumps:
+            transaction.on_commit(partial(_apply_bumps, bumps, label))
+
+    except Exception as e:
+        logger.warning(f"Falha ao atualizar rollup de {label}: {e}")
+
+
+# ========================================================================
+# Reconstrução completa (GROUP BY no banco)
+# ========================================================================
+def _grouped_rows(queryset, company_field, created_field):
+    return (
+        queryset.annotate(day=TruncDate(created_field))
+        .values(company_field, "day", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+
+
+def rebuild_rollups(company_id=None, apps=global_apps) -> int:
+    """
+    Recalcula os contadores a partir dos dados atuais (GROUP BY por empresa,
+    dia e status). Usado na carga inicial e para corrigir divergências.
+    `apps` permite usar os modelos históricos de uma migração.
+    Retorna a quantidade de linhas gravadas.
+    """
+    Rollup = apps.get_model("automations", "DocumentDailyRollup")
+    documents = apps.get_model("document", "Document").objects.all()
+    signers = apps.get_model("signer", "Signer").objects.all()
+    analyses = apps.get_model("ai", "DocumentAnalysis").objects.all()
+    if company_id is not None:
+        documents = documents.filter(company_id=company_id)
+        signers = signers.filter(document__company_id=company_id)
+        analyses = analyses.filter(document__company_id=company_id)
+
+    rollups = []
+    sources = [
+        (documents, "company_id", "created_at", DocumentDailyRollup.DOCUMENT_STATUS),
+        (signers, "document__company_id", "document__created_at", DocumentDailyRollup.SIGNER_STATUS),
+        (analyses, "document__company_id", "document__created_at", DocumentDailyRollup.AI_STATUS),
+    ]
+    for queryset, company_field, created_field, dimension in sources:
+        for row in _grouped_rows(queryset, company_field, created_field):
+            rollups.append(
+                Rollup(
+                    company_id=row[company_field],
+                    day=row["day"],
+                    dimension=dimension,
+                    value=_status_value(row["status"]),
+                    count=row["total"],
+                )
+            )
+
+    latency_rows = (
+        documents.filter(status="signed", signed_at__isnull=False)
+        .annotate(
+            day=TruncDate("created_at"),
+            latency=ExpressionWrapper(
+                F("signed_at") - F("created_at"), output_field=DurationField()
+            ),
+        )
+        .values("company_id", "day")
+        .annotate(total=Count("id"), latency_total=Sum("latency"))
+        .order_by()
+    )
+    for row in latency_rows:
+        rollups.append(
+            Rollup(
+                company_id=row["company_id"],
+                day=row["day"],
+                dimension=DocumentDailyRollup.SIGNING_LATENCY,
+                value="signed",
+                count=row["total"],
+                total_seconds=int(row["latency_total"].total_seconds()),
+            )
+        )
+
+    # Status repetidos após a normalização (None -> "unknown") são somados
+    merged = {}
+    for rollup in rollups:
+        key = (rollup.company_id, rollup.day, rollup.dimension, rollup.value)
+        if key in merged:
+            merged[key].count += rollup.count
+            merged[key].total_seconds += rollup.total_seconds
+        else:
+            merged[key] = rollup
+
+    with transaction.atomic():
+        existing = Rollup.objects.all()
+        if company_id is not None:
+            existing = existing.filter(company_id=company_id)
+        existing.delete()
+        Rollup.objects.bulk_create(merged.values(), batch_size=1000)
+
+    return len(merged)
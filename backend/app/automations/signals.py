@@ -0,0 +1,74 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\automations\signals.py
+from collections import Counter
+
+from django.db.models.signals import post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from app.ai.models import DocumentAnalysis
+from app.automations.rollups import (
+    NOT_COUNTED,
+    UNKNOWN,
+    record_status_transition,
+)
+from app.document.models import Document
+from app.signer.models import Signer
+
+# Modelos cujo status alimenta os rollups diários dos relatórios
+TRACKED_MODELS = (Document, Signer, DocumentAnalysis)
+
+
+def track_saved_status(instance):
+    """
+    Aplica nos rollups a diferença entre o último status contabilizado e o
+    status atual da instância. Também usado após bulk_update (sem signals).
+    """
+    previous = getattr(instance, "_rollup_status", UNKNOWN)
+    record_status_transition(instance, previous, instance.status)
+    instance._rollup_status = instance.status
+
+
+def track_saved_statuses(instances):
+    """
+    Versão em lote de track_saved_status (após bulk_update): transições
+    iguais dentro do mesmo documento viram um único incremento por status.
+    """
+    transitions = Counter()
+    samples = {}
+    for instance in instances:
+        previous = getattr(instance, "_rollup_status", UNKNOWN)
+        document_key = getattr(instance, "document_id", instance.pk)
+        key = (type(instance), document_key, previous, instance.status)
+        transitions[key] += 1
+        samples.setdefault(key, instance)
+        instance._rollup_status = instance.status
+
+    for key, count in transitions.items():
+        _, _, previous, current = key
+        record_status_transition(samples[key], previous, current, count=count)
+
+
+def remember_status(sender, instance, **kwargs):
+    if instance.pk is None:
+        instance._rollup_status = NOT_COUNTED
+    else:
+        # Campo adiado (.only/.defer): não força uma consulta extra
+        instance._rollup_status = instance.__dict__.get("status", UNKNOWN)
+
+
+def update_rollups_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        instance._rollup_status = NOT_COUNTED
+    elif update_fields is not None and "status" not in update_fields:
+        return
+    track_saved_status(instance)
+
+
+def update_rollups_on_delete(sender, instance, **kwargs):
+    previous = getattr(instance, "_rollup_status", UNKNOWN)
+    record_status_transition(instance, previous, NOT_COUNTED)
+
+
+for model in TRACKED_MODELS:
+    receiver(post_init, sender=model)(remember_status)
+    receiver(post_save, sender=model)(update_rollups_on_save)
+    receiver(pre_delete, sender=model)(update_rollups_on_delete)
@@ -3,6 +3,7 @@ from .views import (
     DocumentAnalysisAutomationView,
     ReportGenerationAutomationView,
     DocumentReanalyzeAutomationView,
+    AutomationMetricsView,
 )
 
 urlpatterns = [
@@ -21,4 +22,9 @@ urlpatterns = [
         ReportGenerationAutomationView.as_view(),
         name="automation-report-generation",
     ),
+    path(
+        "metrics/",
+        AutomationMetricsView.as_view(),
+        name="automation-metrics",
+    ),
 ]
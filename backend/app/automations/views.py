@@ -1,21 +1,33 @@
 import logging
-from datetime import datetime
+from datetime import datetime, time, timedelta
 
-import requests
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
+from django.utils import timezone
 
-from app.authapi.authentication import ApiKeyAuthentication
+from app.authapi.authentication import ApiKeyAuthentication, TenantJWTAuthentication
+from app.authapi.permissions import HasApiKeyOrIsStaff
 from app.document.models import Document
 from app.document.serializers import (
     DocumentSerializer,
     DocumentAnalysisSerializer,
 )
 from app.ai.models import DocumentAnalysis
-from app.ai.tasks import analyze_document_content_task
+from app.ai.analysis_cache import AnalysisCache
+from app.ai.rate_limiter import AIRateLimiter
+from app.automations.reports import ROLLUP_REPORT_TYPES, build_rollup_report
+from app.automations.report_export import (
+    REPORT_FORMATS,
+    STREAMING_FORMATS,
+    build_streaming_report,
+)
+from app.document.tasks import enqueue_document_analysis, start_ingestion_pipeline
+from app.services.text_store import DocumentTextStore
+from app.services.zapsign_service import ZapSignSessionRegistry
 from app.core.middleware.response import success, error
+from app.core.task_priority import task_priority
 
 from drf_spectacular.utils import (
     extend_schema,
@@ -28,6 +40,18 @@ from rest_framework import serializers
 
 logger = logging.getLogger(__name__)
 
+
+def _day_bounds(start_date, end_date):
+    """
+    Intervalo [início de start_date, início do dia seguinte a end_date) no fuso
+    local. Comparar created_at direto (sem __date) usa o índice
+    (company, created_at).
+    """
+    return (
+        timezone.make_aware(datetime.combine(start_date, time.min)),
+        timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min)),
+    )
+
 # ====================================================================
 # 1. DocumentAnalysisAutomationView (GET)
 # ====================================================================
@@ -167,24 +191,25 @@ class DocumentReanalyzeAutomationView(APIView):
             analysis.insights = None
             analysis.save()
 
-        try:
-            from app.utils.pdf_utils import extract_text_from_pdf
-
-            pdf_response = requests.get(document.url_pdf, timeout=10)
-            pdf_response.raise_for_status()
-
-            document_content = extract_text_from_pdf(pdf_response.content)
+        # Reanálises vêm de automações em lote: ficam atrás das criações interativas
+        priority = task_priority(document.company_id, bulk=True)
 
-            logger.info(
-                "Texto extraído do PDF para reanálise: %s caracteres",
-                len(document_content),
-            )
-
-            analyze_document_content_task.delay(
-                document_id=document.id,
-                document_content=document_content,
-                model_name="gemini",
-            )
+        try:
+            # Texto já extraído anteriormente: reenvia apenas a referência (hash)
+            if document.content_sha256 and DocumentTextStore().exists(
+                document.content_sha256
+            ):
+                enqueue_document_analysis(
+                    document.id,
+                    document.content_sha256,
+                    model_name="gemini",
+                    priority=priority,
+                )
+            else:
+                # Sem texto no store: executa o pipeline completo de ingestão
+                start_ingestion_pipeline(
+                    document.id, model_name="gemini", priority=priority
+                )
 
             return Response(
                 success(
@@ -197,18 +222,6 @@ class DocumentReanalyzeAutomationView(APIView):
                 status=status.HTTP_200_OK,
             )
 
-        except requests.exceptions.RequestException as exc:
-            analysis.status = "failed"
-            analysis.summary = f"Erro ao baixar PDF para reanálise: {exc}"
-            analysis.save()
-
-            logger.error("Erro ao baixar PDF para reanálise: %s", exc)
-
-            return Response(
-                error(f"Erro ao baixar PDF para reanálise: {exc}"),
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
-
         except Exception as exc:
             analysis.status = "failed"
             analysis.summary = f"Erro inesperado ao disparar reanálise: {exc}"
@@ -248,7 +261,11 @@ class DocumentReanalyzeAutomationView(APIView):
         fields={
             "report_type": {
                 "type": "string",
-                "description": "Tipo de relatório. Valor esperado: monthly_summary.",
+                "description": (
+                    "Tipo de relatório: monthly_summary (documentos), "
+                    "status_breakdown, signing_latency ou ai_failure_rate "
+                    "(agregados pré-calculados)."
+                ),
             },
             "start_date": {
                 "type": "string",
@@ -264,6 +281,13 @@ class DocumentReanalyzeAutomationView(APIView):
                 "type": "integer",
                 "description": "ID da empresa.",
             },
+            "format": {
+                "type": "string",
+                "description": (
+                    "Formato de saída: json (padrão), ndjson ou csv. "
+                    "ndjson e csv são transmitidos em streaming."
+                ),
+            },
         },
         required=["report_type", "start_date", "end_date", "company_id"],
     ),
@@ -296,10 +320,17 @@ class ReportGenerationAutomationView(APIView):
                 "start_date": serializers.DateField(),
                 "end_date": serializers.DateField(),
                 "company_id": serializers.IntegerField(),
+                "format": serializers.ChoiceField(
+                    choices=REPORT_FORMATS, required=False
+                ),
             },
         ),
         responses={
-            200: OpenApiResponse(description="Relatório gerado com sucesso"),
+            200: OpenApiResponse(
+                description=(
+                    "Relatório gerado com sucesso (JSON, ou NDJSON/CSV em streaming)"
+                )
+            ),
             400: OpenApiResponse(description="Dados inválidos"),
         },
     )
@@ -310,6 +341,7 @@ class ReportGenerationAutomationView(APIView):
         start_date_str = report_data.get("start_date")
         end_date_str = report_data.get("end_date")
         company_id = report_data.get("company_id")
+        output_format = report_data.get("format") or "json"
 
         if not all([report_type, start_date_str, end_date_str, company_id]):
             return Response(
@@ -329,27 +361,62 @@ class ReportGenerationAutomationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if report_type in ROLLUP_REPORT_TYPES:
+            report_results = {
+                "report_type": report_type,
+                "start_date": start_date_str,
+                "end_date": end_date_str,
+                "company_id": company_id,
+                **build_rollup_report(report_type, company_id, start_date, end_date),
+            }
+            return Response(
+                success(
+                    report_results,
+                    f"Relatório '{report_type}' gerado com sucesso para a empresa {company_id}.",
+                ),
+                status=status.HTTP_200_OK,
+            )
+
         if report_type != "monthly_summary":
             return Response(
                 error(f"Tipo de relatório '{report_type}' não suportado."),
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        documents = Document.objects.filter(
-            company_id=company_id,
-            created_at__date__gte=start_date,
-            created_at__date__lte=end_date,
-        ).order_by("-created_at")
+        if output_format not in REPORT_FORMATS:
+            return Response(
+                error(
+                    f"Formato '{output_format}' não suportado. "
+                    f"Use: {', '.join(REPORT_FORMATS)}."
+                ),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created_from, created_until = _day_bounds(start_date, end_date)
+        documents = DocumentSerializer.setup_eager_loading(
+            Document.objects.filter(
+                company_id=company_id,
+                created_at__gte=created_from,
+                created_at__lt=created_until,
+            ).order_by("-created_at")
+        )
+
+        # NDJSON/CSV: memória constante e primeiro byte imediato
+        if output_format in STREAMING_FORMATS:
+            return build_streaming_report(
+                documents, output_format, report_type, company_id
+            )
 
-        serializer = DocumentSerializer(documents, many=True)
+        # Avaliação única do queryset (evita o COUNT adicional)
+        documents_data = DocumentSerializer(documents, many=True).data
 
         report_results = {
             "report_type": report_type,
             "start_date": start_date_str,
             "end_date": end_date_str,
             "company_id": company_id,
-            "total_documents": documents.count(),
-            "documents": serializer.data,
+            "total_documents": len(documents_data),
+            "documents": documents_data,
         }
 
         return Response(
@@ -359,3 +426,45 @@ class ReportGenerationAutomationView(APIView):
             ),
             status=status.HTTP_200_OK,
         )
+
+
+# ====================================================================
+# 4. AutomationMetricsView (GET)
+# ====================================================================
+
+
+@extend_schema(
+    summary="Métricas operacionais para automação",
+    description=(
+        "Endpoint usado por serviços de automação e monitoramento para obter "
+        "métricas internas, como hits/misses do cache de análises de IA, "
+        "uso do pool de conexões HTTP com a ZapSign e saldo dos baldes de "
+        "rate limit das chamadas de IA."
+    ),
+    parameters=[
+        OpenApiParameter(
+            name="X-API-KEY",
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description="Chave de API para autenticação.",
+            required=True,
+        ),
+    ],
+    responses={
+        200: OpenApiResponse(description="Métricas retornadas com sucesso."),
+    },
+    auth=[],
+)
+class AutomationMetricsView(APIView):
+    # Rota pública no middleware: a chave (ou um usuário staff) é exigida aqui
+    authentication_classes = [ApiKeyAuthentication, TenantJWTAuthentication]
+    permission_classes = [HasApiKeyOrIsStaff]
+
+    def get(self, request):
+        metrics = {
+            "ai_analysis_cache": AnalysisCache().stats(),
+            "zapsign_http_pool": ZapSignSessionRegistry.stats(),
+            "ai_rate_limit_buckets": AIRateLimiter.levels(),
+        }
+
+        return Response(success(metrics), status=status.HTTP_200_OK)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class CompanyConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'app.company'
+
+    def ready(self):
+        # Invalida o cache de contexto do tenant ao alterar usuário/perfil/empresa
+        from app.company import signals  # noqa: F401
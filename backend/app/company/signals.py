@@ -0,0 +1,76 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\company\signals.py
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from app.company.models import Company, UserProfile
+from app.company.tenant import TenantCache
+from app.services.zapsign_service import ZapSignClientRegistry
+
+
+# ========================================================================
+# Empresa: invalida só as entradas dela, e só se algum campo mudou
+# ========================================================================
+def _company_fields(update_fields):
+    names = [field.attname for field in Company._meta.concrete_fields if not field.primary_key]
+    if update_fields is not None:
+        names = [name for name in names if name in update_fields]
+    return names
+
+
+def remember_company_state(sender, instance, update_fields=None, **kwargs):
+    # Valores antes do save, para saber no post_save o que realmente mudou
+    instance._changed_fields = set()
+    if instance._state.adding or instance.pk is None:
+        return
+
+    names = _company_fields(update_fields)
+    previous = Company.objects.filter(pk=instance.pk).values(*names).first() if names else None
+    if previous is None:
+        return
+    instance._changed_fields = {
+        name for name in names if previous[name] != getattr(instance, name)
+    }
+
+
+def _company_user_ids(company_id):
+    return UserProfile.objects.filter(company_id=company_id).values_list("user_id", flat=True)
+
+
+def invalidate_company_caches(sender, instance, created=False, **kwargs):
+    changed = getattr(instance, "_changed_fields", set())
+    if created or not changed:
+        return
+
+    # Contexto dos usuários da empresa carrega os dados dela
+    TenantCache.invalidate(_company_user_ids(instance.pk))
+    # apiToken alterado: o próximo acesso monta o cliente com o token novo
+    if "apiToken" in changed:
+        ZapSignClientRegistry.invalidate([instance.pk])
+
+
+def invalidate_deleted_company(sender, instance, **kwargs):
+    TenantCache.invalidate(_company_user_ids(instance.pk))
+    ZapSignClientRegistry.invalidate([instance.pk])
+
+
+# ========================================================================
+# Usuário e perfil: invalida só o contexto do usuário
+# ========================================================================
+def invalidate_user_tenant(sender, instance, **kwargs):
+    TenantCache.invalidate([instance.pk])
+
+
+def invalidate_profile_tenant(sender, instance, **kwargs):
+    # Ex: usuário trocado de empresa
+    TenantCache.invalidate([instance.user_id])
+
+
+pre_save.connect(remember_company_state, sender=Company)
+post_save.connect(invalidate_company_caches, sender=Company)
+# pre_delete: os perfis ainda existem para localizar os usuários da empresa
+pre_delete.connect(invalidate_deleted_company, sender=Company)
+
+post_save.connect(invalidate_user_tenant, sender=get_user_model())
+post_delete.connect(invalidate_user_tenant, sender=get_user_model())
+post_save.connect(invalidate_profile_tenant, sender=UserProfile)
+post_delete.connect(invalidate_profile_tenant, sender=UserProfile)
@@ -0,0 +1,115 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\company\tenant.py
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from app.core.local_cache import LocalTTLCache, model_snapshot, restore_model
+
+# Contador compartilhado: incrementado ao alterar usuário, perfil ou empresa
+GENERATION_KEY = "tenant_context:generation"
+
+
+def company_zapsign_token(company):
+    """Token da ZapSign da empresa ou, na falta dele, o token global."""
+    token = company.apiToken if company else None
+    return token or getattr(settings, "ZAPSIGN_API_TOKEN", None)
+
+
+class TenantContext:
+    """Usuário, perfil e empresa da requisição, carregados em uma única consulta."""
+
+    def __init__(self, user):
+        self.user = user
+        self.profile = getattr(user, "profile", None)
+        self.company = self.profile.company if self.profile else None
+        self.company_id = self.company.id if self.company else None
+
+    @property
+    def zapsign_api_token(self):
+        return company_zapsign_token(self.company)
+
+
+class TenantSnapshot:
+    """
+    O que fica no cache: só valores imutáveis de usuário, perfil e empresa.
+    Cada requisição recebe instâncias próprias (build), nunca objetos
+    compartilhados que poderiam ser alterados por outra requisição.
+    """
+
+    def __init__(self, user):
+        profile = getattr(user, "profile", None)
+        self.db = user._state.db
+        self.user = model_snapshot(user)
+        self.profile = model_snapshot(profile)
+        self.company = model_snapshot(profile.company if profile else None)
+
+    def build(self):
+        from app.company.models import Company, UserProfile
+
+        user = restore_model(get_user_model(), self.user, self.db)
+        profile = restore_model(UserProfile, self.profile, self.db)
+        if profile is not None:
+            profile.company = restore_model(Company, self.company, self.db)
+            profile.user = user
+        # Preenche o cache do OneToOne reverso (inclusive "sem perfil"):
+        # user.profile não consulta o banco
+        UserProfile._meta.get_field("user").remote_field.set_cached_value(user, profile)
+        return TenantContext(user)
+
+
+class TenantCache:
+    """Contexto do tenant por user_id (claim do JWT), em memória com TTL curto."""
+
+    _cache = LocalTTLCache(GENERATION_KEY, "TENANT_CACHE_MAX_ENTRIES", 4096)
+
+    @classmethod
+    def get(cls, user_id, clock=time.monotonic):
+        """Retorna um TenantContext novo do usuário ou None se ele não existir."""
+        if user_id is None:
+            return None
+
+        # Claim do JWT (str ou int) e user.pk compartilham a mesma entrada
+        user_id = str(user_id)
+        found, snapshot = cls._cache.get(user_id, clock)
+        if found:
+            return snapshot.build()
+
+        user = (
+            get_user_model()
+            .objects.select_related("profile__company")
+            .filter(pk=user_id)
+            .first()
+        )
+        if user is None:
+            return None
+
+        cls._cache.set(
+            user_id,
+            TenantSnapshot(user),
+            getattr(settings, "TENANT_CACHE_TTL_SECONDS", 60),
+            clock,
+        )
+        return TenantContext(user)
+
+    @classmethod
+    def invalidate(cls, user_ids=None):
+        """Descarta o contexto dos usuários informados (ou de todos)."""
+        if user_ids is not None:
+            user_ids = [str(user_id) for user_id in user_ids]
+        cls._cache.invalidate(user_ids)
+
+    @classmethod
+    def reset(cls):
+        cls._cache.reset()
+
+
+def tenant_for_user(user):
+    """TenantContext de um usuário autenticado (None para anônimos)."""
+    if not getattr(user, "is_authenticated", False):
+        return None
+    # Usuário vindo da autenticação JWT já traz perfil e empresa: reaproveita
+    # a mesma instância de request.user
+    if "profile" in user._state.fields_cache:
+        return TenantContext(user)
+    return TenantCache.get(user.pk)
@@ -26,8 +26,7 @@ class CompanyListCreateView(generics.ListCreateAPIView):
     def get_queryset(self):
         # SEGURANÇA: Retorna APENAS a empresa do usuário logado
         # O usuário não vê a lista global, apenas a dele.
-        user_company_id = self.request.user.profile.company.id
-        return Company.objects.filter(id=user_company_id)
+        return Company.objects.filter(id=self.request.tenant.company_id)
 
 
 @extend_schema_view(
@@ -55,5 +54,4 @@ class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        user_company_id = self.request.user.profile.company.id
-        return Company.objects.filter(id=user_company_id)
+        return Company.objects.filter(id=self.request.tenant.company_id)
@@ -0,0 +1,161 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\local_cache.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def model_snapshot(instance):
+    """Valores dos campos concretos do modelo (imutáveis) para recriar a instância."""
+    if instance is None:
+        return None
+    fields = tuple(field.attname for field in instance._meta.concrete_fields)
+    return fields, tuple(getattr(instance, name) for name in fields)
+
+
+def restore_model(model, snapshot, db):
+    """Instância nova (sem consulta) a partir de um snapshot."""
+    if snapshot is None:
+        return None
+    fields, values = snapshot
+    return model.from_db(db, fields, values)
+
+
+class LocalTTLCache:
+    """
+    Cache em memória do processo, com TTL por entrada e tamanho limitado (LRU).
+    A invalidação chega aos demais processos por um contador de geração no
+    cache compartilhado: quando ele muda, as entradas locais são descartadas.
+    O contador é consultado no máximo a cada LOCAL_CACHE_GENERATION_CHECK_SECONDS
+    (não a cada leitura), então uma invalidação feita em outro processo leva
+    até esse intervalo para chegar aqui.
+
+    Cada geração registra no cache compartilhado quais chaves invalidou: os
+    demais processos descartam só essas entradas. Se o registro de alguma
+    geração intermediária faltar (expirado) ou a invalidação for total, o
+    cache local inteiro é descartado.
+    """
+
+    ALL_KEYS = "*"
+    # Por quanto tempo o registro das chaves de cada geração fica disponível
+    LOG_TIMEOUT_SECONDS = 600
+    # Atraso máximo (em gerações) recuperado chave a chave
+    MAX_LOG_GAP = 100
+
+    def __init__(self, generation_key, max_entries_setting, default_max_entries=1024):
+        self.generation_key = generation_key
+        self.max_entries_setting = max_entries_setting
+        self.default_max_entries = default_max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # chave -> (expira_em, valor)
+        self._generation = None
+        self._generation_checked_at = None
+
+    def _sync_generation(self, clock):
+        interval = getattr(settings, "LOCAL_CACHE_GENERATION_CHECK_SECONDS", 1)
+        now = clock()
+        checked_at = self._generation_checked_at
+        if checked_at is not None and 0 <= now - checked_at < interval:
+            return
+        self._generation_checked_at = now
+
+        try:
+            generation = cache.get(self.generation_key, 0)
+        except Exception as e:
+            logger.warning(
+                f"Geração de {self.generation_key} indisponível, usando só o TTL local: {e}"
+            )
+            return
+
+        if generation == self._generation:
+            return
+        stale_keys = self._keys_invalidated_since(self._generation, generation)
+
+        with self._lock:
+            if stale_keys is None:
+                self._entries.clear()
+            else:
+                for key in stale_keys:
+                    self._entries.pop(key, None)
+            self._generation = generation
+
+    def _log_key(self, generation):
+        return f"{self.generation_key}:{generation}"
+
+    def _keys_invalidated_since(self, previous, current):
+        """Chaves invalidadas entre as duas gerações ou None (descartar tudo)."""
+        if previous is None or not 0 < current - previous <= self.MAX_LOG_GAP:
+            return None
+        log_keys = [self._log_key(g) for g in range(previous + 1, current + 1)]
+        try:
+            logged = cache.get_many(log_keys)
+        except Exception:
+            return None
+
+        stale_keys = set()
+        for log_key in log_keys:
+            keys = logged.get(log_key)
+            if keys is None or keys == self.ALL_KEYS:
+                return None
+            stale_keys.update(keys)
+        return stale_keys
+
+    def get(self, key, clock=time.monotonic):
+        """Retorna (encontrado, valor): None também é um valor válido em cache."""
+        self._sync_generation(clock)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > clock():
+                self._entries.move_to_end(key)
+                return True, entry[1]
+        return False, None
+
+    def set(self, key, value, ttl, clock=time.monotonic):
+        max_entries = getattr(settings, self.max_entries_setting, self.default_max_entries)
+        with self._lock:
+            self._entries[key] = (clock() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, keys=None):
+        """
+        Descarta as entradas `keys` (ou todas, sem `keys`) do cache local e
+        avisa os demais processos (nova geração).
+        """
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+            else:
+                keys = list(keys)
+                for key in keys:
+                    self._entries.pop(key, None)
+
+        try:
+            cache.add(self.generation_key, 0, timeout=None)
+            generation = cache.incr(self.generation_key)
+            cache.set(
+                self._log_key(generation),
+                self.ALL_KEYS if keys is None else keys,
+                timeout=self.LOG_TIMEOUT_SECONDS,
+            )
+            # Gerações de outros processos ainda não vistas aqui: sincroniza
+            # na próxima leitura em vez de assumir a geração nova
+            if self._generation == generation - 1:
+                self._generation = generation
+        except Exception as e:
+            logger.warning(f"Não foi possível propagar a invalidação de {self.generation_key}: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._generation = None
+            self._generation_checked_at = None
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from config.celery import benchmark_busy_task, benchmark_ping_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Satura a fila 'ai' com tasks lentas e mede a espera de tasks rápidas "
+        "em cada fila informada. Requer broker e workers em execução "
+        "(docker-compose)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ai-tasks", type=int, default=40)
+        parser.add_argument("--ai-seconds", type=float, default=5.0)
+        parser.add_argument("--samples", type=int, default=10)
+        parser.add_argument(
+            "--queues",
+            default="realtime,zapsign_io,ai",
+            help="Filas em que as tasks rápidas serão medidas.",
+        )
+        parser.add_argument("--timeout", type=float, default=300.0)
+
+    def _measure(self, queue, samples, priority, timeout):
+        waits = []
+        for _ in range(samples):
+            result = benchmark_ping_task.apply_async(
+                args=[time.time()], queue=queue, priority=priority
+            )
+            waits.append(result.get(timeout=timeout) * 1000)
+        return waits
+
+    def handle(self, *args, **kwargs):
+        samples = kwargs["samples"]
+        timeout = kwargs["timeout"]
+        priority = getattr(settings, "TASK_PRIORITY_INTERACTIVE", 2)
+        bulk_priority = getattr(settings, "TASK_PRIORITY_BULK", 7)
+
+        self.stdout.write(
+            f"Enfileirando {kwargs['ai_tasks']} tasks de {kwargs['ai_seconds']}s "
+            f"na fila 'ai' (prioridade {bulk_priority})..."
+        )
+        for _ in range(kwargs["ai_tasks"]):
+            benchmark_busy_task.apply_async(
+                args=[kwargs["ai_seconds"]], queue="ai", priority=bulk_priority
+            )
+
+        for queue in kwargs["queues"].split(","):
+            try:
+                waits = self._measure(queue, samples, priority, timeout)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f"{queue}: sem resposta ({e})"))
+                continue
+
+            waits.sort()
+            p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{queue}: espera p50 {statistics.median(waits):.1f} ms | "
+                    f"p95 {p95:.1f} ms | máx {waits[-1]:.1f} ms"
+                )
+            )
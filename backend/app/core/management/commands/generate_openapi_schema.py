@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from app.core.openapi import get_code_version, write_schema_file
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera o schema OpenAPI e grava em OPENAPI_SCHEMA_FILE. Os processos web "
+        "servem esse arquivo enquanto a versão do código for a mesma."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Caminho do arquivo (padrão: settings.OPENAPI_SCHEMA_FILE).",
+        )
+
+    def handle(self, *args, **kwargs):
+        path = write_schema_file(kwargs["output"] or settings.OPENAPI_SCHEMA_FILE)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Schema OpenAPI (versão {get_code_version()}) gravado em {path}"
+            )
+        )
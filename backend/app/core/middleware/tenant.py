@@ -0,0 +1,19 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\middleware\tenant.py
+from django.utils.functional import SimpleLazyObject
+
+from app.company.tenant import tenant_for_user
+
+
+class TenantMiddleware:
+    """
+    Expõe request.tenant (usuário, perfil, empresa e token da ZapSign).
+    É resolvido só no primeiro acesso, depois da autenticação JWT do DRF
+    (que também grava o usuário no request do Django).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.tenant = SimpleLazyObject(lambda: tenant_for_user(request.user))
+        return self.get_response(request)
@@ -60,15 +60,12 @@ class JWTAuthMiddleware:
     @staticmethod
     @database_sync_to_async
     def get_user(user_id):
-        # A chamada a get_user_model() é segura aqui, pois está dentro de uma função
-        # que só é executada após o registro de apps estar pronto.
-        from django.contrib.auth import get_user_model
-
-        User = get_user_model()
-        try:
-            return User.objects.get(id=user_id)
-        except User.DoesNotExist:
-            return None
+        # Import tardio: só executado após o registro de apps estar pronto.
+        # Usuário, perfil e empresa vêm juntos (e em cache) do contexto do tenant.
+        from app.company.tenant import TenantCache
+
+        tenant = TenantCache.get(user_id)
+        return tenant.user if tenant else None
 
 
 # Wrapper para usar o middleware com o Channels
@@ -0,0 +1,141 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\openapi.py
+import hashlib
+import json
+import logging
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+# Código que influencia o schema (views, serializers, urls e settings)
+SCHEMA_SOURCE_DIRS = ("app", "config")
+
+
+def _is_test_module(path: Path) -> bool:
+    return "tests" in path.parts or path.name.startswith("test_") or path.name == "conftest.py"
+
+
+@lru_cache(maxsize=1)
+def get_code_version() -> str:
+    """
+    Versão do código usada para invalidar o schema. Pode ser fixada via
+    settings (ex: SHA do commit no deploy); por padrão é derivada do conteúdo
+    dos arquivos .py (exceto testes) e das configurações do drf-spectacular.
+    """
+    configured = getattr(settings, "APP_CODE_VERSION", None)
+    if configured:
+        return configured
+
+    code_hash = hashlib.sha256()
+    base_dir = Path(settings.BASE_DIR)
+    for source_dir in SCHEMA_SOURCE_DIRS:
+        for source_path in sorted((base_dir / source_dir).rglob("*.py")):
+            if _is_test_module(source_path.relative_to(base_dir)):
+                continue
+            code_hash.update(str(source_path.relative_to(base_dir)).encode("utf-8"))
+            code_hash.update(source_path.read_bytes())
+    code_hash.update(
+        json.dumps(getattr(settings, "SPECTACULAR_SETTINGS", {}), sort_keys=True, default=str).encode("utf-8")
+    )
+    return code_hash.hexdigest()[:12]
+
+
+def generate_schema() -> dict:
+    return SchemaGenerator().get_schema(request=None, public=True)
+
+
+def write_schema_file(path=None) -> Path:
+    """Gera o schema e grava junto com a versão do código (usado no build/deploy)."""
+    path = Path(path or settings.OPENAPI_SCHEMA_FILE)
+    path.write_text(
+        json.dumps({"code_version": get_code_version(), "schema": generate_schema()}),
+        encoding="utf-8",
+    )
+    return path
+
+
+class OpenAPISchemaCache:
+    """
+    Schema OpenAPI gerado uma vez por processo (ou lido do arquivo gerado pelo
+    comando generate_openapi_schema, se for da mesma versão do código) e
+    renderizado uma vez por formato, com ETag.
+    """
+
+    _lock = threading.Lock()
+    _schema = None
+    _rendered = {}  # media type -> (corpo, etag)
+
+    @classmethod
+    def _load_schema_file(cls):
+        path = Path(getattr(settings, "OPENAPI_SCHEMA_FILE", ""))
+        if not path.is_file():
+            return None
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Schema OpenAPI em {path} ilegível, gerando novamente: {e}")
+            return None
+        if stored.get("code_version") != get_code_version():
+            logger.info(f"Schema OpenAPI em {path} é de outra versão do código, gerando novamente")
+            return None
+        return stored["schema"]
+
+    @classmethod
+    def get_schema(cls) -> dict:
+        if cls._schema is None:
+            with cls._lock:
+                if cls._schema is None:
+                    cls._schema = cls._load_schema_file() or generate_schema()
+        return cls._schema
+
+    @classmethod
+    def render(cls, renderer, renderer_context) -> tuple:
+        """Retorna (corpo, etag) do schema no formato do renderer."""
+        rendered = cls._rendered.get(renderer.media_type)
+        if rendered is None:
+            schema = cls.get_schema()
+            with cls._lock:
+                rendered = cls._rendered.get(renderer.media_type)
+                if rendered is None:
+                    body = renderer.render(schema, renderer.media_type, renderer_context)
+                    etag = f'"{get_code_version()}-{hashlib.sha256(body).hexdigest()[:16]}"'
+                    rendered = cls._rendered[renderer.media_type] = (body, etag)
+        return rendered
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._schema = None
+            cls._rendered = {}
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    SpectacularAPIView servido do OpenAPISchemaCache. Pedidos com `lang` ou
+    `version` continuam gerando o schema na hora (variações raras).
+    """
+
+    def _get_schema_response(self, request):
+        if request.GET.get("lang") or request.GET.get("version"):
+            return super()._get_schema_response(request)
+
+        renderer = request.accepted_renderer
+        body, etag = OpenAPISchemaCache.render(renderer, self.get_renderer_context())
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            content_type = renderer.media_type
+            if renderer.charset:
+                content_type = f"{content_type}; charset={renderer.charset}"
+            response = HttpResponse(body, content_type=content_type)
+            response["Content-Disposition"] = (
+                f'inline; filename="{self._get_filename(request, None)}"'
+            )
+        response["ETag"] = etag
+        return response
@@ -0,0 +1,70 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\request_logging.py
+import atexit
+import logging
+import os
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener
+
+# Logger dos eventos por requisição (middlewares). Nível e amostragem em
+# settings.LOGGING; use formatação preguiçosa: logger.debug("x=%s", valor).
+request_logger = logging.getLogger("app.request")
+# Eventos de segurança (ex: API Key rejeitada): nunca amostrados
+security_logger = logging.getLogger("app.security")
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Deixa passar só uma fração (`rate`, de 0 a 1) dos registros abaixo de
+    `always_level`; registros a partir desse nível passam sempre.
+    """
+
+    def __init__(self, rate=1.0, always_level="WARNING"):
+        super().__init__()
+        self.rate = float(rate)
+        self.always_level = logging.getLevelName(always_level)
+
+    def filter(self, record):
+        if record.levelno >= self.always_level:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+class AsyncStreamHandler(QueueHandler):
+    """
+    Handler não bloqueante: a requisição só enfileira o registro e uma thread
+    (QueueListener) escreve no stream. Com a fila cheia, o registro é descartado
+    em vez de segurar a requisição.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(int(queue_size)))
+        self.target = logging.StreamHandler(stream)
+        self.dropped = 0
+        self._start_listener()
+        atexit.register(self._stop_listener)
+        # Processos filhos (prefork do Celery/gunicorn) não herdam a thread
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._restart_in_child)
+
+    def _start_listener(self):
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def _stop_listener(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+
+    def _restart_in_child(self):
+        self.queue = queue.Queue(self.queue.maxsize)
+        self._start_listener()
+
+    def setFormatter(self, fmt):
+        # O formatador é aplicado na thread de escrita; aqui só a mensagem é montada
+        self.target.setFormatter(fmt)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,18 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\task_priority.py
+from django.conf import settings
+
+
+def task_priority(company_id=None, bulk: bool = False) -> int:
+    """
+    Prioridade da mensagem no broker (Redis: 0 é a mais alta).
+    Tarefas interativas passam à frente das disparadas em lote por
+    automações; empresas em TASK_PRIORITY_COMPANY_OVERRIDES têm prioridade
+    interativa própria. Tarefas em lote usam sempre TASK_PRIORITY_BULK.
+    """
+    if bulk:
+        return getattr(settings, "TASK_PRIORITY_BULK", 7)
+
+    overrides = getattr(settings, "TASK_PRIORITY_COMPANY_OVERRIDES", {})
+    return overrides.get(
+        company_id, getattr(settings, "TASK_PRIORITY_INTERACTIVE", 2)
+    )
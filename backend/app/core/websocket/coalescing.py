@@ -0,0 +1,49 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\core\websocket\coalescing.py
+import time
+
+from django.conf import settings
+
+
+class CoalescingBroadcaster:
+    """
+    Agrupa atualizações frequentes de um documento (ex: tokens da IA) em no
+    máximo uma mensagem a cada `interval` segundos. Cada mensagem carrega o
+    estado mais recente; os intermediários são descartados. A primeira
+    atualização é enviada imediatamente.
+    """
+
+    def __init__(
+        self, ws_service, document_id, event_type, extra=None, interval=None,
+        clock=time.monotonic,
+    ):
+        self.ws_service = ws_service
+        self.document_id = document_id
+        self.event_type = event_type
+        self.extra = extra or {}
+        self.interval = (
+            interval
+            if interval is not None
+            else getattr(settings, "AI_STREAM_BROADCAST_INTERVAL_MS", 100) / 1000
+        )
+        self.clock = clock
+        self.sent = 0
+        self._pending = None
+        self._last_sent_at = None
+
+    def push(self, data: dict):
+        self._pending = data
+        now = self.clock()
+        if self._last_sent_at is None or now - self._last_sent_at >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self._pending is None:
+            return
+        payload = dict(self.extra)
+        payload.update(self._pending)
+        self.ws_service.broadcast_document_update(
+            self.document_id, self.event_type, payload
+        )
+        self._pending = None
+        self._last_sent_at = self.clock()
+        self.sent += 1
@@ -3,6 +3,7 @@ import json
 import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from app.core.websocket.services import WebSocketService
+from app.company.tenant import tenant_for_user
 from app.document.models import Document
 from asgiref.sync import sync_to_async
 
@@ -104,10 +105,10 @@ class DocumentConsumer(AsyncWebsocketConsumer):
     def check_document_permission(self, document_id, user):
         """Verifica se o documento existe e pertence à empresa do usuário."""
         try:
-            document = Document.objects.get(id=document_id)
-            return document.company == user.profile.company
-        except Document.DoesNotExist:
-            return False
+            tenant = tenant_for_user(user)
+            return Document.objects.filter(
+                id=document_id, company_id=tenant.company_id
+            ).exists()
         except Exception:
             return False
 
@@ -178,6 +179,6 @@ class DocumentListConsumer(AsyncWebsocketConsumer):  # <--- NOVO CONSUMER
     def get_user_company_id(self, user):
         """Obtém o ID da empresa do usuário de forma síncrona."""
         try:
-            return user.profile.company.id
+            return tenant_for_user(user).company_id
         except Exception:
             return None
@@ -0,0 +1,57 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\document\filters.py
+from datetime import datetime, time
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+
+def _parse_boundary(param_name, value, end_of_day=False):
+    """Aceita data (YYYY-MM-DD) ou data/hora ISO 8601."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValidationError(
+                {param_name: "Data inválida. Use YYYY-MM-DD ou ISO 8601."}
+            )
+        parsed = datetime.combine(parsed_date, time.max if end_of_day else time.min)
+
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_documents(queryset, query_params):
+    """
+    Aplica os filtros da listagem de documentos no banco:
+    status, ai_status (status da análise de IA), created_after/created_before
+    e externalID. Status aceitam vários valores separados por vírgula.
+    """
+    status_values = query_params.get("status")
+    if status_values:
+        queryset = queryset.filter(status__in=status_values.split(","))
+
+    ai_status_values = query_params.get("ai_status")
+    if ai_status_values:
+        queryset = queryset.filter(ai_analysis__status__in=ai_status_values.split(","))
+
+    created_after = query_params.get("created_after")
+    if created_after:
+        queryset = queryset.filter(
+            created_at__gte=_parse_boundary("created_after", created_after)
+        )
+
+    created_before = query_params.get("created_before")
+    if created_before:
+        queryset = queryset.filter(
+            created_at__lte=_parse_boundary(
+                "created_before", created_before, end_of_day=True
+            )
+        )
+
+    external_id = query_params.get("externalID")
+    if external_id:
+        queryset = queryset.filter(externalID=external_id)
+
+    return queryset
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0002_userprofile'),
+        ('document', '0005_document_content_sha256'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='document_company_created_idx'),
+        ),
+    ]
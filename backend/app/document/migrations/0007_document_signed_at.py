@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document', '0006_document_list_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='document',
+            name='signed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
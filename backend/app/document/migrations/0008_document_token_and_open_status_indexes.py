@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def blank_tokens_to_null(apps, schema_editor):
+    # Token vazio equivale a "sem token" e não pode repetir na restrição única
+    Document = apps.get_model("document", "Document")
+    Document.objects.filter(token="").update(token=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document', '0007_document_signed_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_tokens_to_null, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='document',
+            constraint=models.UniqueConstraint(condition=models.Q(('token__isnull', False)), fields=('token',), name='document_token_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('token__isnull', False), models.Q(('status__in', ('signed', 'refused')), _negated=True)), fields=['id'], name='document_open_status_idx'),
+        ),
+    ]
@@ -1,8 +1,13 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\document\models.py
 from django.db import models
+from django.utils import timezone
 from app.company.models import Company
 
 
+# Status finais: o documento não muda mais na ZapSign
+TERMINAL_STATUSES = ("signed", "refused")
+
+
 class Document(models.Model):
     openID = models.IntegerField(null=True, blank=True)
     token = models.CharField(max_length=255, null=True, blank=True)
@@ -23,6 +28,45 @@ class Document(models.Model):
     signed_file_url = models.URLField(
         max_length=500, null=True, blank=True
     )  # <--- ALTERADO
+    # SHA-256 do PDF: referência para o texto extraído no DocumentTextStore
+    content_sha256 = models.CharField(max_length=64, null=True, blank=True)
+    # Momento em que o documento passou para "signed" (latência de assinatura)
+    signed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Suporta a paginação por cursor da listagem (company, created_at, id)
+            models.Index(
+                fields=["company", "-created_at", "-id"],
+                name="document_company_created_idx",
+            ),
+            # Reconciliação: só documentos ainda abertos na ZapSign, em ordem de id
+            models.Index(
+                fields=["id"],
+                name="document_open_status_idx",
+                condition=models.Q(token__isnull=False)
+                & ~models.Q(status__in=TERMINAL_STATUSES),
+            ),
+        ]
+        constraints = [
+            # Busca do webhook por token (documentos sem token ficam de fora)
+            models.UniqueConstraint(
+                fields=["token"],
+                name="document_token_uniq",
+                condition=models.Q(token__isnull=False),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Token vazio equivale a "sem token" (não entra na restrição de unicidade)
+        if self.token == "":
+            self.token = None
+        if self.status == "signed" and self.signed_at is None:
+            self.signed_at = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "signed_at"}
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.name} ({self.id})"
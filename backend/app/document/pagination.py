@@ -0,0 +1,18 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\document\pagination.py
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class DocumentCursorPagination(CursorPagination):
+    """
+    Paginação por cursor (keyset) em (created_at, id): o custo de cada página
+    não cresce com o deslocamento, ao contrário de LIMIT/OFFSET, e a listagem
+    permanece estável mesmo com documentos sendo criados durante a navegação.
+    """
+
+    ordering = ("-created_at", "-id")
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        self.page_size = getattr(settings, "DOCUMENT_LIST_PAGE_SIZE", 50)
+        self.max_page_size = getattr(settings, "DOCUMENT_LIST_MAX_PAGE_SIZE", 200)
@@ -44,6 +44,12 @@ class SignerCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 class DocumentSerializer(serializers.ModelSerializer):
+    """
+    Aceita o kwarg opcional `fields` (lista de nomes) para retornar apenas um
+    subconjunto dos campos (sparse fieldsets). Campos omitidos não são
+    serializados, evitando as consultas de signatários e análise de IA.
+    """
+
     signers_db = serializers.SerializerMethodField(read_only=True)
     ai_analysis = DocumentAnalysisSerializer(read_only=True, allow_null=True)
     signers = SignerCreateUpdateSerializer(
@@ -78,6 +84,27 @@ class DocumentSerializer(serializers.ModelSerializer):
             "company",
         )
 
+    @staticmethod
+    def setup_eager_loading(queryset, fields=None):
+        """
+        Carrega antecipadamente as relações usadas na serialização, para que
+        listas (many=True) executem um número constante de consultas em vez
+        de consultas por documento. Com `fields`, carrega apenas o necessário.
+        """
+        if not fields or "ai_analysis" in fields:
+            queryset = queryset.select_related("ai_analysis")
+        if not fields or "signers_db" in fields:
+            queryset = queryset.prefetch_related("signers")
+        return queryset
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+
     @extend_schema_field(serializers.ListField(child=serializers.DictField()))
     def get_signers_db(self, obj):
         signers_queryset = obj.signers.all()
@@ -0,0 +1,207 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\document\status_sync.py
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from app.automations.signals import track_saved_statuses
+from app.company.tenant import company_zapsign_token
+from app.core.websocket.services import WebSocketService
+from app.document.models import TERMINAL_STATUSES, Document
+from app.document.serializers import DocumentSerializer
+from app.services.zapsign_async_service import (
+    AsyncZapSignClientPool,
+    AsyncZapSignService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+LAST_RECONCILE_KEY = "zapsign_reconcile:last_run:{company_id}"
+RECONCILE_LOCK_KEY = "zapsign_reconcile:lock"
+
+
+# ========================================================================
+# Frescor do status local (usado pelo retrieve do documento)
+# ========================================================================
+def is_remote_status_stale(document) -> bool:
+    """
+    Indica se o status local deve ser confirmado na ZapSign.
+    Com ZAPSIGN_STATUS_STALENESS_SECONDS=None o status local é sempre servido
+    (o reconciliador periódico mantém os dados atualizados).
+    """
+    threshold = getattr(settings, "ZAPSIGN_STATUS_STALENESS_SECONDS", None)
+    if threshold is None or document.status in TERMINAL_STATUSES:
+        return False
+
+    fresh_since = time.time() - threshold
+
+    if document.last_updated_at and document.last_updated_at.timestamp() > fresh_since:
+        return False
+
+    last_reconcile = cache.get(
+        LAST_RECONCILE_KEY.format(company_id=document.company_id)
+    )
+    return not (last_reconcile and last_reconcile > fresh_since)
+
+
+# ========================================================================
+# Reconciliação em lote
+# ========================================================================
+async def _fetch_remote_statuses(tokens_by_api_token):
+    try:
+        per_company_results = await asyncio.gather(
+            *(
+                AsyncZapSignService(api_token=api_token).get_document_statuses(
+                    document_tokens
+                )
+                for api_token, document_tokens in tokens_by_api_token.items()
+            )
+        )
+    finally:
+        await AsyncZapSignClientPool.aclose()
+
+    results = {}
+    for company_results in per_company_results:
+        results.update(company_results)
+    return results
+
+
+def apply_remote_state(document, remote) -> bool:
+    """
+    Aplica no documento (em memória) o status e o PDF assinado informados pela
+    ZapSign (consulta ou webhook). Retorna True se algum campo mudou.
+    """
+    changed = False
+
+    new_status = remote.get("status")
+    if new_status and new_status != document.status:
+        document.status = new_status
+        if new_status == "signed" and document.signed_at is None:
+            document.signed_at = timezone.now()
+        changed = True
+
+    signed_file_url = remote.get("signed_file")
+    if signed_file_url and signed_file_url != document.signed_file_url:
+        document.signed_file_url = signed_file_url
+        changed = True
+
+    return changed
+
+
+def broadcast_document_changes(changed_documents):
+    """Envia o documento atualizado para a lista de documentos da empresa."""
+    if not changed_documents:
+        return
+
+    ws_service = WebSocketService()
+    documents = DocumentSerializer.setup_eager_loading(
+        Document.objects.filter(id__in=[doc.id for doc in changed_documents])
+    )
+    for document in documents:
+        ws_service.broadcast_document_list_update(
+            document.company_id,
+            "document_updated",
+            DocumentSerializer(document).data,
+        )
+
+
+def reconcile_document_statuses(batch_size=None) -> dict:
+    """
+    Consulta na ZapSign, de forma concorrente e em lotes, os documentos em
+    status não final. Grava apenas as linhas alteradas (bulk_update) e envia
+    broadcast somente desses documentos.
+    """
+    batch_size = batch_size or getattr(settings, "ZAPSIGN_RECONCILE_BATCH_SIZE", 200)
+    summary = {"checked": 0, "changed": 0, "errors": 0}
+
+    pending_documents = (
+        Document.objects.filter(token__isnull=False)
+        .exclude(status__in=TERMINAL_STATUSES)
+        .select_related("company")
+        .only(
+            "id",
+            "token",
+            "status",
+            "signed_file_url",
+            "signed_at",
+            "created_at",
+            "company_id",
+            "company__apiToken",
+        )
+        .order_by("id")
+    )
+
+    last_id = 0
+    company_ids = set()
+    # Empresas com alguma consulta falha não têm o status confirmado nesta execução
+    failed_company_ids = set()
+    while True:
+        batch = list(pending_documents.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        # Agrupa por API Token: cada empresa consulta com o próprio token
+        tokens_by_api_token = defaultdict(list)
+        documents_by_token = {}
+        for document in batch:
+            api_token = company_zapsign_token(document.company)
+            if not api_token:
+                continue
+            company_ids.add(document.company_id)
+            tokens_by_api_token[api_token].append(document.token)
+            documents_by_token[document.token] = document
+
+        remote_results = asyncio.run(_fetch_remote_statuses(tokens_by_api_token))
+
+        changed_documents = []
+        now = timezone.now()
+        for document_token, remote in remote_results.items():
+            summary["checked"] += 1
+            document = documents_by_token[document_token]
+            if isinstance(remote, Exception):
+                summary["errors"] += 1
+                failed_company_ids.add(document.company_id)
+                logger.warning(
+                    f"[Reconcile] Falha ao consultar documento {document_token}: {remote}"
+                )
+                continue
+
+            if apply_remote_state(document, remote):
+                document.last_updated_at = now
+                changed_documents.append(document)
+
+        # Documentos sem resposta também deixam a empresa sem confirmação
+        for document_token, document in documents_by_token.items():
+            if document_token not in remote_results:
+                failed_company_ids.add(document.company_id)
+
+        if changed_documents:
+            Document.objects.bulk_update(
+                changed_documents,
+                ["status", "signed_file_url", "signed_at", "last_updated_at"],
+            )
+            # bulk_update não dispara signals: atualiza os rollups explicitamente
+            track_saved_statuses(changed_documents)
+            broadcast_document_changes(changed_documents)
+            summary["changed"] += len(changed_documents)
+
+    finished_at = time.time()
+    for company_id in company_ids - failed_company_ids:
+        cache.set(
+            LAST_RECONCILE_KEY.format(company_id=company_id),
+            finished_at,
+            timeout=int(timedelta(days=1).total_seconds()),
+        )
+
+    logger.info(
+        f"[Reconcile] {summary['checked']} documentos consultados, "
+        f"{summary['changed']} alterados, {summary['errors']} falhas"
+    )
+    return summary
@@ -0,0 +1,241 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\document\tasks.py
+import base64
+import logging
+import os
+
+import requests
+from celery import chain, shared_task
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from app.ai.inflight import claim_analysis_run
+from app.ai.models import DocumentAnalysis
+from app.ai.tasks import analyze_document_content_task
+from app.core.websocket.services import WebSocketService
+from app.document.status_sync import RECONCILE_LOCK_KEY, reconcile_document_statuses
+from app.services.storage_service import StorageService
+from app.services.text_store import DocumentTextStore
+from app.utils.pdf_utils import extract_text_from_pdf
+
+logger = logging.getLogger(__name__)
+
+# Evento emitido no grupo document_{id} a cada mudança de etapa da ingestão
+INGESTION_EVENT = "ingestion_status_update"
+
+
+def _broadcast_stage(document_id: int, stage: str, stage_status: str, **extra):
+    """Notifica o frontend (grupo document_{id}) sobre o andamento de uma etapa."""
+    data = {"document_id": document_id, "stage": stage, "status": stage_status}
+    data.update(extra)
+    WebSocketService().broadcast_document_update(document_id, INGESTION_EVENT, data)
+
+
+def start_ingestion_pipeline(
+    document_id: int,
+    base64_pdf: str = None,
+    model_name: str = "gemini",
+    priority: int = None,
+):
+    """
+    Dispara o pipeline assíncrono de ingestão do PDF:
+    fetch (download/leitura) -> extract (texto) -> analyze (IA).
+
+    A view de criação apenas enfileira o pipeline e responde imediatamente.
+    Um PDF em Base64 é decodificado e gravado no StorageService aqui: a
+    mensagem do broker leva só o caminho do arquivo (tamanho constante,
+    inclusive nos retries). A prioridade vale para todas as etapas.
+    """
+    pdf_path = None
+    if base64_pdf:
+        try:
+            pdf_path = StorageService().save_binary_file(base64.b64decode(base64_pdf))
+        except Exception as e:
+            logger.error(f"PDF em Base64 inválido para o documento {document_id}: {e}")
+            _broadcast_stage(document_id, "fetch", "failed", detail=str(e))
+            raise
+
+    pipeline = chain(
+        fetch_document_pdf_task.s(document_id, pdf_path=pdf_path).set(
+            priority=priority
+        ),
+        extract_document_text_task.s(
+            document_id, model_name=model_name, priority=priority
+        ).set(priority=priority),
+    )
+    return pipeline.apply_async()
+
+
+def _remove_pdf(pdf_path):
+    try:
+        os.remove(pdf_path)
+    except OSError:
+        logger.warning(f"Não foi possível remover o PDF temporário {pdf_path}")
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def fetch_document_pdf_task(
+    self, document_id: int, pdf_path: str = None, base64_pdf: str = None
+):
+    """
+    Etapa 1: obtém o PDF (arquivo já gravado por start_ingestion_pipeline ou
+    download da url_pdf), calcula o SHA-256 (chave do DocumentTextStore) e
+    garante o arquivo no StorageService. Retorna o caminho do arquivo e a
+    referência do texto para a próxima etapa, que remove o arquivo.
+
+    `base64_pdf` só é aceito para mensagens enfileiradas por versões anteriores.
+    """
+    Document = apps.get_model("document", "Document")
+    document = Document.objects.get(id=document_id)
+
+    _broadcast_stage(document_id, "fetch", "processing")
+
+    try:
+        if pdf_path:
+            with open(pdf_path, "rb") as pdf_file:
+                pdf_content_bytes = pdf_file.read()
+        elif base64_pdf:
+            pdf_content_bytes = base64.b64decode(base64_pdf)
+            pdf_path = StorageService().save_binary_file(pdf_content_bytes)
+        elif document.url_pdf:
+            pdf_response = requests.get(document.url_pdf, timeout=10)
+            pdf_response.raise_for_status()
+            pdf_content_bytes = pdf_response.content
+            pdf_path = StorageService().save_binary_file(pdf_content_bytes)
+        else:
+            raise ValueError("Documento não possui url_pdf nem PDF enviado.")
+
+        text_ref = DocumentTextStore.compute_key(pdf_content_bytes)
+        Document.objects.filter(id=document_id).update(content_sha256=text_ref)
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Erro ao baixar PDF do documento {document_id}: {e}")
+        if self.request.retries < self.max_retries:
+            _broadcast_stage(document_id, "fetch", "retrying", detail=str(e))
+            raise self.retry(exc=e)
+        _broadcast_stage(document_id, "fetch", "failed", detail=str(e))
+        raise
+
+    except Exception as e:
+        logger.error(f"Erro ao obter PDF do documento {document_id}: {e}")
+        _broadcast_stage(document_id, "fetch", "failed", detail=str(e))
+        raise
+
+    logger.info(
+        f"PDF do documento {document_id} obtido: {len(pdf_content_bytes)} bytes"
+    )
+    _broadcast_stage(document_id, "fetch", "completed")
+    return {"pdf_path": pdf_path, "text_ref": text_ref}
+
+
+@shared_task(bind=True)
+def extract_document_text_task(
+    self,
+    fetch_result: dict,
+    document_id: int,
+    model_name: str = "gemini",
+    priority: int = None,
+):
+    """
+    Etapa 2: extrai o texto do PDF gravado na etapa anterior, grava-o no
+    DocumentTextStore e enfileira a análise de IA (etapa 3) apenas com a
+    referência do texto.
+    """
+    pdf_path = fetch_result.get("pdf_path")
+    text_ref = fetch_result["text_ref"]
+    text_store = DocumentTextStore()
+
+    try:
+        if text_store.exists(text_ref):
+            # Mesmo PDF já processado antes: o texto já está no store
+            logger.info(
+                f"Texto {text_ref} já presente no store; extração ignorada para doc {document_id}"
+            )
+            _broadcast_stage(document_id, "extract", "completed", cached=True)
+        else:
+            _broadcast_stage(document_id, "extract", "processing")
+            try:
+                if not pdf_path:
+                    # Resultado de uma versão anterior do fetch, sem o arquivo
+                    raise ValueError(
+                        f"PDF do documento {document_id} indisponível e texto "
+                        f"{text_ref} ausente do store; reenvie o documento."
+                    )
+                # Leitura pelo caminho (mmap), sem carregar o PDF inteiro em bytes
+                document_content = extract_text_from_pdf(pdf_path)
+                text_store.save(text_ref, document_content)
+            except Exception as e:
+                logger.error(f"Erro ao extrair texto do documento {document_id}: {e}")
+                _broadcast_stage(document_id, "extract", "failed", detail=str(e))
+                raise
+
+            logger.info(
+                f"Texto extraído do documento {document_id}: {len(document_content)} caracteres"
+            )
+            _broadcast_stage(
+                document_id, "extract", "completed", characters=len(document_content)
+            )
+    finally:
+        # O PDF temporário não é mais necessário após esta etapa
+        if pdf_path:
+            _remove_pdf(pdf_path)
+
+    enqueue_document_analysis(
+        document_id, text_ref, model_name=model_name, priority=priority
+    )
+
+
+def enqueue_document_analysis(
+    document_id: int, text_ref: str, model_name="gemini", priority: int = None
+):
+    """
+    Etapa 3: marca a análise como pendente e enfileira a task de IA (fila "ai").
+    A mensagem do broker contém apenas a referência do texto (tamanho constante).
+
+    Pedidos repetidos para o mesmo (documento, hash do conteúdo, modelo)
+    enquanto uma execução está em andamento são anexados a ela, sem nova
+    task. Retorna o run_id da execução (nova ou existente).
+    """
+    run_id, created = claim_analysis_run(document_id, text_ref, model_name)
+    if not created:
+        logger.info(
+            f"Análise do documento {document_id} já em andamento (execução {run_id}); "
+            "pedido anexado à execução existente."
+        )
+        _broadcast_stage(document_id, "analyze", "queued", run_id=run_id, coalesced=True)
+        return run_id
+
+    # A nova execução passa a ser a vigente; as anteriores terão o resultado descartado
+    DocumentAnalysis.objects.update_or_create(
+        document_id=document_id,
+        defaults={"status": "pending", "model_used": model_name, "run_id": run_id},
+    )
+    analyze_document_content_task.apply_async(
+        kwargs={
+            "document_id": document_id,
+            "text_ref": text_ref,
+            "model_name": model_name,
+            "run_id": run_id,
+        },
+        task_id=run_id,
+        priority=priority,
+    )
+    _broadcast_stage(document_id, "analyze", "queued", run_id=run_id)
+    return run_id
+
+
+@shared_task(ignore_result=True)
+def reconcile_document_statuses_task():
+    """
+    Task periódica (Celery beat): sincroniza com a ZapSign o status dos
+    documentos ainda não finalizados. Um lock evita execuções sobrepostas.
+    """
+    lock_timeout = getattr(settings, "ZAPSIGN_RECONCILE_INTERVAL_SECONDS", 300)
+    if not cache.add(RECONCILE_LOCK_KEY, True, timeout=lock_timeout):
+        logger.info("[Reconcile] Execução anterior ainda em andamento; ignorando.")
+        return None
+
+    try:
+        return reconcile_document_statuses()
+    finally:
+        cache.delete(RECONCILE_LOCK_KEY)
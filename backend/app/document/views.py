@@ -1,31 +1,32 @@
-import requests
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+from app.document.filters import filter_documents
 from app.document.models import Document
+from app.document.pagination import DocumentCursorPagination
 from app.document.serializers import (
     DocumentSerializer,
 )
-from app.services.zapsign_service import ZapSignService
+from app.services.zapsign_service import ZapSignClientRegistry
 from app.signer.models import Signer
-from app.ai.tasks import analyze_document_content_task
-from app.ai.models import DocumentAnalysis
+from app.document.tasks import start_ingestion_pipeline
+from app.core.task_priority import task_priority
+from app.document.status_sync import is_remote_status_stale
 from app.core.websocket.services import WebSocketService
 from app.core.middleware.response import success, error
-from django.conf import settings
 import logging
-import base64
-from app.utils.pdf_utils import extract_text_from_pdf
 from drf_spectacular.utils import (
     extend_schema,
     inline_serializer,
+    OpenApiParameter,
     OpenApiResponse,
     extend_schema_view,
 )
 
 from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import GenericAPIView
 
 
@@ -35,7 +36,32 @@ logger = logging.getLogger(__name__)
 @extend_schema_view(
     get=extend_schema(
         summary="Listar documentos",
-        description="Retorna os documentos da empresa do usuário autenticado.",
+        description=(
+            "Retorna os documentos da empresa do usuário autenticado, paginados "
+            "por cursor (mais recentes primeiro)."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "status", str, description="Status (separados por vírgula)"
+            ),
+            OpenApiParameter(
+                "ai_status",
+                str,
+                description="Status da análise de IA (separados por vírgula)",
+            ),
+            OpenApiParameter(
+                "created_after", str, description="Data inicial (YYYY-MM-DD ou ISO)"
+            ),
+            OpenApiParameter(
+                "created_before", str, description="Data final (YYYY-MM-DD ou ISO)"
+            ),
+            OpenApiParameter("externalID", str, description="ID externo"),
+            OpenApiParameter(
+                "fields",
+                str,
+                description="Campos a retornar, separados por vírgula (ex: id,name,status)",
+            ),
+        ],
         responses=DocumentSerializer(many=True),
     ),
     post=extend_schema(
@@ -71,9 +97,35 @@ logger = logging.getLogger(__name__)
 )
 class DocumentListCreateView(generics.ListCreateAPIView):
     serializer_class = DocumentSerializer
+    pagination_class = DocumentCursorPagination
 
     def get_queryset(self):
-        return Document.objects.filter(company=self.request.user.profile.company)
+        queryset = Document.objects.filter(company_id=self.request.tenant.company_id)
+        if self.request.method == "GET":
+            queryset = filter_documents(queryset, self.request.query_params)
+            queryset = DocumentSerializer.setup_eager_loading(
+                queryset, fields=self._requested_fields()
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == "GET":
+            kwargs.setdefault("fields", self._requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def _requested_fields(self):
+        """Lê o parâmetro `fields` (sparse fieldsets) e valida os nomes."""
+        fields_param = self.request.query_params.get("fields")
+        if not fields_param:
+            return None
+
+        requested = [name.strip() for name in fields_param.split(",") if name.strip()]
+        unknown = set(requested) - set(DocumentSerializer.Meta.fields)
+        if unknown:
+            raise ValidationError(
+                {"fields": f"Campos inválidos: {', '.join(sorted(unknown))}"}
+            )
+        return requested
 
     def create(self, request, *args, **kwargs):
         payload = request.data.copy()
@@ -94,22 +146,19 @@ class DocumentListCreateView(generics.ListCreateAPIView):
         serializer = self.get_serializer(data={**payload, "signers_set": signers_data})
         serializer.is_valid(raise_exception=True)
 
-        company = request.user.profile.company
-        document = serializer.save(url_pdf=doc_url_for_db, company=company)
+        # Empresa do tenant e cliente da ZapSign já resolvidos (em cache)
+        tenant = request.tenant
+        document = serializer.save(url_pdf=doc_url_for_db, company=tenant.company)
 
-        zapsign_api_token_to_use = company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                document.delete()
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento local foi removido."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
+        zapsign = ZapSignClientRegistry.for_company(tenant.company_id)
+        if zapsign is None:
+            document.delete()
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento local foi removido."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         zapsign_signers_payload = [
             {
@@ -166,49 +215,19 @@ class DocumentListCreateView(generics.ListCreateAPIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        # --- Disparar Análise de IA Assíncrona ---
-        document_content = None
-
-        if base64_pdf:
-            try:
-                # Caso 1: PDF veio em Base64 (podemos analisar diretamente os bytes)
-                pdf_content_bytes = base64.b64decode(base64_pdf)
-                document_content = extract_text_from_pdf(pdf_content_bytes)
-                logger.info(
-                    f"Texto extraído do Base64 para IA: {len(document_content)} caracteres"
-                )
-
-            except Exception as e:
-                logger.error(f"Erro ao processar Base64 para análise de IA: {e}")
-
-        elif url_pdf:
-            try:
-                # Caso 2: PDF veio em URL (baixamos para analisar)
-                pdf_response = requests.get(url_pdf, timeout=10)
-                pdf_response.raise_for_status()
-
-                document_content = extract_text_from_pdf(pdf_response.content)
-
-                logger.info(
-                    f"Texto extraído do PDF: {len(document_content)} caracteres"
-                )
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Erro ao baixar PDF para análise de IA: {e}")
-            except Exception as e:
-                logger.error(f"Erro inesperado ao disparar análise de IA: {e}")
-
-        if document_content:
-            DocumentAnalysis.objects.create(
-                document=document, status="pending", model_used="gemini"
-            )
-            analyze_document_content_task.delay(
-                document_id=document.id,
-                document_content=document_content,
+        # --- Disparar Pipeline de Ingestão Assíncrono (fetch -> extract -> analyze) ---
+        # O download/decodificação do PDF e a extração de texto rodam no Celery;
+        # o progresso de cada etapa é publicado no grupo WebSocket document_{id}.
+        try:
+            start_ingestion_pipeline(
+                document.id,
+                base64_pdf=base64_pdf,
                 model_name="gemini",
+                priority=task_priority(document.company_id),
             )
-        else:
-            logger.info(
-                f"Análise de IA não disparada para doc {document.id}. Conteúdo não disponível/Falha na extração."
+        except Exception as e:
+            logger.error(
+                f"Erro ao enfileirar pipeline de ingestão para doc {document.id}: {e}"
             )
 
         ws_service = WebSocketService()
@@ -243,6 +262,16 @@ class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Apenas na leitura: no update o prefetch ficaria desatualizado
+        # após a alteração dos signatários.
+        if self.request.method == "GET":
+            queryset = DocumentSerializer.setup_eager_loading(
+                queryset.select_related("company")
+            )
+        return queryset
+
     def get_serializer_context(self):
         """
         Adiciona o request ao contexto do serializer para acesso em métodos customizados.
@@ -252,21 +281,24 @@ class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
     def retrieve(self, request, *args, **kwargs):
         document = self.get_object()
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(DocumentSerializer(document).data)
+        # O status local é mantido pelo reconciliador periódico e pelo webhook;
+        # a ZapSign só é consultada se o status estiver desatualizado.
+        if not document.token or not is_remote_status_stale(document):
+            return Response(DocumentSerializer(document).data)
 
-        if document.token:
-            zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
-            try:
-                remote = zapsign.get_document_status(document.token)
-                document.status = remote.get("status", document.status)
-                document.save()
-            except Exception as e:
-                logger.error(f"Erro ao consultar status do documento na ZapSign: {e}")
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(document.company_id)
+        if zapsign is None:
+            return Response(DocumentSerializer(document).data)
+
+        try:
+            remote = zapsign.get_document_status(document.token)
+            new_status = remote.get("status", document.status)
+            if new_status != document.status:
+                document.status = new_status
+                document.save(update_fields=["status", "last_updated_at"])
+        except Exception as e:
+            logger.error(f"Erro ao consultar status do documento na ZapSign: {e}")
 
         return Response(DocumentSerializer(document).data)
 
@@ -286,19 +318,15 @@ class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
         )
         serializer.is_valid(raise_exception=True)
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento não foi atualizado."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento não foi atualizado."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # Processa remoção de signatários na ZapSign
         for signer_id in signers_to_remove_ids:
@@ -366,21 +394,17 @@ class DocumentDetailView(generics.RetrieveUpdateDestroyAPIView):
     def destroy(self, request, *args, **kwargs):
         document = self.get_object()
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento será excluído apenas localmente."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Documento será excluído apenas localmente."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         if document.token:
-            zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
             try:
                 zapsign.delete_document(document.token)
                 logger.info(f"Documento {document.id} excluído com sucesso na ZapSign.")
@@ -435,20 +459,15 @@ class DocumentDownloadPDFView(APIView):
         if not document.token:
             return Response({"error": "Documento não possui token ZapSign"}, status=400)
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
-
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         try:
             # 1. Faz GET para o detalhe do documento na ZapSign para obter o NOVO link 'signed_file'
@@ -514,7 +533,7 @@ class DocumentSyncStatusView(GenericAPIView):
 
     def post(self, request, pk):
         try:
-            document = Document.objects.get(pk=pk, company=request.user.profile.company)
+            document = Document.objects.get(pk=pk, company_id=request.tenant.company_id)
         except Document.DoesNotExist:
             return Response(
                 error("Documento não encontrado."), status=status.HTTP_404_NOT_FOUND
@@ -526,18 +545,14 @@ class DocumentSyncStatusView(GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    error("API Token da ZapSign não configurado."),
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(request.tenant.company_id)
+        if zapsign is None:
+            return Response(
+                error("API Token da ZapSign não configurado."),
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
         try:
             remote = zapsign.get_document_status(document.token)
             new_status = remote.get("status", document.status)
@@ -553,7 +568,7 @@ class DocumentSyncStatusView(GenericAPIView):
             # O broadcast DEVE ser feito para notificar o frontend que a operação de sync terminou
             ws_service = WebSocketService()
             ws_service.broadcast_document_list_update(
-                document.company.id,
+                document.company_id,
                 "document_updated",
                 DocumentSerializer(document).data,
             )
@@ -0,0 +1,75 @@
+# ============================================================================
+# Document Text Store
+# Armazena o texto extraído dos PDFs endereçado pelo SHA-256 do PDF.
+# As tasks do Celery recebem apenas a referência (hash), nunca o texto.
+# ============================================================================
+
+import hashlib
+import os
+import tempfile
+
+from django.conf import settings
+
+
+class DocumentTextNotFound(Exception):
+    """O texto referenciado não existe no store."""
+
+
+class DocumentTextStore:
+    """
+    Store de texto endereçado por conteúdo (content-addressed).
+    Implementação local em disco, podendo ser trocada por S3/GCS no futuro.
+    """
+
+    def __init__(self, base_path=None):
+        self.base_path = base_path or getattr(
+            settings,
+            "DOCUMENT_TEXT_STORE_PATH",
+            os.path.join(settings.BASE_DIR, "storage", "texts"),
+        )
+
+    # ========================================================================
+    # Hash do PDF (chave do store)
+    # ========================================================================
+    @staticmethod
+    def compute_key(pdf_content: bytes) -> str:
+        return hashlib.sha256(pdf_content).hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        if len(key) != 64 or not all(c in "0123456789abcdef" for c in key):
+            raise ValueError(f"Referência de texto inválida: {key!r}")
+        # Subdiretório pelo prefixo evita diretórios com milhares de arquivos
+        return os.path.join(self.base_path, key[:2], f"{key}.txt")
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path_for(key))
+
+    # ========================================================================
+    # Gravação atômica (o texto é imutável para um mesmo hash)
+    # ========================================================================
+    def save(self, key: str, text: str) -> str:
+        path = self._path_for(key)
+        if os.path.exists(path):
+            return key
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                tmp_file.write(text)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return key
+
+    def load(self, key: str) -> str:
+        try:
+            with open(self._path_for(key), "r", encoding="utf-8") as text_file:
+                return text_file.read()
+        except FileNotFoundError:
+            raise DocumentTextNotFound(
+                f"Texto {key} não encontrado no store."
+            ) from None
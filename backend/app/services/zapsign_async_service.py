@@ -0,0 +1,205 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\services\zapsign_async_service.py
+import asyncio
+import logging
+import weakref
+
+import httpx
+from django.conf import settings
+
+from app.services.zapsign_service import ZapSignService
+
+
+class AsyncZapSignClientPool:
+    """
+    Pool assíncrono compartilhado (httpx.AsyncClient) e semáforo de
+    concorrência, um por event loop. Permite disparar centenas de chamadas à
+    ZapSign em paralelo sem uma thread por chamada e sem exceder o limite de
+    conexões simultâneas.
+    """
+
+    _clients = weakref.WeakKeyDictionary()
+    _semaphores = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _build_client() -> httpx.AsyncClient:
+        max_connections = getattr(settings, "ZAPSIGN_ASYNC_MAX_CONNECTIONS", 50)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        timeout = httpx.Timeout(
+            getattr(settings, "ZAPSIGN_HTTP_READ_TIMEOUT", 15),
+            connect=getattr(settings, "ZAPSIGN_HTTP_CONNECT_TIMEOUT", 5),
+        )
+        # Retries do transporte cobrem apenas falhas de conexão. Os limites vão
+        # no transporte: com transport= o AsyncClient ignora o próprio `limits`
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits,
+            retries=getattr(settings, "ZAPSIGN_HTTP_RETRIES", 3),
+        )
+        return httpx.AsyncClient(timeout=timeout, transport=transport)
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = cls._clients.get(loop)
+        if client is None or client.is_closed:
+            client = cls._build_client()
+            cls._clients[loop] = client
+        return client
+
+    @classmethod
+    def get_semaphore(cls) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = cls._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(
+                getattr(settings, "ZAPSIGN_ASYNC_CONCURRENCY", 20)
+            )
+            cls._semaphores[loop] = semaphore
+        return semaphore
+
+    @classmethod
+    async def aclose(cls):
+        """Fecha o cliente do event loop atual (ex: ao final de um job em lote)."""
+        loop = asyncio.get_running_loop()
+        client = cls._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+
+class AsyncZapSignService:
+    """
+    Versão assíncrona do ZapSignService, com a mesma interface, para uso nos
+    consumers do Channels (ASGI) e em jobs em lote.
+    """
+
+    BASE_URL = ZapSignService.BASE_URL
+
+    def __init__(self, api_token=None, client: httpx.AsyncClient = None):
+        env_token = getattr(settings, "ZAPSIGN_API_TOKEN", None)
+        self.api_token = api_token or env_token
+
+        if not self.api_token:
+            raise ValueError("API Token da ZapSign não configurado.")
+
+        self.headers = {
+            "Authorization": f"Bearer {self.api_token}",
+            "Content-Type": "application/json",
+        }
+        self._client = client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or AsyncZapSignClientPool.get_client()
+
+    async def _send(self, method, endpoint, json=None, params=None, timeout=None):
+        url = f"{self.BASE_URL}{endpoint}"
+        request_kwargs = {"headers": self.headers, "json": json, "params": params}
+        if timeout is not None:
+            request_kwargs["timeout"] = timeout
+
+        async with AsyncZapSignClientPool.get_semaphore():
+            return await self.client.request(method, url, **request_kwargs)
+
+    async def _request(self, method, endpoint, json=None, params=None):
+        try:
+            response = await self._send(method, endpoint, json=json, params=params)
+        except httpx.HTTPError as e:
+            logging.error(f"[ZapSign] Erro de conexão: {e}")
+            raise Exception("Erro ao conectar com ZapSign.") from e
+
+        if response.status_code >= 400:
+            logging.error(
+                f"[ZapSign] Erro HTTP {response.status_code}: {response.text}"
+            )
+            raise Exception(
+                f"Erro ZapSign: {ZapSignService._error_detail(response)}"
+            )
+
+        return response.json() if response.text else {}
+
+    async def create_document(
+        self, name, external_id=None, url_pdf=None, base64_pdf=None, signers=None
+    ):
+        payload = ZapSignService._document_payload(
+            name,
+            external_id=external_id,
+            url_pdf=url_pdf,
+            base64_pdf=base64_pdf,
+            signers=signers,
+        )
+        return await self._request(method="POST", endpoint="/docs", json=payload)
+
+    async def add_signer(self, document_token, name, email=None, external_id=None):
+        payload = ZapSignService._signer_payload(
+            document_token, name, email=email, external_id=external_id
+        )
+        return await self._request(method="POST", endpoint="/signers", json=payload)
+
+    async def get_document_status(self, document_token):
+        return await self._request(method="GET", endpoint=f"/docs/{document_token}")
+
+    async def get_document_statuses(self, document_tokens):
+        """
+        Consulta o status de vários documentos em paralelo (limitado pelo
+        semáforo). Retorna {token: resposta} ou {token: Exception} em caso de
+        falha individual, sem interromper as demais consultas.
+        """
+        results = await asyncio.gather(
+            *(self.get_document_status(token) for token in document_tokens),
+            return_exceptions=True,
+        )
+        return dict(zip(document_tokens, results))
+
+    async def download_signed_pdf(self, document_token):
+        try:
+            response = await self._send(
+                "GET", f"/docs/{document_token}/pdf", timeout=30
+            )
+        except httpx.HTTPError as e:
+            logging.error(f"[ZapSign] Erro ao baixar PDF: {e}")
+            raise Exception("Falha ao baixar PDF. Erro de conexão.") from e
+
+        if response.status_code >= 400:
+            msg = ZapSignService._download_error_message(
+                response.status_code, response.text
+            )
+            logging.error(f"[ZapSign] Erro HTTP ao baixar PDF: {msg}")
+            raise Exception(msg)
+
+        return response.content
+
+    async def delete_document(self, document_token):
+        logging.info(
+            f"[ZapSign] Tentando excluir documento com token: {document_token}"
+        )
+        return await self._request(
+            method="DELETE", endpoint=f"/docs/{document_token}/"
+        )
+
+    async def update_signer(
+        self, signer_token, name=None, email=None, external_id=None
+    ):
+        payload = ZapSignService._signer_update_payload(
+            name=name, email=email, external_id=external_id
+        )
+
+        if not payload:
+            logging.warning(
+                f"[ZapSign] Nenhuma informação para atualizar para o signatário {signer_token}."
+            )
+            return {"message": "Nenhuma alteração enviada."}
+
+        logging.info(
+            f"[ZapSign] Tentando atualizar signatário com token: {signer_token} com dados: {payload}"
+        )
+        return await self._request(
+            method="POST", endpoint=f"/signers/{signer_token}/", json=payload
+        )
+
+    async def remove_signer(self, signer_token):
+        logging.info(f"[ZapSign] Tentando remover signatário com token: {signer_token}")
+        return await self._request(
+            method="DELETE", endpoint=f"/signer/{signer_token}/remove/"
+        )
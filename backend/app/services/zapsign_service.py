@@ -1,7 +1,153 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\services\zapsign_service.py
-import requests
+import hashlib
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.local_cache import LocalTTLCache
+
+# Verbos idempotentes: podem ser repetidos com segurança pela camada de transporte
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+class ZapSignSessionRegistry:
+    """
+    Registro de sessões HTTP (keep-alive + pool de conexões) compartilhado
+    pelo processo, uma sessão por API Token da ZapSign.
+    Evita um novo handshake TCP/TLS a cada chamada à ZapSign.
+    Mantém no máximo ZAPSIGN_HTTP_MAX_SESSIONS sessões: a usada há mais tempo
+    é fechada (tokens trocados ou empresas inativas não acumulam sockets).
+    """
+
+    _lock = threading.Lock()
+    _sessions = OrderedDict()
+    _stats = {}
+
+    @staticmethod
+    def _token_key(api_token: str) -> str:
+        # Nunca expõe o token em métricas/logs
+        return hashlib.sha256(api_token.encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def get_timeout(read_timeout=None):
+        connect_timeout = getattr(settings, "ZAPSIGN_HTTP_CONNECT_TIMEOUT", 5)
+        if read_timeout is None:
+            read_timeout = getattr(settings, "ZAPSIGN_HTTP_READ_TIMEOUT", 15)
+        return (connect_timeout, read_timeout)
+
+    @classmethod
+    def _build_session(cls) -> requests.Session:
+        pool_size = getattr(settings, "ZAPSIGN_HTTP_POOL_SIZE", 10)
+        retry = Retry(
+            total=getattr(settings, "ZAPSIGN_HTTP_RETRIES", 3),
+            backoff_factor=getattr(settings, "ZAPSIGN_HTTP_BACKOFF_FACTOR", 0.5),
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @classmethod
+    def get_session(cls, api_token: str) -> requests.Session:
+        token_key = cls._token_key(api_token)
+        with cls._lock:
+            session = cls._sessions.get(token_key)
+            if session is not None:
+                cls._sessions.move_to_end(token_key)
+                return session
+
+            session = cls._build_session()
+            cls._sessions[token_key] = session
+            cls._stats[token_key] = {
+                "created_at": time.time(),
+                "requests": 0,
+                "errors": 0,
+            }
+            logging.info(f"[ZapSign] Nova sessão HTTP criada ({token_key}).")
+
+            max_sessions = getattr(settings, "ZAPSIGN_HTTP_MAX_SESSIONS", 256)
+            while len(cls._sessions) > max_sessions:
+                evicted_key, evicted = cls._sessions.popitem(last=False)
+                cls._stats.pop(evicted_key, None)
+                # Clientes que ainda a referenciam reabrem conexões sob demanda
+                evicted.close()
+                logging.info(f"[ZapSign] Sessão HTTP {evicted_key} descartada (LRU).")
+        return session
+
+    @classmethod
+    def record(cls, api_token: str, failed: bool = False):
+        token_key = cls._token_key(api_token)
+        with cls._lock:
+            token_stats = cls._stats.get(token_key)
+            if token_stats is None:
+                return
+            token_stats["requests"] += 1
+            if failed:
+                token_stats["errors"] += 1
+
+    @classmethod
+    def stats(cls) -> dict:
+        with cls._lock:
+            snapshot = [
+                (token_key, session, dict(cls._stats.get(token_key, {})))
+                for token_key, session in cls._sessions.items()
+            ]
+
+        sessions = {}
+        for token_key, session, token_stats in snapshot:
+            pools = []
+            for adapter in session.adapters.values():
+                pool_container = adapter.poolmanager.pools
+                pools.extend(pool_container[key] for key in pool_container.keys())
+            sessions[token_key] = {
+                **token_stats,
+                "open_pools": len(pools),
+                "connections_opened": sum(p.num_connections for p in pools),
+                "pooled_requests": sum(p.num_requests for p in pools),
+            }
+
+        return {
+            "pool_size": getattr(settings, "ZAPSIGN_HTTP_POOL_SIZE", 10),
+            "timeout": cls.get_timeout(),
+            "retries": getattr(settings, "ZAPSIGN_HTTP_RETRIES", 3),
+            "max_sessions": getattr(settings, "ZAPSIGN_HTTP_MAX_SESSIONS", 256),
+            "sessions": sessions,
+        }
+
+    @classmethod
+    def close_all(cls):
+        with cls._lock:
+            for session in cls._sessions.values():
+                session.close()
+            cls._sessions = OrderedDict()
+            cls._stats = {}
+
+    @classmethod
+    def _reset_after_fork(cls):
+        # Processos filhos (ex: workers prefork do Celery) não podem
+        # compartilhar sockets com o processo pai.
+        cls._lock = threading.Lock()
+        cls._sessions = OrderedDict()
+        cls._stats = {}
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ZapSignSessionRegistry._reset_after_fork)
 
 
 class ZapSignService:
@@ -18,42 +164,61 @@ class ZapSignService:
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
         }
+        self.session = ZapSignSessionRegistry.get_session(self.api_token)
 
     def _request(self, method, endpoint, json=None, params=None):
         url = f"{self.BASE_URL}{endpoint}"
 
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method,
                 url=url,
                 headers=self.headers,
                 json=json,
                 params=params,
-                timeout=15,
+                timeout=ZapSignSessionRegistry.get_timeout(),
             )
         except requests.exceptions.RequestException as e:
+            ZapSignSessionRegistry.record(self.api_token, failed=True)
             logging.error(f"[ZapSign] Erro de conexão: {e}")
             raise Exception("Erro ao conectar com ZapSign.") from e
 
+        ZapSignSessionRegistry.record(
+            self.api_token, failed=response.status_code >= 400
+        )
+
         if response.status_code >= 400:
             logging.error(
                 f"[ZapSign] Erro HTTP {response.status_code}: {response.text}"
             )
-            try:
-                error_detail = (
-                    response.json().get("error")
-                    or response.json().get("message")
-                    or response.text[:100]
-                )
-            except ValueError:
-                error_detail = response.text[:100]
-
-            raise Exception(f"Erro ZapSign: {error_detail}")
+            raise Exception(f"Erro ZapSign: {self._error_detail(response)}")
 
         return response.json() if response.text else {}
 
-    def create_document(
-        self, name, external_id=None, url_pdf=None, base64_pdf=None, signers=None
+    # ========================================================================
+    # Helpers compartilhados com o AsyncZapSignService
+    # ========================================================================
+    @staticmethod
+    def _error_detail(response):
+        try:
+            error_detail = (
+                response.json().get("error")
+                or response.json().get("message")
+                or response.text[:100]
+            )
+        except ValueError:
+            error_detail = response.text[:100]
+        return error_detail
+
+    @staticmethod
+    def _download_error_message(status_code, error_text):
+        if "<title>Not Found</title>" in error_text:
+            return "O documento assinado não foi encontrado ou não está pronto para download na ZapSign (Erro 404)."
+        return f"Erro ZapSign {status_code}: {error_text[:100]}..."
+
+    @staticmethod
+    def _document_payload(
+        name, external_id=None, url_pdf=None, base64_pdf=None, signers=None
     ):
         if signers is None:
             signers = []
@@ -79,16 +244,47 @@ class ZapSignService:
         else:
             payload["url_pdf"] = url_pdf
 
-        return self._request(method="POST", endpoint="/docs", json=payload)
+        return payload
 
-    def add_signer(self, document_token, name, email=None, external_id=None):
-        payload = {
+    @staticmethod
+    def _signer_payload(document_token, name, email=None, external_id=None):
+        return {
             "document_token": document_token,
             "name": name,
             "email": email,
             "external_id": external_id,
         }
 
+    @staticmethod
+    def _signer_update_payload(name=None, email=None, external_id=None):
+        payload = {}
+        if name:
+            payload["name"] = name
+        if email:
+            payload["email"] = email
+        if external_id:
+            payload["external_id"] = external_id
+        return payload
+
+    # ========================================================================
+    # Endpoints
+    # ========================================================================
+    def create_document(
+        self, name, external_id=None, url_pdf=None, base64_pdf=None, signers=None
+    ):
+        payload = self._document_payload(
+            name,
+            external_id=external_id,
+            url_pdf=url_pdf,
+            base64_pdf=base64_pdf,
+            signers=signers,
+        )
+        return self._request(method="POST", endpoint="/docs", json=payload)
+
+    def add_signer(self, document_token, name, email=None, external_id=None):
+        payload = self._signer_payload(
+            document_token, name, email=email, external_id=external_id
+        )
         return self._request(method="POST", endpoint="/signers", json=payload)
 
     # Consultar status do documento (e obter link signed_file)
@@ -100,19 +296,22 @@ class ZapSignService:
         url = f"{self.BASE_URL}/docs/{document_token}/pdf"
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(
+                url,
+                headers=self.headers,
+                timeout=ZapSignSessionRegistry.get_timeout(read_timeout=30),
+            )
         except requests.exceptions.RequestException as e:
+            ZapSignSessionRegistry.record(self.api_token, failed=True)
             logging.error(f"[ZapSign] Erro ao baixar PDF: {e}")
             raise Exception("Falha ao baixar PDF. Erro de conexão.") from e
 
-        if response.status_code >= 400:
-            error_text = response.text
-
-            if "<title>Not Found</title>" in error_text:
-                msg = "O documento assinado não foi encontrado ou não está pronto para download na ZapSign (Erro 404)."
-            else:
-                msg = f"Erro ZapSign {response.status_code}: {error_text[:100]}..."
+        ZapSignSessionRegistry.record(
+            self.api_token, failed=response.status_code >= 400
+        )
 
+        if response.status_code >= 400:
+            msg = self._download_error_message(response.status_code, response.text)
             logging.error(f"[ZapSign] Erro HTTP ao baixar PDF: {msg}")
             raise Exception(msg)
 
@@ -125,13 +324,9 @@ class ZapSignService:
         return self._request(method="DELETE", endpoint=f"/docs/{document_token}/")
 
     def update_signer(self, signer_token, name=None, email=None, external_id=None):
-        payload = {}
-        if name:
-            payload["name"] = name
-        if email:
-            payload["email"] = email
-        if external_id:
-            payload["external_id"] = external_id
+        payload = self._signer_update_payload(
+            name=name, email=email, external_id=external_id
+        )
 
         if not payload:
             logging.warning(
@@ -151,3 +346,44 @@ class ZapSignService:
         return self._request(
             method="DELETE", endpoint=f"/signer/{signer_token}/remove/"
         )
+
+
+class ZapSignClientRegistry:
+    """
+    Cliente da ZapSign por empresa, reutilizado entre requisições: resolve o
+    token (empresa ou, na falta dele, o global) uma única vez e mantém o
+    ZapSignService pronto, sobre a sessão com pool do ZapSignSessionRegistry.
+    Alterar o apiToken ou remover a empresa invalida a entrada dela
+    (ver app/company/signals.py).
+    """
+
+    _cache = LocalTTLCache("zapsign_clients:generation", "ZAPSIGN_CLIENT_CACHE_MAX_ENTRIES")
+
+    @classmethod
+    def for_company(cls, company_id):
+        """ZapSignService da empresa ou None se nenhum token estiver configurado."""
+        found, client = cls._cache.get(company_id)
+        if found:
+            return client
+
+        from app.company.models import Company
+        from app.company.tenant import company_zapsign_token
+
+        api_token = company_zapsign_token(
+            Company.objects.filter(pk=company_id).only("apiToken").first()
+        )
+        client = ZapSignService(api_token=api_token) if api_token else None
+
+        cls._cache.set(
+            company_id, client, getattr(settings, "ZAPSIGN_CLIENT_CACHE_TTL_SECONDS", 300)
+        )
+        return client
+
+    @classmethod
+    def invalidate(cls, company_ids=None):
+        """Descarta o cliente das empresas informadas (ou de todas)."""
+        cls._cache.invalidate(company_ids)
+
+    @classmethod
+    def reset(cls):
+        cls._cache.reset()
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+def blank_tokens_to_null(apps, schema_editor):
+    Signer = apps.get_model("signer", "Signer")
+    Signer.objects.filter(token="").update(token=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('document', '0008_document_token_and_open_status_indexes'),
+        ('signer', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(blank_tokens_to_null, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='signer',
+            constraint=models.UniqueConstraint(condition=models.Q(('token__isnull', False)), fields=('document', 'token'), name='signer_document_token_uniq'),
+        ),
+    ]
@@ -17,5 +17,21 @@ class Signer(models.Model):
         related_name="signers"
     )
 
+    class Meta:
+        constraints = [
+            # Atualização dos signatários pelo webhook: (documento, token)
+            models.UniqueConstraint(
+                fields=["document", "token"],
+                name="signer_document_token_uniq",
+                condition=models.Q(token__isnull=False),
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Token vazio equivale a "sem token" (não entra na restrição de unicidade)
+        if self.token == "":
+            self.token = None
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.name
@@ -5,8 +5,7 @@ from rest_framework.response import Response
 from app.signer.models import Signer
 from app.signer.serializers import SignerSerializer
 
-from app.services.zapsign_service import ZapSignService
-from django.conf import settings  # Importar settings para acessar ZAPSIGN_API_TOKEN
+from app.services.zapsign_service import ZapSignClientRegistry
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -49,20 +48,15 @@ class SignerListCreateView(generics.ListCreateAPIView):
         # documento relacionado
         document = signer.document
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
-
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         try:
             result = zapsign.add_signer(
@@ -133,20 +127,15 @@ class SignerDetailView(generics.RetrieveUpdateDestroyAPIView):
         serializer = self.get_serializer(signer, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = signer.document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
-
-        zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(signer.document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # Prepara os dados para enviar à ZapSign (apenas os campos que podem ser atualizados)
         zapsign_update_data = {
@@ -179,21 +168,17 @@ class SignerDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         signer = self.get_object()
 
-        # --- Lógica para obter o API Token da ZapSign ---
-        zapsign_api_token_to_use = signer.document.company.apiToken
-        if not zapsign_api_token_to_use:
-            zapsign_api_token_to_use = getattr(settings, "ZAPSIGN_API_TOKEN", None)
-            if not zapsign_api_token_to_use:
-                return Response(
-                    {
-                        "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Signatário será excluído apenas localmente."
-                    },
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-        # --- Fim da Lógica para obter o API Token da ZapSign ---
+        # Cliente da ZapSign da empresa (token resolvido e em cache)
+        zapsign = ZapSignClientRegistry.for_company(signer.document.company_id)
+        if zapsign is None:
+            return Response(
+                {
+                    "error": "API Token da ZapSign não configurado para a empresa ou globalmente. Signatário será excluído apenas localmente."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         if signer.token:
-            zapsign = ZapSignService(api_token=zapsign_api_token_to_use)
             try:
                 zapsign.remove_signer(signer.token)
                 print(f"Signatário {signer.id} removido com sucesso da ZapSign.")
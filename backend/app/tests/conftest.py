@@ -0,0 +1,58 @@
+# FIXTURES COMPARTILHADAS ENTRE OS TESTES
+
+import pytest
+from django.core.cache import cache
+
+from app.ai.ai_service import AIServiceRegistry
+from app.ai.rate_limiter import AIRateLimiter
+from app.authapi.api_keys import ApiKeyResolver
+from app.company.tenant import TenantCache
+from app.services.zapsign_service import ZapSignClientRegistry
+
+
+@pytest.fixture(autouse=True)
+def clear_ai_service_registry():
+    """Os serviços de IA são cacheados por processo: isola cada teste."""
+    AIServiceRegistry.clear()
+    yield
+    AIServiceRegistry.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_ai_rate_limiter():
+    """Baldes do rate limiter em memória: cada teste começa com saldo cheio."""
+    AIRateLimiter.reset()
+    yield
+    AIRateLimiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Cache em memória (LocMem): chaves de execuções em andamento não vazam entre testes."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_api_key_cache():
+    """O rollback do banco entre testes não dispara signals: limpa o cache de API Keys."""
+    ApiKeyResolver.reset()
+    yield
+    ApiKeyResolver.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_tenant_cache():
+    """Contexto de tenant em memória: usuários/empresas de um teste não vazam para o outro."""
+    TenantCache.reset()
+    yield
+    TenantCache.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_zapsign_clients():
+    """Clientes da ZapSign por empresa: tokens de um teste não vazam para o outro."""
+    ZapSignClientRegistry.reset()
+    yield
+    ZapSignClientRegistry.reset()
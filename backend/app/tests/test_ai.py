@@ -1,6 +1,6 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_ai.py
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import ANY, patch, MagicMock
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
@@ -9,9 +9,15 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from app.company.models import Company, UserProfile
 from app.document.models import Document
 from app.ai.models import DocumentAnalysis
-from app.ai.ai_service import AIProvider, GeminiAIService, OpenAIAIService
+from app.ai.ai_service import (
+    AIProvider,
+    AIServiceRegistry,
+    GeminiAIService,
+    OpenAIAIService,
+)
 from app.ai.tasks import analyze_document_content_task
 from app.authapi.models import ApiKey
+from app.services.text_store import DocumentTextStore
 import os
 
 
@@ -54,6 +60,19 @@ def document(company):
     )
 
 
+@pytest.fixture
+def text_store(settings, tmp_path):
+    """DocumentTextStore isolado em diretório temporário."""
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    return DocumentTextStore()
+
+
+def store_text(text_store, text):
+    """Grava o texto no store e retorna a referência usada pela task."""
+    text_ref = DocumentTextStore.compute_key(text.encode("utf-8"))
+    return text_store.save(text_ref, text)
+
+
 @pytest.mark.django_db
 class TestAIServices:
     @patch.dict(os.environ, {"GEMINI_API_KEY": "fake_gemini_key"})
@@ -147,7 +166,7 @@ class TestAITasks:
     @patch("app.ai.tasks.WebSocketService")  # <-- MOCKA A CLASSE INTEIRA
     @patch("app.ai.ai_service.AIProvider.get_service")
     def test_analyze_document_content_task_success(
-        self, mock_get_service, mock_ws_service, document
+        self, mock_get_service, mock_ws_service, document, text_store
     ):
         mock_ws_service.return_value.broadcast_document_update = MagicMock()
 
@@ -161,8 +180,9 @@ class TestAITasks:
 
         document_content = "Este é o conteúdo do documento para análise."
         model_name = "gemini"
+        text_ref = store_text(text_store, document_content)
 
-        analyze_document_content_task(document.id, document_content, model_name)
+        analyze_document_content_task(document.id, text_ref, model_name)
 
         analysis = DocumentAnalysis.objects.get(document=document)
         assert analysis.status == "completed"
@@ -172,7 +192,9 @@ class TestAITasks:
         assert analysis.model_used == model_name
 
         mock_get_service.assert_called_once_with(model_name)
-        mock_ai_service.analyze_document.assert_called_once_with(document_content)
+        mock_ai_service.analyze_document.assert_called_once_with(
+            document_content, on_partial=ANY
+        )
 
         # processing + completed
         assert (
@@ -186,18 +208,18 @@ class TestAITasks:
     ):
         mock_ws_service.return_value.broadcast_document_update = MagicMock()
 
-        document_content = "Conteúdo qualquer."
+        text_ref = DocumentTextStore.compute_key(b"Conteudo qualquer.")
         model_name = "gemini"
 
         with pytest.raises(Document.DoesNotExist):
-            analyze_document_content_task(9999, document_content, model_name)
+            analyze_document_content_task(9999, text_ref, model_name)
 
         mock_get_service.assert_not_called()
 
     @patch("app.ai.tasks.WebSocketService")  # <-- MOCKA A CLASSE
     @patch("app.ai.ai_service.AIProvider.get_service")
     def test_analyze_document_content_task_ai_service_failure(
-        self, mock_get_service, mock_ws_service, document
+        self, mock_get_service, mock_ws_service, document, text_store
     ):
         mock_ws_service.return_value.broadcast_document_update = MagicMock()
 
@@ -207,18 +229,51 @@ class TestAITasks:
 
         document_content = "Conteúdo de teste."
         model_name = "openai"
+        text_ref = store_text(text_store, document_content)
 
         with pytest.raises(Exception):
-            analyze_document_content_task(document.id, document_content, model_name)
+            analyze_document_content_task(document.id, text_ref, model_name)
 
         analysis = DocumentAnalysis.objects.get(document=document)
         assert analysis.status == "failed"
         assert "Erro na API de IA" in analysis.summary
 
         mock_get_service.assert_called_once_with(model_name)
-        mock_ai_service.analyze_document.assert_called_once_with(document_content)
+        mock_ai_service.analyze_document.assert_called_once_with(
+            document_content, on_partial=ANY
+        )
 
         # processing + failed
         assert (
             mock_ws_service.return_value.broadcast_document_update.call_count == 2
         )
+
+
+class TestAIServiceRegistry:
+    @patch("app.ai.ai_service.AIProvider.get_service")
+    def test_service_is_built_once_per_process(self, mock_get_service):
+        mock_get_service.return_value = MagicMock()
+
+        first = AIServiceRegistry.get_service("gemini")
+        second = AIServiceRegistry.get_service("gemini")
+
+        assert first is second
+        mock_get_service.assert_called_once_with("gemini")
+        assert AIServiceRegistry.stats()["services"]["gemini"]["uses"] == 2
+
+    @patch("app.ai.ai_service.AIProvider.get_service")
+    def test_warm_up_ignores_models_without_api_key(self, mock_get_service):
+        mock_get_service.side_effect = [MagicMock(), ValueError("API Key não configurada")]
+
+        AIServiceRegistry.warm_up(["gemini", "openai"])
+
+        assert set(AIServiceRegistry.stats()["services"]) == {"gemini"}
+
+    @patch("app.ai.ai_service.AIProvider.get_service")
+    def test_reset_after_fork_drops_clients(self, mock_get_service):
+        mock_get_service.return_value = MagicMock()
+        AIServiceRegistry.get_service("gemini")
+
+        AIServiceRegistry._reset_after_fork()
+
+        assert AIServiceRegistry.stats()["services"] == {}
@@ -0,0 +1,207 @@
+# TESTES DO CACHE DE ANÁLISES DE IA (hash do texto + modelo + versão do prompt)
+
+import pytest
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.ai.ai_service import AIService
+from app.ai.analysis_cache import AnalysisCache, get_prompt_template_version
+from app.ai.models import AnalysisCacheEntry, DocumentAnalysis
+from app.ai.tasks import analyze_document_content_task
+from app.authapi.models import ApiKey
+from app.company.models import Company
+from app.document.models import Document
+from app.services.text_store import DocumentTextStore
+
+
+RESULTS = {
+    "summary": "Contrato de prestação de serviços",
+    "missing_topics": ["Foro"],
+    "insights": ["Multa rescisória ausente"],
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    get_prompt_template_version.cache_clear()
+    yield
+    get_prompt_template_version.cache_clear()
+
+
+@pytest.fixture
+def text_store(settings, tmp_path):
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    return DocumentTextStore()
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Cache", apiToken="token-cache")
+
+
+def make_document(company, name):
+    return Document.objects.create(name=name, company=company, status="pending")
+
+
+@pytest.mark.django_db
+class TestAnalysisCache:
+    def test_hit_ignores_whitespace_differences(self):
+        analysis_cache = AnalysisCache()
+        analysis_cache.set("Cláusula 1.\n\nO contratante", "gemini", RESULTS)
+
+        assert analysis_cache.get("Cláusula 1. O   contratante", "gemini") == RESULTS
+        assert analysis_cache.stats()["hits"] == 1
+
+    def test_model_and_prompt_version_are_part_of_key(self, settings):
+        analysis_cache = AnalysisCache()
+        analysis_cache.set("texto", "gemini", RESULTS)
+
+        assert analysis_cache.get("texto", "openai") is None
+
+        settings.AI_PROMPT_TEMPLATE_VERSION = "v2"
+        get_prompt_template_version.cache_clear()
+        assert analysis_cache.get("texto", "gemini") is None
+        assert analysis_cache.stats()["misses"] == 2
+
+    def test_expired_entry_is_a_miss(self):
+        analysis_cache = AnalysisCache(ttl_seconds=60)
+        analysis_cache.set("texto antigo", "gemini", RESULTS)
+        AnalysisCacheEntry.objects.update(
+            created_at=timezone.now() - timedelta(seconds=120)
+        )
+
+        assert analysis_cache.get("texto antigo", "gemini") is None
+        assert AnalysisCacheEntry.objects.count() == 0
+
+    def test_lru_eviction_keeps_most_recently_used(self, settings):
+        settings.AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS = 0
+        analysis_cache = AnalysisCache(max_entries=2)
+        analysis_cache.set("texto A", "gemini", RESULTS)
+        analysis_cache.set("texto B", "gemini", RESULTS)
+        AnalysisCacheEntry.objects.update(
+            last_accessed_at=timezone.now() - timedelta(minutes=5)
+        )
+        analysis_cache.get("texto A", "gemini")
+
+        analysis_cache.set("texto C", "gemini", RESULTS)
+
+        assert analysis_cache.get("texto A", "gemini") == RESULTS
+        assert analysis_cache.get("texto B", "gemini") is None
+        assert AnalysisCacheEntry.objects.count() == 2
+
+    def test_eviction_runs_at_most_once_per_interval(self, settings):
+        settings.AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS = 300
+        analysis_cache = AnalysisCache(max_entries=1)
+
+        with patch.object(AnalysisCache, "evict") as mock_evict:
+            analysis_cache.set("texto A", "gemini", RESULTS)
+            analysis_cache.set("texto B", "gemini", RESULTS)
+            analysis_cache.set("texto A", "gemini", RESULTS)
+
+        mock_evict.assert_called_once()
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_cache_hit_skips_llm_across_documents(
+    mock_get_service, mock_ws, company, text_store
+):
+    mock_ai_service = MagicMock()
+    mock_ai_service.analyze_document.return_value = RESULTS
+    mock_get_service.return_value = mock_ai_service
+
+    text_ref = text_store.save("a" * 64, "Mesmo template de contrato")
+    first = make_document(company, "Contrato 1")
+    other_company = Company.objects.create(name="Outra Empresa")
+    second = make_document(other_company, "Contrato 2")
+
+    analyze_document_content_task(first.id, text_ref, "gemini")
+    analyze_document_content_task(second.id, text_ref, "gemini")
+
+    assert mock_ai_service.analyze_document.call_count == 1
+    analysis = DocumentAnalysis.objects.get(document=second)
+    assert analysis.status == "completed"
+    assert analysis.summary == RESULTS["summary"]
+    assert analysis.insights == RESULTS["insights"]
+
+    completed_payload = mock_ws.return_value.broadcast_document_update.call_args.args[2]
+    assert completed_payload["cached"] is True
+
+
+class InvalidJSONService(AIService):
+    """Modelo que responde texto livre: cai no fallback de JSON inválido."""
+
+    calls = 0
+
+    def generate(self, prompt):
+        InvalidJSONService.calls += 1
+        return "Resposta do modelo sem JSON"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_does_not_cache_json_parse_fallback(
+    mock_get_service, mock_ws, company, text_store
+):
+    InvalidJSONService.calls = 0
+    mock_get_service.return_value = InvalidJSONService("chave")
+
+    text_ref = text_store.save("b" * 64, "Contrato com resposta inválida")
+    analyze_document_content_task(make_document(company, "Contrato 1").id, text_ref, "gemini")
+    analyze_document_content_task(make_document(company, "Contrato 2").id, text_ref, "gemini")
+
+    assert AnalysisCacheEntry.objects.count() == 0
+    assert InvalidJSONService.calls == 2
+
+
+@pytest.mark.django_db
+def test_degraded_results_are_not_stored():
+    analysis_cache = AnalysisCache()
+    analysis_cache.set("texto", "gemini", {**RESULTS, "degraded": True})
+
+    assert analysis_cache.get("texto", "gemini") is None
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exposes_cache_counters():
+    ApiKey.objects.create(name="monitor", key="metrics-key")
+    AnalysisCache().get("texto inexistente", "gemini")
+
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="metrics-key")
+    response = client.get(reverse("automation-metrics"))
+
+    assert response.status_code == 200
+    cache_stats = response.data["data"]["ai_analysis_cache"]
+    assert cache_stats["misses"] == 1
+    assert cache_stats["hits"] == 0
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_requires_api_key_or_staff():
+    client = APIClient()
+    assert client.get(reverse("automation-metrics")).status_code in (401, 403)
+
+    client.credentials(HTTP_X_API_KEY="chave-inexistente")
+    assert client.get(reverse("automation-metrics")).status_code in (401, 403)
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_accepts_staff_jwt_only():
+    user = User.objects.create_user(username="ops@test.com", password="123")
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    assert client.get(reverse("automation-metrics")).status_code == 403
+
+    user.is_staff = True
+    user.save()
+    assert client.get(reverse("automation-metrics")).status_code == 200
@@ -0,0 +1,126 @@
+# TESTES DA ANÁLISE EM BLOCOS (chunking por cláusulas + map-reduce)
+
+import json
+import threading
+
+import pytest
+
+from app.ai.ai_service import AIService, merge_results
+from app.ai.chunking import estimate_tokens, split_into_chunks
+
+
+CONTRACT = "\n".join(
+    f"CLÁUSULA {i}ª - Objeto {i}. O contratante se obriga ao item {i}. "
+    f"O prazo do item {i} é de 30 dias."
+    for i in range(1, 21)
+)
+
+
+class FakeAIService(AIService):
+    """Serviço de IA falso: responde JSON conforme o prompt recebido."""
+
+    provider_label = "Fake"
+
+    def __init__(self, fail_reduce=False):
+        super().__init__(api_key="fake")
+        self.fail_reduce = fail_reduce
+        self.prompts = []
+        self.lock = threading.Lock()
+
+    def generate(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+
+        if "análises parciais" in prompt:
+            if self.fail_reduce:
+                raise RuntimeError("timeout")
+            return json.dumps(
+                {"summary": "Resumo consolidado", "missing_topics": ["Foro"], "insights": []}
+            )
+
+        trecho = prompt.split("[Trecho ")[1].split(" de ")[0] if "[Trecho " in prompt else "1"
+        return "```json\n" + json.dumps(
+            {
+                "summary": f"Resumo {trecho}",
+                "missing_topics": ["Foro", "Multa"],
+                "insights": [f"Insight {trecho}", "Prazo curto"],
+            }
+        ) + "\n```"
+
+
+def test_split_respects_clause_boundaries_and_budget():
+    chunks = split_into_chunks(CONTRACT, max_tokens=60)
+
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 60 for chunk in chunks)
+    # Nenhuma cláusula é cortada no meio
+    assert all(chunk.startswith("CLÁUSULA") for chunk in chunks)
+    assert "\n\n".join(chunks).count("CLÁUSULA") == 20
+
+
+def test_split_breaks_oversized_section_by_sentences():
+    section = " ".join(f"Frase número {i}." for i in range(200))
+
+    chunks = split_into_chunks(section, max_tokens=50)
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert chunks[0].startswith("Frase número 0.")
+
+
+def test_small_document_uses_single_prompt(settings):
+    settings.AI_CHUNK_MAX_TOKENS = 10000
+    service = FakeAIService()
+
+    result = service.analyze_document(CONTRACT)
+
+    assert len(service.prompts) == 1
+    assert result["summary"] == "Resumo 1"
+
+
+def test_large_document_is_analyzed_in_parallel_and_reduced(settings):
+    settings.AI_CHUNK_MAX_TOKENS = 100
+    settings.AI_CHUNK_CONCURRENCY = 4
+    service = FakeAIService()
+
+    result = service.analyze_document(CONTRACT)
+
+    chunk_count = len(split_into_chunks(CONTRACT, max_tokens=100))
+    # N blocos + 1 redução
+    assert len(service.prompts) == chunk_count + 1
+    assert result == {
+        "summary": "Resumo consolidado",
+        "missing_topics": ["Foro"],
+        "insights": [],
+    }
+
+
+def test_reduce_failure_falls_back_to_local_merge(settings):
+    settings.AI_CHUNK_MAX_TOKENS = 100
+    service = FakeAIService(fail_reduce=True)
+
+    result = service.analyze_document(CONTRACT)
+
+    assert result["summary"].startswith("Resumo 1\n\nResumo 2")
+    assert result["missing_topics"] == ["Foro", "Multa"]
+    assert "Prazo curto" in result["insights"]
+    assert result["insights"].count("Prazo curto") == 1
+
+
+def test_merge_results_deduplicates_case_insensitive():
+    merged = merge_results(
+        [
+            {"summary": "A", "missing_topics": ["Foro"], "insights": ["Risco"]},
+            {"summary": "B", "missing_topics": ["foro "], "insights": None},
+        ]
+    )
+
+    assert merged == {"summary": "A\n\nB", "missing_topics": ["Foro"], "insights": ["Risco"]}
+
+
+def test_invalid_chunk_json_falls_back_to_raw_text():
+    service = FakeAIService()
+    service.generate = lambda prompt: "texto livre"
+
+    with pytest.raises(Exception):
+        service.parse_response('{"summary": "sem chaves"}')
+    assert service.analyze_document("Contrato curto")["summary"] == "texto livre"
@@ -0,0 +1,137 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_ai_dedup.py
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.ai.inflight import claim_analysis_run, inflight_key
+from app.ai.models import DocumentAnalysis
+from app.ai.tasks import analyze_document_content_task
+from app.company.models import Company
+from app.document.models import Document
+from app.document.tasks import enqueue_document_analysis
+from app.services.text_store import DocumentTextStore
+from django.core.cache import cache
+
+RESULTS = {
+    "summary": "Resumo",
+    "missing_topics": ["Foro"],
+    "insights": ["Multa"],
+}
+
+
+@pytest.fixture
+def document(db):
+    company = Company.objects.create(name="Empresa", apiToken="token")
+    return Document.objects.create(
+        name="Contrato", company=company, token="doc-dedup", openID=1, status="pending"
+    )
+
+
+@pytest.fixture
+def text_ref(settings, tmp_path):
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    text = "Texto do contrato."
+    ref = DocumentTextStore.compute_key(text.encode("utf-8"))
+    return DocumentTextStore().save(ref, text)
+
+
+# ========================================================================
+# Enfileiramento
+# ========================================================================
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+def test_repeated_requests_attach_to_inflight_run(mock_apply, mock_ws, document):
+    first_run = enqueue_document_analysis(document.id, "a" * 64)
+    second_run = enqueue_document_analysis(document.id, "a" * 64)
+
+    assert first_run == second_run
+    mock_apply.assert_called_once()
+    assert str(DocumentAnalysis.objects.get(document=document).run_id) == first_run
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+def test_new_content_or_model_starts_a_new_run(mock_apply, mock_ws, document):
+    first_run = enqueue_document_analysis(document.id, "a" * 64)
+    other_content = enqueue_document_analysis(document.id, "b" * 64)
+    other_model = enqueue_document_analysis(document.id, "b" * 64, model_name="openai")
+
+    assert len({first_run, other_content, other_model}) == 3
+    assert mock_apply.call_count == 3
+    # A execução mais recente é a vigente
+    assert str(DocumentAnalysis.objects.get(document=document).run_id) == other_model
+
+
+def test_claim_recovers_when_key_expires_between_add_and_get():
+    key = inflight_key(1, "a" * 64, "gemini")
+    cache.set(key, "existing-run")
+
+    with patch("app.ai.inflight.cache.get", return_value=None), patch(
+        "app.ai.inflight.cache.add", side_effect=[False, True]
+    ):
+        run_id, created = claim_analysis_run(1, "a" * 64, "gemini")
+
+    assert created is True
+    assert run_id != "existing-run"
+
+
+# ========================================================================
+# Execução
+# ========================================================================
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_superseded_run_does_not_call_ai(mock_get_service, mock_ws, document, text_ref):
+    DocumentAnalysis.objects.create(
+        document=document, run_id="11111111-1111-1111-1111-111111111111"
+    )
+
+    result = analyze_document_content_task(
+        document.id, text_ref, "gemini", run_id="22222222-2222-2222-2222-222222222222"
+    )
+
+    assert result is None
+    mock_get_service.assert_not_called()
+    assert DocumentAnalysis.objects.get(document=document).status == "pending"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_stale_result_is_discarded(mock_get_service, mock_ws, document, text_ref):
+    old_run = "11111111-1111-1111-1111-111111111111"
+    new_run = "22222222-2222-2222-2222-222222222222"
+    DocumentAnalysis.objects.create(document=document, run_id=old_run)
+
+    def supersede_during_call(content, on_partial=None):
+        # Um novo pedido substitui a execução enquanto a IA responde
+        DocumentAnalysis.objects.filter(document=document).update(run_id=new_run)
+        return RESULTS
+
+    mock_get_service.return_value = MagicMock(
+        analyze_document=MagicMock(side_effect=supersede_during_call)
+    )
+
+    assert analyze_document_content_task(document.id, text_ref, "gemini", run_id=old_run) is None
+
+    analysis = DocumentAnalysis.objects.get(document=document)
+    assert analysis.summary is None
+    assert analysis.status != "completed"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_completed_run_releases_inflight_key(mock_get_service, mock_ws, document, text_ref):
+    mock_get_service.return_value.analyze_document.return_value = RESULTS
+
+    with patch("app.document.tasks.WebSocketService"), patch(
+        "app.document.tasks.analyze_document_content_task.apply_async"
+    ):
+        run_id = enqueue_document_analysis(document.id, text_ref)
+
+    analyze_document_content_task(document.id, text_ref, "gemini", run_id=run_id)
+
+    assert DocumentAnalysis.objects.get(document=document).status == "completed"
+    assert cache.get(inflight_key(document.id, text_ref, "gemini")) is None
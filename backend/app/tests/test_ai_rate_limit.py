@@ -0,0 +1,276 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_ai_rate_limit.py
+import pytest
+from unittest.mock import MagicMock, patch
+
+from celery.exceptions import Retry
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.ai.models import DocumentAnalysis
+from app.ai.rate_limiter import (
+    AIRateLimiter,
+    MemoryBucketBackend,
+    estimate_request_cost,
+    is_provider_rate_limit_error,
+)
+from app.ai.tasks import AIRateLimitExceeded, analyze_document_content_task
+from app.authapi.models import ApiKey
+from app.company.models import Company
+from app.document.models import Document
+from app.services.text_store import DocumentTextStore
+
+RESULTS = {
+    "summary": "Resumo",
+    "missing_topics": [],
+    "insights": ["Insight"],
+}
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimitError(Exception):
+    """Mesmo nome da exceção de 429 do SDK da OpenAI."""
+
+
+@pytest.fixture
+def limits(settings):
+    settings.AI_RATE_LIMIT_ENABLED = True
+    settings.AI_RATE_LIMITS = {"gemini": {"rpm": 2, "tpm": 1000}}
+    settings.AI_COMPANY_RATE_LIMITS = {"rpm": 0, "tpm": 0}
+    return settings
+
+
+@pytest.fixture
+def document(db):
+    company = Company.objects.create(name="Empresa", apiToken="token")
+    return Document.objects.create(
+        name="Contrato", company=company, token="doc-rl", openID=1, status="pending"
+    )
+
+
+@pytest.fixture
+def text_ref(settings, tmp_path):
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    text = "Conteúdo do contrato para análise."
+    ref = DocumentTextStore.compute_key(text.encode("utf-8"))
+    return DocumentTextStore().save(ref, text)
+
+
+# ========================================================================
+# Token bucket
+# ========================================================================
+def test_requests_per_minute_budget(limits):
+    clock = FakeClock()
+    limiter = AIRateLimiter("gemini", clock=clock)
+
+    assert limiter.acquire(1, 10) == 0
+    assert limiter.acquire(1, 10) == 0
+    # rpm=2: um novo token a cada 30 segundos
+    assert limiter.acquire(1, 10) == pytest.approx(30)
+
+    clock.now += 30
+    assert limiter.acquire(1, 10) == 0
+
+
+def test_tokens_per_minute_budget_does_not_consume_on_rejection(limits):
+    clock = FakeClock()
+    limiter = AIRateLimiter("gemini", clock=clock)
+
+    assert limiter.acquire(1, 900) == 0
+    assert limiter.acquire(1, 200) == pytest.approx(6)  # faltam 100 tokens a 1000/min
+
+    # A requisição rejeitada não consumiu o balde de requisições
+    levels = AIRateLimiter.levels(clock=clock)
+    assert levels["ai_rate_limit:gemini:rpm"]["level"] == 1
+    assert levels["ai_rate_limit:gemini:tpm"]["level"] == 100
+
+
+def test_company_buckets_are_isolated(limits):
+    limits.AI_RATE_LIMITS = {"gemini": {"rpm": 100, "tpm": 0}}
+    limits.AI_COMPANY_RATE_LIMITS = {"rpm": 1, "tpm": 0}
+    clock = FakeClock()
+
+    assert AIRateLimiter("gemini", company_id=1, clock=clock).acquire() == 0
+    assert AIRateLimiter("gemini", company_id=1, clock=clock).acquire() > 0
+    assert AIRateLimiter("gemini", company_id=2, clock=clock).acquire() == 0
+
+
+def test_cost_above_capacity_waits_for_full_bucket(limits):
+    clock = FakeClock()
+    limiter = AIRateLimiter("gemini", clock=clock)
+
+    assert limiter.acquire(1, 5000) == 0
+    assert limiter.acquire(1, 5000) == pytest.approx(60)
+
+
+def test_disabled_limiter_always_allows(limits):
+    limits.AI_RATE_LIMIT_ENABLED = False
+    limiter = AIRateLimiter("gemini", clock=FakeClock())
+    assert all(limiter.acquire(1, 5000) == 0 for _ in range(10))
+
+
+def test_falls_back_to_memory_when_backend_fails(limits):
+    broken = MagicMock()
+    broken.consume.side_effect = ConnectionError("redis fora do ar")
+    with patch.object(AIRateLimiter, "get_backend", return_value=broken):
+        assert AIRateLimiter("gemini", clock=FakeClock()).acquire() == 0
+
+
+def test_short_waits_are_done_inline(limits):
+    clock = FakeClock()
+    limiter = AIRateLimiter("gemini", clock=clock)
+    limiter.acquire(2, 0)
+
+    def fake_sleep(seconds):
+        clock.now += seconds
+
+    with patch("app.ai.rate_limiter.time.sleep", side_effect=fake_sleep) as sleep:
+        assert limiter.acquire_or_wait(1, 0, max_wait=60) == 0
+        sleep.assert_called_once()
+        assert limiter.acquire_or_wait(1, 0, max_wait=5) == pytest.approx(30)
+
+
+def test_estimate_request_cost_counts_chunks(settings):
+    settings.AI_CHARS_PER_TOKEN = 4
+    settings.AI_CHUNK_MAX_TOKENS = 100
+    settings.AI_RATE_LIMIT_OUTPUT_TOKENS = 10
+
+    assert estimate_request_cost("a" * 200) == (1, 60)
+    # 250 tokens -> 3 blocos + 1 redução
+    assert estimate_request_cost("a" * 1000) == (4, 290)
+
+
+def test_provider_rate_limit_error_detection():
+    assert is_provider_rate_limit_error(RateLimitError("429"))
+    assert not is_provider_rate_limit_error(ValueError("resposta inválida"))
+
+
+def test_memory_backend_levels_include_refill():
+    backend = MemoryBucketBackend()
+    backend.consume([("k", 60, 1.0, 60)], now=0)
+    assert backend.levels(now=15)["k"] == {"level": 15, "capacity": 60}
+
+
+# ========================================================================
+# Integração com a task
+# ========================================================================
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_requeues_instead_of_failing_when_bucket_is_empty(
+    mock_get_service, mock_ws, limits, document, text_ref
+):
+    limits.AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS = 0
+    limits.AI_RATE_LIMIT_JITTER_SECONDS = 0
+    AIRateLimiter("gemini").acquire(2, 0)  # esgota o rpm do provedor
+
+    with pytest.raises(Retry) as excinfo:
+        analyze_document_content_task(document.id, text_ref, "gemini")
+
+    mock_get_service.assert_not_called()
+    assert 0 < excinfo.value.when <= 31
+    assert excinfo.value.sig.kwargs["rate_limit_requeues"] == 1
+    assert DocumentAnalysis.objects.get(document=document).status == "pending"
+    last_payload = mock_ws.return_value.broadcast_document_update.call_args.args[2]
+    assert last_payload["status"] == "pending"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_requeues_on_provider_429(
+    mock_get_service, mock_ws, limits, document, text_ref
+):
+    limits.AI_RATE_LIMIT_PROVIDER_BACKOFF_SECONDS = 30
+    limits.AI_RATE_LIMIT_JITTER_SECONDS = 0
+    mock_get_service.return_value.analyze_document.side_effect = RateLimitError("429")
+
+    with pytest.raises(Retry) as excinfo:
+        analyze_document_content_task(document.id, text_ref, "gemini")
+
+    assert excinfo.value.when == 30
+    assert DocumentAnalysis.objects.get(document=document).status == "pending"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_requeues_do_not_consume_error_retries(
+    mock_get_service, mock_ws, limits, document, text_ref
+):
+    limits.AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS = 0
+    AIRateLimiter("gemini").acquire(2, 0)
+
+    analyze_document_content_task.push_request(retries=2, kwargs={"run_id": None})
+    try:
+        with pytest.raises(Retry) as excinfo:
+            analyze_document_content_task.run(
+                document.id, text_ref, "gemini", rate_limit_requeues=5
+            )
+    finally:
+        analyze_document_content_task.pop_request()
+
+    signature = excinfo.value.sig
+    assert signature.options["retries"] == 2
+    assert signature.kwargs == {"run_id": None, "rate_limit_requeues": 6}
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.release_analysis_run")
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_requeue_limit_fails_the_analysis(
+    mock_get_service, mock_ws, mock_release, limits, document, text_ref
+):
+    limits.AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS = 0
+    limits.AI_RATE_LIMIT_MAX_REQUEUES = 3
+    AIRateLimiter("gemini").acquire(2, 0)
+
+    with patch.object(analyze_document_content_task, "retry") as mock_retry:
+        with pytest.raises(AIRateLimitExceeded):
+            analyze_document_content_task(
+                document.id, text_ref, "gemini", rate_limit_requeues=3
+            )
+
+    # Falha definitiva: não usa o orçamento de retries e libera a execução
+    mock_retry.assert_not_called()
+    mock_release.assert_called_once()
+    analysis = DocumentAnalysis.objects.get(document=document)
+    assert analysis.status == "failed"
+    assert "limite de requisições" in analysis.summary
+    last_payload = mock_ws.return_value.broadcast_document_update.call_args.args[2]
+    assert last_payload["reason"] == "rate_limited"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_completes_within_budget(
+    mock_get_service, mock_ws, limits, document, text_ref
+):
+    mock_get_service.return_value.analyze_document.return_value = RESULTS
+
+    analyze_document_content_task(document.id, text_ref, "gemini")
+
+    assert DocumentAnalysis.objects.get(document=document).status == "completed"
+    assert AIRateLimiter.levels()["ai_rate_limit:gemini:rpm"]["level"] < 2
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_exposes_bucket_levels(limits):
+    ApiKey.objects.create(name="monitor", key="metrics-key")
+    AIRateLimiter("gemini").acquire(1, 100)
+
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="metrics-key")
+    response = client.get(reverse("automation-metrics"))
+
+    buckets = response.data["data"]["ai_rate_limit_buckets"]
+    assert buckets["ai_rate_limit:gemini:rpm"]["capacity"] == 2
+    assert buckets["ai_rate_limit:gemini:tpm"]["level"] < 1000
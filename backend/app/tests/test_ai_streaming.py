@@ -0,0 +1,220 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_ai_streaming.py
+import json
+import os
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from app.ai.ai_service import GeminiAIService, OpenAIAIService
+from app.ai.models import DocumentAnalysis
+from app.ai.streaming import PartialResultParser, parse_partial_result
+from app.ai.tasks import analyze_document_content_task
+from app.company.models import Company
+from app.core.websocket.coalescing import CoalescingBroadcaster
+from app.document.models import Document
+from app.services.text_store import DocumentTextStore
+
+RESPONSE = json.dumps(
+    {
+        "summary": "Contrato de prestação de serviços com \"multa\" rescisória.",
+        "missing_topics": ["Foro", "Vigência"],
+        "insights": ["Multa de 20%"],
+    },
+    ensure_ascii=False,
+)
+
+
+def split_stream(text, size=7):
+    return [text[index : index + size] for index in range(0, len(text), size)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+# ========================================================================
+# Parser de resultado parcial
+# ========================================================================
+def test_partial_summary_is_extracted_from_incomplete_json():
+    partial = parse_partial_result('```json\n{"summary": "Contrato de loc')
+    assert partial == {"summary": "Contrato de loc"}
+
+
+def test_only_closed_list_items_are_reported():
+    partial = parse_partial_result(
+        '{"summary": "Resumo", "insights": ["Multa de 20%", "Reaju'
+    )
+    assert partial["summary"] == "Resumo"
+    assert partial["insights"] == ["Multa de 20%"]
+
+
+def test_escape_cut_at_buffer_end_is_ignored():
+    assert parse_partial_result('{"summary": "Cláusula \\"A\\') == {
+        "summary": 'Cláusula "A'
+    }
+    assert parse_partial_result('{"summary": "Ol\\u00') == {"summary": "Ol"}
+
+
+def test_parser_reports_only_changes_and_keeps_full_text():
+    parser = PartialResultParser()
+    updates = [parser.feed(delta) for delta in split_stream(RESPONSE)]
+
+    assert parser.text == RESPONSE
+    changed = [update for update in updates if update]
+    assert changed[-1] == json.loads(RESPONSE)
+    assert len(changed) < len(updates)
+
+
+def test_parser_result_does_not_depend_on_delta_size():
+    for size in (1, 3, len(RESPONSE)):
+        parser = PartialResultParser()
+        updates = [parser.feed(delta) for delta in split_stream(RESPONSE, size)]
+        assert [update for update in updates if update][-1] == json.loads(RESPONSE)
+
+
+def test_parser_ignores_nested_fields_with_same_name():
+    partial = parse_partial_result(
+        '{"meta": {"summary": "interno", "insights": ["x"]}, "summary": "Raiz'
+    )
+    assert partial == {"summary": "Raiz"}
+
+
+# ========================================================================
+# Agrupamento das mensagens
+# ========================================================================
+def test_broadcaster_coalesces_updates_within_interval():
+    ws_service = MagicMock()
+    clock = FakeClock()
+    broadcaster = CoalescingBroadcaster(
+        ws_service, 1, "analysis_partial", extra={"document_id": 1},
+        interval=0.1, clock=clock,
+    )
+
+    for step in range(10):
+        broadcaster.push({"partial": {"summary": "x" * step}})
+        clock.now += 0.02  # 10 atualizações em 200ms
+
+    assert broadcaster.sent == 2  # primeira imediata + uma após 100ms
+    broadcaster.flush()
+    last_payload = ws_service.broadcast_document_update.call_args.args[2]
+    assert last_payload == {"document_id": 1, "partial": {"summary": "x" * 9}}
+
+
+# ========================================================================
+# Provedores
+# ========================================================================
+@patch("google.generativeai.GenerativeModel")
+@patch("google.generativeai.configure")
+@patch.dict(os.environ, {"GEMINI_API_KEY": "fake_gemini_key"})
+def test_gemini_streams_partial_results(mock_configure, mock_model):
+    mock_model.return_value.generate_content.return_value = [
+        MagicMock(text=part) for part in split_stream(RESPONSE)
+    ]
+    partials = []
+
+    result = GeminiAIService().analyze_document("Contrato", on_partial=partials.append)
+
+    assert mock_model.return_value.generate_content.call_args.kwargs == {"stream": True}
+    assert result == json.loads(RESPONSE)
+    assert partials[0]["summary"] and partials[-1] == result
+
+
+@patch("openai.OpenAI")
+@patch.dict(os.environ, {"OPENAI_API_KEY": "fake_openai_key"})
+def test_openai_streams_partial_results(mock_openai):
+    chunks = [
+        MagicMock(choices=[MagicMock(delta=MagicMock(content=part))])
+        for part in split_stream(RESPONSE)
+    ]
+    mock_openai.return_value.chat.completions.create.return_value = iter(chunks)
+    partials = []
+
+    result = OpenAIAIService().analyze_document("Contrato", on_partial=partials.append)
+
+    assert mock_openai.return_value.chat.completions.create.call_args.kwargs["stream"] is True
+    assert result == json.loads(RESPONSE)
+    assert partials
+
+
+@patch("google.generativeai.GenerativeModel")
+@patch("google.generativeai.configure")
+@patch.dict(os.environ, {"GEMINI_API_KEY": "fake_gemini_key"})
+def test_streaming_can_be_disabled(mock_configure, mock_model, settings):
+    settings.AI_STREAMING_ENABLED = False
+    mock_model.return_value.generate_content.return_value = MagicMock(text=RESPONSE)
+    partials = []
+
+    GeminiAIService().analyze_document("Contrato", on_partial=partials.append)
+
+    assert "stream" not in mock_model.return_value.generate_content.call_args.kwargs
+    assert partials == []
+
+
+# ========================================================================
+# Task
+# ========================================================================
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_broadcasts_partial_results_before_completion(
+    mock_get_service, mock_ws, settings, tmp_path
+):
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    company = Company.objects.create(name="Empresa", apiToken="token")
+    document = Document.objects.create(
+        name="Contrato", company=company, token="doc-stream", openID=1
+    )
+    text_ref = DocumentTextStore().save("a" * 64, "Texto do contrato")
+
+    def fake_analyze(content, on_partial=None):
+        on_partial({"summary": "Contrato"})
+        return json.loads(RESPONSE)
+
+    mock_get_service.return_value.analyze_document.side_effect = fake_analyze
+
+    analyze_document_content_task(document.id, text_ref, "gemini")
+
+    events = [
+        c.args[1] for c in mock_ws.return_value.broadcast_document_update.call_args_list
+    ]
+    assert events == ["analysis_status_update", "analysis_partial", "analysis_completed"]
+    partial_payload = mock_ws.return_value.broadcast_document_update.call_args_list[1].args[2]
+    assert partial_payload == {
+        "status": "streaming",
+        "document_id": document.id,
+        "partial": {"summary": "Contrato"},
+    }
+    assert DocumentAnalysis.objects.get(document=document).status == "completed"
+
+
+@pytest.mark.django_db
+@patch("app.ai.tasks.WebSocketService")
+@patch("app.ai.ai_service.AIProvider.get_service")
+def test_task_flushes_partial_held_by_coalescing(
+    mock_get_service, mock_ws, settings, tmp_path
+):
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    company = Company.objects.create(name="Empresa", apiToken="token")
+    document = Document.objects.create(
+        name="Contrato", company=company, token="doc-flush", openID=1
+    )
+    text_ref = DocumentTextStore().save("b" * 64, "Texto do contrato")
+
+    def fake_analyze(content, on_partial=None):
+        on_partial({"summary": "Con"})
+        # Dentro do intervalo de agrupamento: fica retido até o flush
+        on_partial({"summary": "Contrato completo"})
+        return json.loads(RESPONSE)
+
+    mock_get_service.return_value.analyze_document.side_effect = fake_analyze
+
+    analyze_document_content_task(document.id, text_ref, "gemini")
+
+    calls = mock_ws.return_value.broadcast_document_update.call_args_list
+    partials = [c.args[2]["partial"] for c in calls if c.args[1] == "analysis_partial"]
+    assert partials == [{"summary": "Con"}, {"summary": "Contrato completo"}]
+    assert calls[-1].args[1] == "analysis_completed"
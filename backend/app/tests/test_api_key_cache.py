@@ -0,0 +1,143 @@
+# TESTES DO CACHE DE VALIDAÇÃO DE API KEYS
+
+import pytest
+from unittest.mock import patch
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.authapi.api_keys import GENERATION_KEY, ApiKeyResolver
+from app.authapi.models import ApiKey
+
+
+def api_key_queries(action):
+    with CaptureQueriesContext(connection) as context:
+        result = action()
+    queries = [q for q in context.captured_queries if "authapi_apikey" in q["sql"]]
+    return result, len(queries)
+
+
+@pytest.mark.django_db
+def test_only_the_hash_is_stored():
+    api_key = ApiKey.objects.create(name="n8n", key="segredo-123")
+
+    stored = ApiKey.objects.get(pk=api_key.pk)
+    assert stored.key is None
+    assert stored.key_hash == ApiKey.hash_key("segredo-123")
+    assert stored.prefix == "segredo-"
+
+
+@pytest.mark.django_db
+def test_valid_key_is_resolved_from_memory_after_first_lookup():
+    ApiKey.objects.create(name="n8n", key="chave-valida")
+
+    first, first_queries = api_key_queries(lambda: ApiKeyResolver.resolve("chave-valida"))
+    second, second_queries = api_key_queries(lambda: ApiKeyResolver.resolve("chave-valida"))
+
+    assert first.name == second.name == "n8n"
+    assert (first_queries, second_queries) == (1, 0)
+
+
+@pytest.mark.django_db
+def test_each_lookup_gets_its_own_instance():
+    ApiKey.objects.create(name="n8n", key="chave-valida")
+    ApiKeyResolver.resolve("chave-valida")
+
+    first = ApiKeyResolver.resolve("chave-valida")
+    first.name = "alterada"
+    second, queries = api_key_queries(lambda: ApiKeyResolver.resolve("chave-valida"))
+
+    assert queries == 0
+    assert second is not first
+    assert second.name == "n8n"
+    assert not second._state.adding
+
+
+@pytest.mark.django_db
+def test_invalid_key_is_negatively_cached_until_ttl(settings):
+    settings.API_KEY_NEGATIVE_CACHE_TTL_SECONDS = 10
+    now = [100.0]
+
+    def resolve():
+        return ApiKeyResolver.resolve("nao-existe", clock=lambda: now[0])
+
+    assert api_key_queries(resolve) == (None, 1)
+    assert api_key_queries(resolve) == (None, 0)
+
+    now[0] += 11
+    assert api_key_queries(resolve) == (None, 1)
+
+
+@pytest.mark.django_db
+def test_creating_and_deleting_keys_invalidates_cache():
+    assert ApiKeyResolver.resolve("nova-chave") is None
+
+    api_key = ApiKey.objects.create(name="nova", key="nova-chave")
+    assert ApiKeyResolver.resolve("nova-chave") == api_key
+
+    api_key.delete()
+    assert ApiKeyResolver.resolve("nova-chave") is None
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.django_db
+def test_generation_change_from_another_process_clears_local_cache(settings):
+    settings.LOCAL_CACHE_GENERATION_CHECK_SECONDS = 1
+    clock = FakeClock()
+    api_key = ApiKey.objects.create(name="n8n", key="chave-valida")
+    ApiKeyResolver.resolve("chave-valida", clock=clock)
+
+    # Outro processo removeu a chave (o signal rodou lá, não aqui)
+    ApiKey.objects.filter(key_hash=ApiKey.hash_key("chave-valida"))._raw_delete("default")
+    cache.incr(GENERATION_KEY)
+
+    # A geração só é consultada de novo após o intervalo
+    assert ApiKeyResolver.resolve("chave-valida", clock=clock) == api_key
+    clock.now += 1
+    assert ApiKeyResolver.resolve("chave-valida", clock=clock) is None
+
+
+@pytest.mark.django_db
+def test_generation_is_not_read_on_every_lookup(settings):
+    settings.LOCAL_CACHE_GENERATION_CHECK_SECONDS = 5
+    clock = FakeClock()
+    ApiKey.objects.create(name="n8n", key="chave-valida")
+
+    with patch("app.core.local_cache.cache.get", return_value=0) as mock_get:
+        for _ in range(10):
+            ApiKeyResolver.resolve("chave-valida", clock=clock)
+            clock.now += 1
+
+    assert mock_get.call_count == 2
+
+
+@pytest.mark.django_db
+def test_cache_size_is_bounded(settings):
+    settings.API_KEY_CACHE_MAX_ENTRIES = 3
+    for i in range(10):
+        ApiKeyResolver.resolve(f"tentativa-{i}")
+
+    assert len(ApiKeyResolver._cache) == 3
+
+
+@pytest.mark.django_db
+def test_automation_request_costs_no_api_key_query_when_warm():
+    ApiKey.objects.create(name="n8n", key="chave-n8n")
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="chave-n8n")
+    url = reverse("automation-metrics")
+
+    client.get(url)
+    response, queries = api_key_queries(lambda: client.get(url))
+
+    assert response.status_code == 200
+    assert queries == 0
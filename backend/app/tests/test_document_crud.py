@@ -115,8 +115,10 @@ class TestDocumentCRUD:
 
     @patch("app.services.zapsign_service.ZapSignService.get_document_status")
     def test_retrieve_document_status_sync(
-        self, mock_zapsign_get_status, authenticated_client, document_instance
+        self, mock_zapsign_get_status, authenticated_client, document_instance, settings
     ):
+        # Limiar 0: o status local é sempre considerado desatualizado
+        settings.ZAPSIGN_STATUS_STALENESS_SECONDS = 0
         mock_zapsign_get_status.return_value = {
             "id": document_instance.openID,
             "token": document_instance.token,
@@ -0,0 +1,302 @@
+# TESTES DO PIPELINE ASSÍNCRONO DE INGESTÃO (fetch -> extract -> analyze)
+
+import base64
+import json
+import os
+
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+from django.conf import settings
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from app.company.models import Company, UserProfile
+from app.document.models import Document
+from app.ai.models import DocumentAnalysis
+from app.authapi.models import ApiKey
+from app.document.tasks import (
+    fetch_document_pdf_task,
+    extract_document_text_task,
+    enqueue_document_analysis,
+    start_ingestion_pipeline,
+    INGESTION_EVENT,
+)
+from app.services.storage_service import StorageService
+from app.services.text_store import DocumentTextStore
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+
+@pytest.fixture
+def setup_user_company(db):
+    company = Company.objects.create(name="Empresa Ingestão", apiToken="token-ing")
+    user = User.objects.create_user(
+        username="ingestao@test.com", email="ingestao@test.com", password="123"
+    )
+    UserProfile.objects.create(user=user, company=company)
+    return user, company
+
+
+@pytest.fixture
+def authenticated_client(setup_user_company):
+    user, _ = setup_user_company
+    client = APIClient()
+    refresh = RefreshToken.for_user(user)
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {refresh.access_token}")
+    return client
+
+
+@pytest.fixture
+def document(setup_user_company):
+    _, company = setup_user_company
+    return Document.objects.create(
+        name="Contrato Ingestão",
+        company=company,
+        token="DOC-ING",
+        status="pending",
+        url_pdf="http://example.com/contrato.pdf",
+    )
+
+
+@pytest.fixture
+def storage_dir(settings, tmp_path):
+    settings.BASE_DIR = tmp_path
+    settings.DOCUMENT_TEXT_STORE_PATH = str(tmp_path / "texts")
+    return tmp_path / "storage"
+
+
+# ============================================================
+# TESTES
+# ============================================================
+
+
+@pytest.mark.django_db
+@patch("app.document.views.WebSocketService")
+@patch("app.document.views.start_ingestion_pipeline")
+@patch("app.services.zapsign_service.ZapSignService.create_document")
+def test_create_returns_without_downloading_pdf(
+    mock_create_document, mock_pipeline, mock_ws, authenticated_client
+):
+    mock_create_document.return_value = {
+        "token": "DOC-NEW",
+        "id": 1,
+        "status": "pending",
+        "signers": [],
+    }
+
+    with patch("requests.get") as mock_get:
+        response = authenticated_client.post(
+            reverse("document-list"),
+            {"name": "Contrato", "url_pdf": "http://example.com/c.pdf"},
+            format="json",
+        )
+        mock_get.assert_not_called()
+
+    assert response.status_code == 201
+    document_id = response.data["id"]
+    mock_pipeline.assert_called_once_with(
+        document_id,
+        base64_pdf=None,
+        model_name="gemini",
+        priority=settings.TASK_PRIORITY_INTERACTIVE,
+    )
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.chain")
+def test_pipeline_message_carries_pdf_path_not_base64(mock_chain, document, storage_dir):
+    pdf_bytes = b"%PDF-1.4 " + b"x" * 100_000
+
+    start_ingestion_pipeline(document.id, base64_pdf=base64.b64encode(pdf_bytes).decode())
+
+    fetch_signature, _ = mock_chain.call_args.args
+    assert set(fetch_signature.kwargs) == {"pdf_path"}
+    assert len(json.dumps(fetch_signature.kwargs)) < 300
+    with open(fetch_signature.kwargs["pdf_path"], "rb") as f:
+        assert f.read() == pdf_bytes
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+def test_fetch_stage_decodes_base64_into_storage(mock_ws, document, storage_dir):
+    pdf_bytes = b"%PDF-1.4 fake"
+
+    # Mensagem enfileirada por uma versão anterior (Base64 no broker)
+    result = fetch_document_pdf_task(
+        document.id, base64_pdf=base64.b64encode(pdf_bytes).decode()
+    )
+    pdf_path = result["pdf_path"]
+
+    assert result["text_ref"] == DocumentTextStore.compute_key(pdf_bytes)
+    assert os.path.dirname(pdf_path) == str(storage_dir)
+    with open(pdf_path, "rb") as f:
+        assert f.read() == pdf_bytes
+
+    statuses = [
+        c.args[2]["status"]
+        for c in mock_ws.return_value.broadcast_document_update.call_args_list
+    ]
+    assert statuses == ["processing", "completed"]
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.requests.get")
+def test_fetch_stage_downloads_url(mock_get, mock_ws, document, storage_dir):
+    mock_get.return_value.content = b"%PDF-url"
+    mock_get.return_value.raise_for_status = MagicMock()
+
+    pdf_path = fetch_document_pdf_task(document.id)["pdf_path"]
+
+    mock_get.assert_called_once_with(document.url_pdf, timeout=10)
+    document.refresh_from_db()
+    assert document.content_sha256 == DocumentTextStore.compute_key(b"%PDF-url")
+    with open(pdf_path, "rb") as f:
+        assert f.read() == b"%PDF-url"
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.requests.get")
+def test_fetch_stage_reports_failure(mock_get, mock_ws, document, storage_dir):
+    mock_get.side_effect = requests.exceptions.ConnectionError("offline")
+
+    with pytest.raises(Exception):
+        fetch_document_pdf_task(document.id)
+
+    last_call = mock_ws.return_value.broadcast_document_update.call_args
+    assert last_call.args[0] == document.id
+    assert last_call.args[1] == INGESTION_EVENT
+    assert last_call.args[2]["stage"] == "fetch"
+    assert last_call.args[2]["status"] in ("retrying", "failed")
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+@patch("app.document.tasks.extract_text_from_pdf", return_value="Texto extraído")
+def test_extract_stage_stores_text_and_enqueues_reference(
+    mock_extract, mock_delay, mock_ws, document, storage_dir, tmp_path
+):
+    pdf_path = tmp_path / "doc.pdf"
+    pdf_path.write_bytes(b"%PDF")
+    text_ref = DocumentTextStore.compute_key(b"%PDF")
+
+    extract_document_text_task(
+        {"pdf_path": str(pdf_path), "text_ref": text_ref},
+        document.id,
+        model_name="gemini",
+    )
+
+    run_id = DocumentAnalysis.objects.get(document=document).run_id
+    mock_delay.assert_called_once_with(
+        kwargs={
+            "document_id": document.id,
+            "text_ref": text_ref,
+            "model_name": "gemini",
+            "run_id": str(run_id),
+        },
+        task_id=str(run_id),
+        priority=None,
+    )
+    assert DocumentTextStore().load(text_ref) == "Texto extraído"
+    assert DocumentAnalysis.objects.get(document=document).status == "pending"
+    assert not pdf_path.exists()
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+@patch("app.document.tasks.extract_text_from_pdf")
+def test_same_pdf_skips_extraction(
+    mock_extract, mock_delay, mock_ws, document, storage_dir
+):
+    pdf_bytes = b"%PDF-repetido"
+    text_ref = DocumentTextStore.compute_key(pdf_bytes)
+    DocumentTextStore().save(text_ref, "Texto já extraído")
+
+    pdf_path = StorageService().save_binary_file(pdf_bytes)
+    result = fetch_document_pdf_task(document.id, pdf_path=pdf_path)
+    extract_document_text_task(result, document.id)
+
+    mock_extract.assert_not_called()
+    assert not os.path.exists(pdf_path)
+    assert mock_delay.call_args.kwargs["kwargs"]["text_ref"] == text_ref
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+@patch("app.document.tasks.extract_text_from_pdf", return_value="Texto novo")
+def test_text_evicted_after_fetch_is_extracted_again(
+    mock_extract, mock_delay, mock_ws, document, storage_dir
+):
+    pdf_bytes = b"%PDF-expirado"
+    text_ref = DocumentTextStore.compute_key(pdf_bytes)
+    DocumentTextStore().save(text_ref, "Texto antigo")
+
+    result = fetch_document_pdf_task(
+        document.id, pdf_path=StorageService().save_binary_file(pdf_bytes)
+    )
+    os.remove(DocumentTextStore()._path_for(text_ref))  # removido entre o fetch e o extract
+    extract_document_text_task(result, document.id)
+
+    mock_extract.assert_called_once_with(result["pdf_path"])
+    assert DocumentTextStore().load(text_ref) == "Texto novo"
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.WebSocketService")
+@patch("app.document.tasks.extract_text_from_pdf")
+def test_extract_without_pdf_or_text_fails_clearly(
+    mock_extract, mock_ws, document, storage_dir
+):
+    with pytest.raises(ValueError, match="indisponível"):
+        extract_document_text_task({"pdf_path": None, "text_ref": "c" * 64}, document.id)
+
+    mock_extract.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.analyze_document_content_task.apply_async")
+@patch("app.document.tasks.WebSocketService")
+def test_broker_message_size_is_constant(mock_ws, mock_delay, document):
+    enqueue_document_analysis(document.id, "a" * 64)
+
+    kwargs = mock_delay.call_args.kwargs["kwargs"]
+    assert set(kwargs) == {"document_id", "text_ref", "model_name", "run_id"}
+    assert len(json.dumps(kwargs)) < 200
+
+
+@pytest.mark.django_db
+@patch("app.automations.views.start_ingestion_pipeline")
+@patch("app.automations.views.enqueue_document_analysis")
+def test_reanalyze_reuses_stored_text_reference(
+    mock_enqueue, mock_pipeline, document, storage_dir
+):
+    ApiKey.objects.create(name="n8n", key="reanalyze-key")
+    text_ref = DocumentTextStore.compute_key(b"%PDF-reanalise")
+    DocumentTextStore().save(text_ref, "Texto armazenado")
+    document.content_sha256 = text_ref
+    document.save()
+
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="reanalyze-key")
+    response = client.post(
+        reverse("automation-document-reanalyze", kwargs={"pk": document.id})
+    )
+
+    assert response.status_code == 200
+    mock_enqueue.assert_called_once_with(
+        document.id,
+        text_ref,
+        model_name="gemini",
+        priority=settings.TASK_PRIORITY_BULK,
+    )
+    mock_pipeline.assert_not_called()
@@ -0,0 +1,108 @@
+# TESTES DA LISTAGEM DE DOCUMENTOS (paginação por cursor, filtros e sparse fieldsets)
+
+import pytest
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.ai.models import DocumentAnalysis
+from app.company.models import Company, UserProfile
+from app.document.models import Document
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Listagem", apiToken="token")
+
+
+@pytest.fixture
+def client(company):
+    user = User.objects.create_user(username="lista@test.com", password="123")
+    UserProfile.objects.create(user=user, company=company)
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def make_documents(company, count, **extra):
+    return [
+        Document.objects.create(name=f"Doc {i}", company=company, **extra)
+        for i in range(count)
+    ]
+
+
+# ============================================================
+# TESTES
+# ============================================================
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_all_pages(client, company):
+    documents = make_documents(company, 5, status="pending")
+
+    response = client.get(reverse("document-list"), {"page_size": 2})
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 2
+
+    seen_ids = []
+    next_url = reverse("document-list") + "?page_size=2"
+    while next_url:
+        page = client.get(next_url).data
+        seen_ids.extend(doc["id"] for doc in page["results"])
+        next_url = page["next"]
+
+    # Mais recentes primeiro, sem repetições nem omissões
+    assert seen_ids == sorted((doc.id for doc in documents), reverse=True)
+
+
+@pytest.mark.django_db
+def test_filters_by_status_ai_status_and_external_id(client, company):
+    signed, pending = make_documents(company, 2, status="signed")
+    pending.status = "pending"
+    pending.externalID = "EXT-42"
+    pending.save()
+    DocumentAnalysis.objects.create(document=signed, status="failed")
+
+    url = reverse("document-list")
+
+    results = client.get(url, {"status": "signed"}).data["results"]
+    assert [doc["id"] for doc in results] == [signed.id]
+
+    results = client.get(url, {"ai_status": "failed"}).data["results"]
+    assert [doc["id"] for doc in results] == [signed.id]
+
+    results = client.get(url, {"externalID": "EXT-42"}).data["results"]
+    assert [doc["id"] for doc in results] == [pending.id]
+
+
+@pytest.mark.django_db
+def test_filters_by_date_range(client, company):
+    old, recent = make_documents(company, 2)
+    Document.objects.filter(id=old.id).update(
+        created_at=timezone.now() - timedelta(days=10)
+    )
+    since = (timezone.now() - timedelta(days=1)).date().isoformat()
+
+    response = client.get(reverse("document-list"), {"created_after": since})
+    assert [doc["id"] for doc in response.data["results"]] == [recent.id]
+
+    response = client.get(reverse("document-list"), {"created_before": "data-invalida"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_sparse_fieldsets(client, company):
+    make_documents(company, 1, status="pending")
+
+    response = client.get(reverse("document-list"), {"fields": "id,name,status"})
+    assert set(response.data["results"][0]) == {"id", "name", "status"}
+
+    response = client.get(reverse("document-list"), {"fields": "id,senha"})
+    assert response.status_code == 400
@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 from app.document.models import Document
 from app.company.models import Company
-from app.services.zapsign_service import ZapSignService
+from app.services.zapsign_service import ZapSignService, ZapSignSessionRegistry
 
 
 @pytest.mark.django_db
@@ -13,7 +13,7 @@ def test_create_document_remote():
 
     service = ZapSignService(api_token="abc123")
 
-    with patch("app.services.zapsign_service.requests.request") as mock_req:
+    with patch("app.services.zapsign_service.requests.Session.request") as mock_req:
         mock_req.return_value.status_code = 200
         mock_req.return_value.json.return_value = {
             "id": 99,
@@ -31,3 +31,64 @@ def test_create_document_remote():
 
         assert result["id"] == 99
         assert result["token"] == "T-123"
+
+
+@pytest.fixture
+def clean_registry():
+    ZapSignSessionRegistry.close_all()
+    yield
+    ZapSignSessionRegistry.close_all()
+
+
+def test_services_with_same_token_share_pooled_session(settings, clean_registry):
+    settings.ZAPSIGN_API_TOKEN = None
+
+    first = ZapSignService(api_token="token-A")
+    second = ZapSignService(api_token="token-A")
+    other = ZapSignService(api_token="token-B")
+
+    assert first.session is second.session
+    assert first.session is not other.session
+
+
+def test_least_recently_used_session_is_evicted(settings, clean_registry):
+    settings.ZAPSIGN_HTTP_MAX_SESSIONS = 2
+    first = ZapSignSessionRegistry.get_session("token-1")
+    ZapSignSessionRegistry.get_session("token-2")
+    ZapSignSessionRegistry.get_session("token-1")  # token-2 passa a ser o mais antigo
+
+    ZapSignSessionRegistry.get_session("token-3")
+
+    sessions = ZapSignSessionRegistry.stats()["sessions"]
+    assert set(sessions) == {
+        ZapSignSessionRegistry._token_key("token-1"),
+        ZapSignSessionRegistry._token_key("token-3"),
+    }
+    assert ZapSignSessionRegistry.get_session("token-1") is first
+
+
+def test_transport_retry_only_for_idempotent_verbs(clean_registry):
+    service = ZapSignService(api_token="token-retry")
+    retry = service.session.get_adapter("https://").max_retries
+
+    assert retry.allowed_methods == frozenset({"GET", "HEAD"})
+    assert retry.backoff_factor > 0
+
+
+def test_request_uses_configured_timeout_and_records_stats(settings, clean_registry):
+    settings.ZAPSIGN_HTTP_CONNECT_TIMEOUT = 2
+    settings.ZAPSIGN_HTTP_READ_TIMEOUT = 7
+    service = ZapSignService(api_token="token-stats")
+
+    with patch("app.services.zapsign_service.requests.Session.request") as mock_req:
+        mock_req.return_value.status_code = 200
+        mock_req.return_value.json.return_value = {"status": "signed"}
+        service.get_document_status("DOC-1")
+
+        assert mock_req.call_args.kwargs["timeout"] == (2, 7)
+
+    stats = ZapSignSessionRegistry.stats()
+    assert "token-stats" not in str(stats)
+    (session_stats,) = stats["sessions"].values()
+    assert session_stats["requests"] == 1
+    assert session_stats["errors"] == 0
@@ -0,0 +1,101 @@
+# TESTES DO SCHEMA OPENAPI EM CACHE
+
+import json
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.core import openapi
+from app.core.openapi import OpenAPISchemaCache, get_code_version
+
+
+@pytest.fixture(autouse=True)
+def clear_schema_cache(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_FILE = str(tmp_path / "openapi-schema.json")
+    OpenAPISchemaCache.clear()
+    yield
+    OpenAPISchemaCache.clear()
+
+
+def test_schema_is_generated_once_and_served_with_etag():
+    client = APIClient()
+
+    with patch.object(openapi, "generate_schema", wraps=openapi.generate_schema) as generate:
+        first = client.get(reverse("schema-json"))
+        second = client.get(reverse("schema-json"))
+
+    assert generate.call_count == 1
+    assert first.status_code == second.status_code == 200
+    assert first["ETag"] == second["ETag"]
+    assert first.content == second.content
+    assert "/api/document/" in json.loads(first.content)["paths"]
+
+
+def test_matching_etag_returns_304():
+    client = APIClient()
+    etag = client.get(reverse("schema"))["ETag"]
+
+    response = client.get(reverse("schema"), HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_schema_file_of_same_code_version_is_served_without_generation(settings):
+    with open(settings.OPENAPI_SCHEMA_FILE, "w", encoding="utf-8") as schema_file:
+        json.dump(
+            {"code_version": get_code_version(), "schema": {"openapi": "3.0.3", "paths": {}}},
+            schema_file,
+        )
+
+    with patch.object(openapi, "generate_schema") as generate:
+        response = APIClient().get(reverse("schema-json"))
+
+    generate.assert_not_called()
+    assert json.loads(response.content) == {"openapi": "3.0.3", "paths": {}}
+
+
+def test_schema_file_of_other_code_version_is_ignored(settings):
+    with open(settings.OPENAPI_SCHEMA_FILE, "w", encoding="utf-8") as schema_file:
+        json.dump({"code_version": "antiga", "schema": {"paths": {}}}, schema_file)
+
+    response = APIClient().get(reverse("schema-json"))
+
+    assert "/api/document/" in json.loads(response.content)["paths"]
+
+
+def test_generate_command_writes_current_version(settings):
+    from django.core.management import call_command
+
+    call_command("generate_openapi_schema")
+
+    with open(settings.OPENAPI_SCHEMA_FILE, encoding="utf-8") as schema_file:
+        stored = json.load(schema_file)
+    assert stored["code_version"] == get_code_version()
+    assert "/api/document/" in stored["schema"]["paths"]
+
+
+def test_code_version_ignores_test_modules(settings, tmp_path):
+    settings.BASE_DIR = tmp_path
+    settings.APP_CODE_VERSION = None
+    (tmp_path / "app" / "tests").mkdir(parents=True)
+    views = tmp_path / "app" / "views.py"
+    test_module = tmp_path / "app" / "tests" / "test_views.py"
+    views.write_text("A = 1\n")
+    test_module.write_text("def test_a(): pass\n")
+
+    def version():
+        get_code_version.cache_clear()
+        return get_code_version()
+
+    try:
+        original = version()
+        test_module.write_text("def test_b(): pass\n")
+        assert version() == original
+
+        views.write_text("A = 2\n")
+        assert version() != original
+    finally:
+        get_code_version.cache_clear()
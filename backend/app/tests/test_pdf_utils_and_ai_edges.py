@@ -3,7 +3,8 @@
 import pytest
 from unittest.mock import patch, MagicMock
 
-from app.utils.pdf_utils import extract_text_from_pdf
+from app.utils import pdf_utils
+from app.utils.pdf_utils import extract_text_from_pdf, iter_pdf_pages
 from app.ai.ai_service import AIProvider
 from app.ai.models import DocumentAnalysis
 from app.document.models import Document
@@ -70,6 +71,90 @@ def test_extract_text_from_pdf_propagates_exception():
             extract_text_from_pdf(b"invalid-pdf")
 
 
+def build_pdf(page_texts):
+    """Monta um PDF mínimo válido com uma linha de texto por página."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for text in page_texts:
+        content = f"BT /F1 12 Tf 72 712 Td ({text}) Tj ET"
+        objects.append(
+            f"<< /Length {len(content)} >>\nstream\n{content}\nendstream"
+        )
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {len(objects)} 0 R "
+            f"/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref_offset = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(pdf)
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    path = tmp_path / "contrato.pdf"
+    path.write_bytes(build_pdf([f"Clausula {i}" for i in range(1, 9)]))
+    return path
+
+
+def test_extract_text_from_pdf_path_streams_pages(pdf_path):
+    pages = list(iter_pdf_pages(str(pdf_path)))
+
+    assert len(pages) == 8
+    assert pages[0] == (1, "Clausula 1")
+    assert extract_text_from_pdf(str(pdf_path)).startswith("Clausula 1\n\nClausula 2")
+
+
+def test_extract_text_from_pdf_page_limit_and_char_budget(pdf_path):
+    assert extract_text_from_pdf(str(pdf_path), max_pages=2) == (
+        "Clausula 1\n\nClausula 2"
+    )
+    assert extract_text_from_pdf(pdf_path.read_bytes(), max_chars=15) == (
+        "Clausula 1\n\nCla"
+    )
+    # Limite atingido no separador: não termina com "\n\n" solto
+    assert extract_text_from_pdf(pdf_path.read_bytes(), max_chars=11) == "Clausula 1"
+    assert extract_text_from_pdf(pdf_path.read_bytes(), max_chars=12) == "Clausula 1"
+
+
+def test_extract_text_from_pdf_parallel_matches_sequential(pdf_path, settings):
+    settings.PDF_EXTRACT_PARALLEL_MIN_PAGES = 1
+
+    sequential = extract_text_from_pdf(str(pdf_path))
+    parallel = extract_text_from_pdf(str(pdf_path), workers=3)
+
+    assert parallel == sequential
+
+
+def test_parallel_extraction_reuses_one_forkserver_pool(pdf_path, settings):
+    settings.PDF_EXTRACT_PARALLEL_MIN_PAGES = 1
+
+    extract_text_from_pdf(str(pdf_path), workers=2)
+    executor = pdf_utils._executor
+    extract_text_from_pdf(str(pdf_path), max_chars=15, workers=2)
+
+    assert pdf_utils._executor is executor
+    assert executor._mp_context.get_start_method() != "fork"
+
+
 # ============================================================
 # TESTES AI PROVIDER (EDGE CASES)
 # ============================================================
@@ -62,7 +62,7 @@ def test_document_list_returns_documents(authenticated_client, document):
     url = reverse("document-list")
     response = authenticated_client.get(url)
     assert response.status_code == 200
-    assert len(response.data) >= 1
+    assert len(response.data["results"]) >= 1
 
 
 @pytest.mark.django_db
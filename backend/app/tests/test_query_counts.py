@@ -0,0 +1,135 @@
+# TESTES DE REGRESSÃO DE N+1: o número de consultas não pode crescer por documento
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.ai.models import DocumentAnalysis
+from app.authapi.api_keys import ApiKeyResolver
+from app.authapi.models import ApiKey
+from app.company.models import Company, UserProfile
+from app.company.tenant import TenantCache
+from app.document.models import Document
+from app.signer.models import Signer
+
+
+# ============================================================
+# FIXTURES
+# ============================================================
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Consultas", apiToken="token")
+
+
+@pytest.fixture
+def user_client(company):
+    user = User.objects.create_user(username="consultas@test.com", password="123")
+    UserProfile.objects.create(user=user, company=company)
+    # Contexto do tenant aquecido: usuário/perfil/empresa não entram na contagem
+    TenantCache.get(user.pk)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def api_key_client(db):
+    ApiKey.objects.create(name="relatorios", key="report-key")
+    # Cache de API Keys aquecido: a autenticação não entra na contagem
+    ApiKeyResolver.resolve("report-key")
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="report-key")
+    return client
+
+
+def add_documents(company, count):
+    """Cria documentos completos: 2 signatários e análise de IA cada."""
+    for i in range(count):
+        document = Document.objects.create(
+            name=f"Doc {i}", company=company, status="pending"
+        )
+        Signer.objects.create(document=document, name="A", email="a@test.com")
+        Signer.objects.create(document=document, name="B", email="b@test.com")
+        DocumentAnalysis.objects.create(document=document, status="completed")
+
+
+def count_queries(request):
+    with CaptureQueriesContext(connection) as context:
+        response = request()
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+def assert_constant_queries(company, request):
+    """Compara o número de consultas com 2 e com 10 documentos."""
+    add_documents(company, 2)
+    small = count_queries(request)
+
+    add_documents(company, 8)
+    large = count_queries(request)
+
+    assert large == small, f"{large - small} consultas extras para 8 documentos"
+
+
+# ============================================================
+# TESTES
+# ============================================================
+
+
+@pytest.mark.django_db
+def test_document_list_has_constant_queries(user_client, company):
+    assert_constant_queries(
+        company, lambda: user_client.get(reverse("document-list"))
+    )
+
+
+@pytest.mark.django_db
+def test_document_list_sparse_fields_skip_relations(user_client, company):
+    add_documents(company, 3)
+
+    with CaptureQueriesContext(connection) as context:
+        user_client.get(reverse("document-list"), {"fields": "id,name,status"})
+
+    sql = " ".join(query["sql"] for query in context.captured_queries)
+    assert "signer" not in sql
+    assert "ai_documentanalysis" not in sql
+
+
+@pytest.mark.django_db
+def test_report_has_constant_queries(api_key_client, company):
+    today = timezone.now().date().isoformat()
+    payload = {
+        "report_type": "monthly_summary",
+        "start_date": today,
+        "end_date": today,
+        "company_id": company.id,
+    }
+
+    assert_constant_queries(
+        company,
+        lambda: api_key_client.post(
+            reverse("automation-report-generation"), payload, format="json"
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_document_detail_queries(user_client, company):
+    add_documents(company, 1)
+    document = Document.objects.get()
+
+    # documento (com empresa e análise via JOIN) + signatários (prefetch)
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(
+            reverse("document-detail", kwargs={"pk": document.id})
+        )
+
+    assert response.status_code == 200
+    assert len(response.data["signers_db"]) == 2
+    assert len(context.captured_queries) == 2
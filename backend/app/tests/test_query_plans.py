@@ -0,0 +1,117 @@
+# TESTES DE PLANO DE EXECUÇÃO: as consultas quentes precisam usar os índices
+#
+# As consultas reais de cada fluxo são capturadas e passadas pelo EXPLAIN do
+# banco em uso (EXPLAIN QUERY PLAN no SQLite dos testes, EXPLAIN no PostgreSQL).
+
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.authapi.models import ApiKey
+from app.company.models import Company, UserProfile
+from app.document.models import Document
+from app.document.status_sync import reconcile_document_statuses
+from app.signer.models import Signer
+
+
+def query_plans(action, table):
+    """Executa `action` e retorna o plano de cada SELECT feito na tabela."""
+    with CaptureQueriesContext(connection) as context:
+        action()
+
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query["sql"]
+            if not sql.startswith("SELECT") or f'FROM "{table}"' not in sql:
+                continue
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}")
+            plans.append(" ".join(str(column) for row in cursor.fetchall() for column in row))
+    assert plans, f"Nenhuma consulta em {table} foi capturada"
+    return plans
+
+
+def assert_uses_index(plans, index_name):
+    assert any(index_name in plan for plan in plans), plans
+
+
+@pytest.fixture
+def company(db):
+    company = Company.objects.create(name="Empresa Índices", apiToken="token")
+    for i in range(3):
+        document = Document.objects.create(
+            name=f"Doc {i}", company=company, token=f"DOC-PLAN-{i}", status="pending"
+        )
+        Signer.objects.create(
+            document=document, name="A", email="a@t.com", token=f"SIG-PLAN-{i}"
+        )
+    return company
+
+
+@pytest.mark.django_db
+def test_webhook_lookups_use_token_indexes(company):
+    payload = {
+        "token": "DOC-PLAN-1",
+        "status": "signed",
+        "signers": [{"token": "SIG-PLAN-1", "status": "signed"}],
+    }
+
+    def post_webhook():
+        APIClient().post(reverse("zapsign-webhook"), payload, format="json")
+
+    assert_uses_index(query_plans(post_webhook, "document_document"), "document_token_uniq")
+    assert_uses_index(query_plans(post_webhook, "signer_signer"), "signer_document_token_uniq")
+
+
+@pytest.mark.django_db
+def test_document_list_uses_company_created_index(company):
+    user = User.objects.create_user(username="indices@test.com", password="123")
+    UserProfile.objects.create(user=user, company=company)
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    plans = query_plans(lambda: client.get(reverse("document-list")), "document_document")
+
+    assert_uses_index(plans, "document_company_created_idx")
+
+
+@pytest.mark.django_db
+def test_monthly_report_uses_company_created_index(company):
+    ApiKey.objects.create(name="relatorios", key="plan-key")
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="plan-key")
+    today = timezone.now().date().isoformat()
+    payload = {
+        "report_type": "monthly_summary",
+        "start_date": today,
+        "end_date": today,
+        "company_id": company.id,
+    }
+
+    plans = query_plans(
+        lambda: client.post(reverse("automation-report-generation"), payload, format="json"),
+        "document_document",
+    )
+
+    assert_uses_index(plans, "document_company_created_idx")
+
+
+@pytest.mark.django_db
+@patch("app.document.status_sync.WebSocketService")
+def test_reconcile_scans_only_open_documents_index(mock_ws, company):
+    async def unchanged(self, document_tokens):
+        return {token: {"status": "pending"} for token in document_tokens}
+
+    with patch(
+        "app.services.zapsign_async_service.AsyncZapSignService.get_document_statuses",
+        unchanged,
+    ):
+        plans = query_plans(reconcile_document_statuses, "document_document")
+
+    assert_uses_index(plans, "document_open_status_idx")
@@ -0,0 +1,186 @@
+# TESTES DOS ROLLUPS DIÁRIOS E RELATÓRIOS AGREGADOS
+
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.ai.models import DocumentAnalysis
+from app.authapi.models import ApiKey
+from app.automations.models import DocumentDailyRollup
+from app.automations.reports import status_breakdown
+from app.automations.rollups import rebuild_rollups
+from app.company.models import Company
+from app.document.models import Document
+from app.signer.models import Signer
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Rollup", apiToken="token")
+
+
+@pytest.fixture
+def api_client(db):
+    ApiKey.objects.create(name="dashboards", key="rollup-key")
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="rollup-key")
+    return client
+
+
+def rollup_counts(company, dimension):
+    return {
+        rollup.value: rollup.count
+        for rollup in DocumentDailyRollup.objects.filter(
+            company=company, dimension=dimension
+        )
+        if rollup.count
+    }
+
+
+def snapshot(company):
+    return sorted(
+        DocumentDailyRollup.objects.filter(company=company, count__gt=0).values_list(
+            "day", "dimension", "value", "count", "total_seconds"
+        )
+    )
+
+
+def seed(company):
+    signed = Document.objects.create(name="Assinado", company=company, status="pending")
+    signed.status = "signed"
+    signed.save()
+
+    pending = Document.objects.create(name="Pendente", company=company, status="pending")
+    Signer.objects.create(document=pending, name="A", status="new")
+    signer = Signer.objects.create(document=signed, name="B", status="new")
+    signer.status = "signed"
+    signer.save()
+
+    DocumentAnalysis.objects.create(document=signed, status="completed")
+    analysis = DocumentAnalysis.objects.create(document=pending, status="pending")
+    analysis.status = "failed"
+    analysis.save(update_fields=["status"])
+    return signed, pending
+
+
+@pytest.mark.django_db
+def test_status_changes_update_rollups_incrementally(
+    company, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        signed, pending = seed(company)
+
+    assert rollup_counts(company, DocumentDailyRollup.DOCUMENT_STATUS) == {
+        "signed": 1,
+        "pending": 1,
+    }
+    assert rollup_counts(company, DocumentDailyRollup.SIGNER_STATUS) == {
+        "new": 1,
+        "signed": 1,
+    }
+    assert rollup_counts(company, DocumentDailyRollup.AI_STATUS) == {
+        "completed": 1,
+        "failed": 1,
+    }
+    assert rollup_counts(company, DocumentDailyRollup.SIGNING_LATENCY) == {"signed": 1}
+
+    # Exclusão em cascata remove o documento e seus signatários/análise
+    with django_capture_on_commit_callbacks(execute=True):
+        pending.delete()
+    assert rollup_counts(company, DocumentDailyRollup.DOCUMENT_STATUS) == {"signed": 1}
+    assert rollup_counts(company, DocumentDailyRollup.SIGNER_STATUS) == {"signed": 1}
+    assert rollup_counts(company, DocumentDailyRollup.AI_STATUS) == {"completed": 1}
+
+
+@pytest.mark.django_db
+def test_rolled_back_transition_is_not_counted(company, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        Document.objects.create(name="Revertido", company=company, status="pending")
+
+    # Sem commit (callbacks descartados): nenhum contador alterado
+    assert callbacks
+    assert rollup_counts(company, DocumentDailyRollup.DOCUMENT_STATUS) == {}
+
+
+@pytest.mark.django_db
+def test_reports_skip_values_without_items(company):
+    today = timezone.localdate()
+    DocumentDailyRollup.objects.create(
+        company=company, day=today, dimension=DocumentDailyRollup.SIGNER_STATUS,
+        value="new", count=0,
+    )
+    DocumentDailyRollup.objects.create(
+        company=company, day=today, dimension=DocumentDailyRollup.SIGNER_STATUS,
+        value="signed", count=2,
+    )
+
+    breakdown = status_breakdown(company.id, today, today)
+
+    assert breakdown["signer_status"] == {"signed": 2}
+
+
+@pytest.mark.django_db
+def test_rebuild_matches_incremental_rollups(company, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        seed(company)
+    incremental = snapshot(company)
+
+    call_command("rebuild_report_rollups", company_id=company.id)
+
+    assert snapshot(company) == incremental
+
+
+@pytest.mark.django_db
+def test_rebuild_computes_signing_latency(company):
+    document = Document.objects.create(name="Antigo", company=company, status="signed")
+    created_at = timezone.now() - timedelta(days=3)
+    # update() não dispara signals: só a reconstrução enxerga as novas datas
+    Document.objects.filter(id=document.id).update(
+        created_at=created_at, signed_at=created_at + timedelta(hours=2)
+    )
+
+    rebuild_rollups(company_id=company.id)
+
+    latency = DocumentDailyRollup.objects.get(
+        company=company,
+        day=timezone.localdate(created_at),
+        dimension=DocumentDailyRollup.SIGNING_LATENCY,
+    )
+    assert latency.count == 1
+    assert latency.total_seconds == 7200
+
+
+@pytest.mark.django_db
+def test_rollup_report_types(api_client, company, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        seed(company)
+    today = timezone.now().date().isoformat()
+
+    def report(report_type):
+        response = api_client.post(
+            reverse("automation-report-generation"),
+            {
+                "report_type": report_type,
+                "start_date": today,
+                "end_date": today,
+                "company_id": company.id,
+            },
+            format="json",
+        )
+        assert response.status_code == 200
+        return response.data["data"]
+
+    breakdown = report("status_breakdown")
+    assert breakdown["total_documents"] == 2
+    assert breakdown["document_status"] == {"pending": 1, "signed": 1}
+    assert breakdown["by_day"][0]["day"] == today
+
+    latency = report("signing_latency")
+    assert latency["signed_documents"] == 1
+    assert latency["average_seconds"] is not None
+
+    ai = report("ai_failure_rate")
+    assert ai["failure_rate"] == 0.5
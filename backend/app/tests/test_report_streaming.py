@@ -0,0 +1,120 @@
+# TESTES DO RELATÓRIO EM STREAMING (NDJSON / CSV)
+
+import csv
+import io
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.ai.models import DocumentAnalysis
+from app.authapi.models import ApiKey
+from app.company.models import Company
+from app.document.models import Document
+from app.signer.models import Signer
+
+
+@pytest.fixture
+def api_client(db):
+    ApiKey.objects.create(name="n8n", key="stream-key")
+    client = APIClient()
+    client.credentials(HTTP_X_API_KEY="stream-key")
+    return client
+
+
+@pytest.fixture
+def company(db):
+    company = Company.objects.create(name="Empresa Stream", apiToken="token")
+    for i in range(5):
+        document = Document.objects.create(
+            name=f"Contrato {i}", company=company, status="pending"
+        )
+        Signer.objects.create(document=document, name=f"Signatário {i}")
+        DocumentAnalysis.objects.create(
+            document=document, status="completed", summary=f"Resumo {i}"
+        )
+    return company
+
+
+def report_payload(company, output_format):
+    today = timezone.now().date().isoformat()
+    return {
+        "report_type": "monthly_summary",
+        "start_date": today,
+        "end_date": today,
+        "company_id": company.id,
+        "format": output_format,
+    }
+
+
+def read_stream(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+@pytest.mark.django_db
+def test_ndjson_report_streams_one_document_per_line(api_client, company, settings):
+    settings.REPORT_STREAM_CHUNK_SIZE = 2
+
+    response = api_client.post(
+        reverse("automation-report-generation"),
+        report_payload(company, "ndjson"),
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in read_stream(response).splitlines()]
+    assert len(lines) == 5
+    assert lines[0]["signers_db"][0]["name"].startswith("Signatário")
+    assert lines[0]["ai_analysis"]["status"] == "completed"
+
+
+@pytest.mark.django_db
+def test_csv_report_has_header_and_rows(api_client, company):
+    response = api_client.post(
+        reverse("automation-report-generation"),
+        report_payload(company, "csv"),
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert "attachment" in response["Content-Disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+    assert len(rows) == 5
+    assert rows[0]["signers_count"] == "1"
+    assert rows[0]["ai_summary"].startswith("Resumo")
+
+
+@pytest.mark.django_db
+def test_streaming_queries_grow_per_chunk_not_per_document(api_client, company, settings):
+    settings.REPORT_STREAM_CHUNK_SIZE = 5
+
+    response = api_client.post(
+        reverse("automation-report-generation"),
+        report_payload(company, "ndjson"),
+        format="json",
+    )
+    with CaptureQueriesContext(connection) as context:
+        read_stream(response)
+
+    # documentos (com análise via JOIN) + signatários do bloco
+    assert len(context.captured_queries) == 2
+
+
+@pytest.mark.django_db
+def test_unknown_format_is_rejected(api_client, company):
+    response = api_client.post(
+        reverse("automation-report-generation"),
+        report_payload(company, "xml"),
+        format="json",
+    )
+
+    assert response.status_code == 400
+    assert response.data["success"] is False
@@ -0,0 +1,92 @@
+# TESTES DO LOG DE REQUISIÇÕES (amostragem, fila não bloqueante e middleware)
+
+import io
+import logging
+from unittest.mock import patch
+
+import pytest
+from django.test import RequestFactory
+
+from app.authapi.middleware import ApiKeyMiddleware
+from app.authapi.models import ApiKey
+from app.core.request_logging import AsyncStreamHandler, SamplingFilter
+
+
+def make_record(level):
+    return logging.LogRecord("app.request", level, __file__, 1, "evento %s", ("x",), None)
+
+
+def test_sampling_keeps_warnings_and_samples_lower_levels():
+    sampling = SamplingFilter(rate=0.1)
+
+    with patch("app.core.request_logging.random.random", return_value=0.5):
+        assert sampling.filter(make_record(logging.WARNING))
+        assert not sampling.filter(make_record(logging.INFO))
+
+    with patch("app.core.request_logging.random.random", return_value=0.05):
+        assert sampling.filter(make_record(logging.INFO))
+
+
+def test_async_handler_writes_formatted_records_from_listener_thread():
+    stream = io.StringIO()
+    handler = AsyncStreamHandler(stream=stream)
+    handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
+
+    handler.handle(make_record(logging.INFO))
+    handler._stop_listener()  # esvazia a fila
+
+    assert stream.getvalue() == "[INFO] evento x\n"
+
+
+def test_async_handler_drops_records_when_queue_is_full():
+    handler = AsyncStreamHandler(stream=io.StringIO(), queue_size=1)
+    handler._stop_listener()
+
+    handler.handle(make_record(logging.INFO))
+    handler.handle(make_record(logging.INFO))
+
+    assert handler.dropped == 1
+
+
+@pytest.mark.django_db
+def test_middleware_does_not_format_debug_messages_when_disabled():
+    ApiKey.objects.create(name="n8n", key="chave-n8n")
+    middleware = ApiKeyMiddleware(lambda request: "ok")
+    request = RequestFactory().get("/privado/", HTTP_X_API_KEY="chave-n8n")
+
+    with patch("app.core.request_logging.request_logger.isEnabledFor", return_value=False), \
+            patch.object(logging.LogRecord, "getMessage") as get_message:
+        assert middleware(request) == "ok"
+
+    get_message.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_middleware_rejects_missing_and_invalid_keys():
+    middleware = ApiKeyMiddleware(lambda request: "ok")
+    factory = RequestFactory()
+
+    assert middleware(factory.get("/privado/")).status_code == 401
+    assert middleware(factory.get("/privado/", HTTP_X_API_KEY="errada")).status_code == 403
+    assert middleware(factory.get("/api/documentos/")) == "ok"
+
+
+@pytest.mark.django_db
+def test_rejections_are_logged_as_unsampled_warnings():
+    middleware = ApiKeyMiddleware(lambda request: "ok")
+    factory = RequestFactory()
+
+    with patch("app.authapi.middleware.security_logger") as mock_logger:
+        middleware(factory.get("/privado/"))
+        middleware(factory.get("/privado/", HTTP_X_API_KEY="errada"))
+
+    reasons = [call.args[0] for call in mock_logger.warning.call_args_list]
+    assert reasons == [
+        "api_key rejected reason=missing path=%s",
+        "api_key rejected reason=invalid path=%s",
+    ]
+    security_handlers = logging.getLogger("app.security").handlers
+    assert security_handlers
+    assert not any(
+        isinstance(f, SamplingFilter) for h in security_handlers for f in h.filters
+    )
@@ -14,7 +14,7 @@ def test_add_signer_remote():
 
     service = ZapSignService(api_token="abc123")
 
-    with patch("app.services.zapsign_service.requests.request") as mock_req:
+    with patch("app.services.zapsign_service.requests.Session.request") as mock_req:
         mock_req.return_value.status_code = 200
         mock_req.return_value.json.return_value = {
             "token": "S-999",
@@ -0,0 +1,155 @@
+# TESTES DA RECONCILIAÇÃO PERIÓDICA DE STATUS COM A ZAPSIGN
+
+import pytest
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.automations.models import DocumentDailyRollup
+from app.company.models import Company, UserProfile
+from app.document.models import Document
+from app.document.status_sync import (
+    LAST_RECONCILE_KEY,
+    RECONCILE_LOCK_KEY,
+    is_remote_status_stale,
+    reconcile_document_statuses,
+)
+from app.document.tasks import reconcile_document_statuses_task
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Reconcile", apiToken="token-reconcile")
+
+
+def make_document(company, name, token, status="pending"):
+    return Document.objects.create(
+        name=name, company=company, token=token, status=status
+    )
+
+
+def fake_statuses(remote_by_token):
+    async def _get_document_statuses(self, document_tokens):
+        return {token: remote_by_token[token] for token in document_tokens}
+
+    return _get_document_statuses
+
+
+@pytest.mark.django_db
+@patch("app.document.status_sync.WebSocketService")
+def test_reconcile_updates_and_broadcasts_only_changed(
+    mock_ws, company, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        unchanged = make_document(company, "Sem mudança", "tok-1")
+        changed = make_document(company, "Assinado", "tok-2")
+        finished = make_document(company, "Finalizado", "tok-3", status="signed")
+
+    remote = {
+        "tok-1": {"status": "pending"},
+        "tok-2": {"status": "signed", "signed_file": "https://zapsign/signed.pdf"},
+    }
+    with patch(
+        "app.services.zapsign_async_service.AsyncZapSignService.get_document_statuses",
+        fake_statuses(remote),
+    ), django_capture_on_commit_callbacks(execute=True):
+        summary = reconcile_document_statuses(batch_size=1)
+
+    assert summary == {"checked": 2, "changed": 1, "errors": 0}
+
+    changed.refresh_from_db()
+    unchanged.refresh_from_db()
+    assert changed.status == "signed"
+    assert changed.signed_file_url == "https://zapsign/signed.pdf"
+    assert changed.signed_at is not None
+    # bulk_update não dispara signals: os rollups são atualizados explicitamente
+    assert DocumentDailyRollup.objects.get(
+        company=company, dimension="document_status", value="signed"
+    ).count == 2
+    assert unchanged.status == "pending"
+
+    broadcast = mock_ws.return_value.broadcast_document_list_update
+    assert broadcast.call_count == 1
+    assert broadcast.call_args.args[2]["id"] == changed.id
+    finished.refresh_from_db()
+    assert finished.status == "signed"
+
+
+@pytest.mark.django_db
+@patch("app.document.status_sync.WebSocketService")
+def test_reconcile_counts_individual_failures(mock_ws, company):
+    make_document(company, "Falha", "tok-err")
+    remote = {"tok-err": Exception("timeout")}
+
+    with patch(
+        "app.services.zapsign_async_service.AsyncZapSignService.get_document_statuses",
+        fake_statuses(remote),
+    ):
+        summary = reconcile_document_statuses()
+
+    assert summary["errors"] == 1
+    mock_ws.return_value.broadcast_document_list_update.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("app.document.status_sync.WebSocketService")
+def test_failed_company_is_not_marked_as_reconciled(mock_ws, company):
+    other = Company.objects.create(name="Outra", apiToken="token-outra")
+    make_document(company, "Falha", "tok-err")
+    make_document(other, "Ok", "tok-ok")
+    remote = {"tok-err": Exception("timeout"), "tok-ok": {"status": "pending"}}
+
+    with patch(
+        "app.services.zapsign_async_service.AsyncZapSignService.get_document_statuses",
+        fake_statuses(remote),
+    ):
+        reconcile_document_statuses()
+
+    assert cache.get(LAST_RECONCILE_KEY.format(company_id=company.id)) is None
+    assert cache.get(LAST_RECONCILE_KEY.format(company_id=other.id)) is not None
+
+
+@pytest.mark.django_db
+@patch("app.document.tasks.reconcile_document_statuses")
+def test_reconcile_task_skips_when_locked(mock_reconcile):
+    cache.add(RECONCILE_LOCK_KEY, True)
+    reconcile_document_statuses_task()
+    mock_reconcile.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_staleness_threshold(settings, company):
+    document = make_document(company, "Contrato", "tok-stale")
+
+    settings.ZAPSIGN_STATUS_STALENESS_SECONDS = None
+    assert is_remote_status_stale(document) is False
+
+    settings.ZAPSIGN_STATUS_STALENESS_SECONDS = 0
+    assert is_remote_status_stale(document) is True
+
+    settings.ZAPSIGN_STATUS_STALENESS_SECONDS = 3600
+    assert is_remote_status_stale(document) is False
+
+
+@pytest.mark.django_db
+@patch("app.services.zapsign_service.ZapSignService.get_document_status")
+def test_retrieve_serves_local_status_by_default(mock_get_status, company):
+    user = User.objects.create_user(username="reconcile", password="senha123")
+    UserProfile.objects.create(user=user, company=company)
+    document = make_document(company, "Contrato Local", "tok-local")
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    response = client.get(reverse("document-detail", kwargs={"pk": document.id}))
+
+    assert response.status_code == 200
+    assert response.data["status"] == "pending"
+    mock_get_status.assert_not_called()
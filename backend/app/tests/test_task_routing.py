@@ -0,0 +1,56 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_task_routing.py
+import pytest
+from unittest.mock import patch
+
+from app.core.task_priority import task_priority
+from app.document.tasks import start_ingestion_pipeline
+from config.celery import app as celery_app
+
+
+def route_queue(task_name):
+    return celery_app.amqp.router.route({}, task_name)["queue"].name
+
+
+@pytest.mark.parametrize(
+    "task_name, queue",
+    [
+        ("app.ai.tasks.analyze_document_content_task", "ai"),
+        ("app.document.tasks.fetch_document_pdf_task", "zapsign_io"),
+        ("app.document.tasks.extract_document_text_task", "zapsign_io"),
+        ("app.document.tasks.reconcile_document_statuses_task", "zapsign_io"),
+        ("app.webhook.tasks.process_webhook_events_task", "realtime"),
+        ("app.webhook.tasks.sweep_webhook_events_task", "realtime"),
+        ("config.celery.debug_task", "celery"),
+    ],
+)
+def test_tasks_are_routed_to_dedicated_queues(task_name, queue):
+    assert route_queue(task_name) == queue
+
+
+def test_interactive_work_has_higher_priority_than_bulk(settings):
+    settings.TASK_PRIORITY_INTERACTIVE = 2
+    settings.TASK_PRIORITY_BULK = 7
+    settings.TASK_PRIORITY_COMPANY_OVERRIDES = {}
+
+    # Redis: número menor = prioridade maior
+    assert task_priority(1) < task_priority(1, bulk=True)
+
+
+def test_company_override_applies_only_to_interactive_work(settings):
+    settings.TASK_PRIORITY_BULK = 7
+    settings.TASK_PRIORITY_COMPANY_OVERRIDES = {10: 0}
+
+    assert task_priority(10) == 0
+    assert task_priority(11) == settings.TASK_PRIORITY_INTERACTIVE
+    assert task_priority(10, bulk=True) == 7
+
+
+@patch("app.document.tasks.chain")
+def test_pipeline_priority_is_propagated_to_every_stage(mock_chain):
+    start_ingestion_pipeline(1, model_name="gemini", priority=7)
+
+    fetch_signature, extract_signature = mock_chain.call_args.args
+    assert fetch_signature.options["priority"] == 7
+    assert extract_signature.options["priority"] == 7
+    # A etapa de extração repassa a prioridade para a análise de IA
+    assert extract_signature.kwargs["priority"] == 7
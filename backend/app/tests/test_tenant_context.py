@@ -0,0 +1,148 @@
+# TESTES DO CONTEXTO DE TENANT (usuário -> perfil -> empresa por requisição)
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from app.company.models import Company, UserProfile
+from app.company.tenant import TenantCache
+
+
+@pytest.fixture
+def company(db):
+    return Company.objects.create(name="Empresa Tenant", apiToken="token-empresa")
+
+
+@pytest.fixture
+def user(company):
+    user = User.objects.create_user(username="tenant@test.com", password="123")
+    UserProfile.objects.create(user=user, company=company)
+    return user
+
+
+def jwt_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}")
+    return client
+
+
+@pytest.mark.django_db
+def test_context_is_loaded_in_one_query_and_then_cached(user, company):
+    with CaptureQueriesContext(connection) as first:
+        tenant = TenantCache.get(user.pk)
+    with CaptureQueriesContext(connection) as second:
+        cached = TenantCache.get(user.pk)
+
+    assert len(first.captured_queries) == 1
+    assert len(second.captured_queries) == 0
+    assert cached is not tenant
+    assert (tenant.user, tenant.company_id, tenant.zapsign_api_token) == (
+        user, company.id, "token-empresa"
+    )
+
+
+@pytest.mark.django_db
+def test_each_lookup_gets_its_own_instances(user, company):
+    TenantCache.get(user.pk)
+    first = TenantCache.get(user.pk)
+    first.user.first_name = "Alterado"
+    first.company.name = "Alterada"
+
+    with CaptureQueriesContext(connection) as context:
+        second = TenantCache.get(user.pk)
+        profile = second.user.profile
+
+    assert len(context.captured_queries) == 0
+    assert second.user is not first.user
+    assert (second.user.first_name, second.company.name) == ("", "Empresa Tenant")
+    assert profile.company is second.company
+
+
+@pytest.mark.django_db
+def test_user_without_profile_is_cached_without_queries(db):
+    user = User.objects.create_user(username="semperfil@test.com", password="123")
+    TenantCache.get(user.pk)
+
+    with CaptureQueriesContext(connection) as context:
+        tenant = TenantCache.get(user.pk)
+
+    assert len(context.captured_queries) == 0
+    assert (tenant.profile, tenant.company_id) == (None, None)
+
+
+@pytest.mark.django_db
+def test_global_zapsign_token_is_used_when_company_has_none(settings, user, company):
+    settings.ZAPSIGN_API_TOKEN = "token-global"
+    company.apiToken = None
+    company.save()
+
+    assert TenantCache.get(user.pk).zapsign_api_token == "token-global"
+
+
+@pytest.mark.django_db
+def test_company_change_invalidates_cached_context(user, company):
+    assert TenantCache.get(user.pk).zapsign_api_token == "token-empresa"
+
+    company.apiToken = "token-novo"
+    company.save()
+
+    assert TenantCache.get(user.pk).zapsign_api_token == "token-novo"
+
+
+@pytest.mark.django_db
+def test_jwt_request_resolves_tenant_without_queries_when_warm(user, company):
+    client = jwt_client(user)
+    url = reverse("company-list")
+    client.get(url)
+
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+
+    assert response.status_code == 200
+    # Apenas a consulta da própria view (empresa do tenant)
+    assert len(context.captured_queries) == 1
+    assert [item["id"] for item in response.data] == [company.id]
+
+
+@pytest.mark.django_db
+def test_inactive_user_is_rejected(user):
+    client = jwt_client(user)
+    user.is_active = False
+    user.save()
+
+    response = client.get(reverse("company-list"))
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_token_is_revoked_after_password_change(monkeypatch, user):
+    # api_settings do simplejwt é importado por referência: altera o objeto
+    monkeypatch.setattr(api_settings, "CHECK_REVOKE_TOKEN", True)
+    client = jwt_client(user)
+    url = reverse("company-list")
+    assert client.get(url).status_code == 200
+
+    user.set_password("nova-senha")
+    user.save()
+    response = client.get(url)
+
+    assert response.status_code == 401
+    assert "password has been changed" in str(response.data)
+
+
+@pytest.mark.django_db
+def test_custom_user_id_field_uses_simplejwt_lookup(monkeypatch, user, company):
+    monkeypatch.setattr(api_settings, "USER_ID_FIELD", "username")
+    monkeypatch.setattr(api_settings, "USER_ID_CLAIM", "username")
+    client = jwt_client(user)
+
+    response = client.get(reverse("company-list"))
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.data] == [company.id]
@@ -1,7 +1,11 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_webhook_and_reanalysis.py
 ## TESTES DE WEBHOOK ZAPSIGN E ANALISE DE DOMINIO
 
+from unittest.mock import patch
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 
@@ -159,3 +163,119 @@ def test_multiple_webhook_calls_are_idempotent(client, document):
 
     document.refresh_from_db()
     assert document.status == "signed"
+
+
+# ============================================================
+# ATUALIZAÇÃO EM LOTE (bulk) DOS SIGNATÁRIOS
+# ============================================================
+def _signers_payload(document, signers, status):
+    return {
+        "token": document.token,
+        "event_type": "signer_signed",
+        "status": "pending",
+        "signers": [{"token": s.token, "status": status} for s in signers],
+    }
+
+
+def _create_signers(document, count):
+    return [
+        Signer.objects.create(
+            document=document,
+            name=f"Assinante {index}",
+            email=f"s{index}@teste.com",
+            token=f"SIGNER-BULK-{index}",
+            status="pending",
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.mark.django_db
+def test_webhook_query_count_does_not_grow_with_signers(client, document):
+    url = reverse("zapsign-webhook")
+    few = _create_signers(document, 2)
+
+    with CaptureQueriesContext(connection) as few_queries:
+        client.post(url, _signers_payload(document, few, "signed"), format="json")
+
+    other = Document.objects.create(
+        name="Outro", company=document.company, token="DOC-WEBHOOK-2", status="pending"
+    )
+    many = [
+        Signer.objects.create(
+            document=other,
+            name=f"S{index}",
+            email=f"m{index}@teste.com",
+            token=f"MANY-{index}",
+            status="pending",
+        )
+        for index in range(10)
+    ]
+    with CaptureQueriesContext(connection) as many_queries:
+        client.post(url, _signers_payload(other, many, "signed"), format="json")
+
+    # Nada depende da quantidade de signatários. A primeira gravação de um
+    # contador de rollup cria a linha (INSERT + savepoint): fica fora da comparação
+    def webhook_queries(queries):
+        return [
+            q["sql"]
+            for q in queries.captured_queries
+            if "SAVEPOINT" not in q["sql"] and not q["sql"].startswith("INSERT")
+        ]
+
+    assert len(webhook_queries(many_queries)) == len(webhook_queries(few_queries))
+    assert Signer.objects.filter(document=other, status="signed").count() == 10
+
+
+@pytest.mark.django_db
+def test_webhook_without_changes_does_not_write(client, document, signer):
+    url = reverse("zapsign-webhook")
+    payload = _signers_payload(document, [signer], "pending")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(url, payload, format="json")
+
+    assert response.status_code == 200
+    assert not [q for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+
+
+@pytest.mark.django_db
+@patch("app.document.status_sync.WebSocketService")
+def test_webhook_signer_changes_update_rollups(
+    mock_ws, client, document, signer, django_capture_on_commit_callbacks
+):
+    from app.automations.models import DocumentDailyRollup
+    from app.automations.rollups import rebuild_rollups
+
+    # Contadores iniciais das fixtures (criadas fora de um commit capturado)
+    rebuild_rollups()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.post(
+            reverse("zapsign-webhook"),
+            _signers_payload(document, [signer], "signed"),
+            format="json",
+        )
+
+    counts = dict(
+        DocumentDailyRollup.objects.filter(
+            company=document.company, dimension=DocumentDailyRollup.SIGNER_STATUS
+        ).values_list("value", "count")
+    )
+    assert counts == {"pending": 0, "signed": 1}
+
+
+@pytest.mark.django_db
+def test_benchmark_webhook_burst_rolls_back(tmp_path):
+    from io import StringIO
+    from django.core.management import call_command
+
+    out = StringIO()
+    call_command("benchmark_webhook_burst", documents=2, signers=3, stdout=out)
+
+    assert "eventos" in out.getvalue()
+    assert not Document.objects.filter(token__startswith="BENCH-DOC-").exists()
+
+    recorded = tmp_path / "burst.ndjson"
+    recorded.write_text('{"token": "DESCONHECIDO", "status": "signed"}\n')
+    call_command("benchmark_webhook_burst", file=str(recorded), stdout=out)
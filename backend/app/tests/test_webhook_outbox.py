@@ -0,0 +1,245 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\tests\test_webhook_outbox.py
+from datetime import timedelta
+
+import pytest
+from unittest.mock import patch
+from celery.exceptions import Retry
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.company.models import Company
+from app.document.models import Document
+from app.signer.models import Signer
+from app.webhook.models import WebhookEvent
+from app.webhook.outbox import enqueue_webhook_event, process_pending_events
+from app.webhook.tasks import (
+    WEBHOOK_LOCK_KEY,
+    process_webhook_events_task,
+    sweep_webhook_events_task,
+)
+
+
+@pytest.fixture
+def document(db):
+    company = Company.objects.create(name="Empresa Webhook", apiToken="token123")
+    return Document.objects.create(
+        name="Documento", company=company, token="DOC-OUTBOX", status="pending"
+    )
+
+
+@pytest.fixture
+def async_webhooks(settings):
+    settings.ZAPSIGN_WEBHOOK_ASYNC = True
+    return settings
+
+
+def event_payload(document, status, last_update_at=None, **extra):
+    payload = {"token": document.token, "event_type": "doc_update", "status": status}
+    if last_update_at:
+        payload["last_update_at"] = last_update_at
+    payload.update(extra)
+    return payload
+
+
+# ========================================================================
+# Recebimento (endpoint)
+# ========================================================================
+@pytest.mark.django_db
+@patch("app.webhook.views.process_webhook_events_task.delay")
+def test_async_webhook_acknowledges_without_applying(
+    mock_delay, async_webhooks, document, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = APIClient().post(
+            reverse("zapsign-webhook"), event_payload(document, "signed"), format="json"
+        )
+
+    assert response.status_code == 202
+    document.refresh_from_db()
+    assert document.status == "pending"
+    assert WebhookEvent.objects.get().status == WebhookEvent.PENDING
+    mock_delay.assert_called_once_with(document.token)
+
+
+@pytest.mark.django_db
+@patch("app.webhook.views.process_webhook_events_task.delay")
+def test_duplicate_delivery_is_not_queued_twice(mock_delay, async_webhooks, document):
+    client = APIClient()
+    payload = event_payload(document, "signed")
+
+    client.post(reverse("zapsign-webhook"), payload, format="json")
+    response = client.post(reverse("zapsign-webhook"), payload, format="json")
+
+    assert response.status_code == 200
+    assert response.data["duplicate"] is True
+    assert WebhookEvent.objects.count() == 1
+
+
+# ========================================================================
+# Processamento
+# ========================================================================
+@pytest.mark.django_db
+def test_events_are_applied_in_arrival_order(document):
+    enqueue_webhook_event(event_payload(document, "link_opened"))
+    enqueue_webhook_event(event_payload(document, "signed"))
+
+    summary = process_pending_events(document.token)
+
+    assert summary["processed"] == 2
+    document.refresh_from_db()
+    assert document.status == "signed"
+
+
+@pytest.mark.django_db
+def test_out_of_order_event_is_discarded(document):
+    enqueue_webhook_event(event_payload(document, "signed", "2025-01-02T10:00:00Z"))
+    process_pending_events(document.token)
+
+    late_event, _ = enqueue_webhook_event(
+        event_payload(document, "pending", "2025-01-02T09:00:00Z")
+    )
+    summary = process_pending_events(document.token)
+
+    assert summary["stale"] == 1
+    late_event.refresh_from_db()
+    assert late_event.status == WebhookEvent.STALE
+    document.refresh_from_db()
+    assert document.status == "signed"
+
+
+@pytest.mark.django_db
+def test_only_zapsign_last_update_at_orders_events(document):
+    enqueue_webhook_event(
+        event_payload(document, "signed", "2025-01-02T10:00:00.123456Z")
+    )
+    process_pending_events(document.token)
+
+    # Outros campos de data não são o momento do evento
+    event, _ = enqueue_webhook_event(
+        event_payload(document, "pending", updated_at="2025-01-01T00:00:00Z")
+    )
+
+    assert event.event_at is None
+    assert process_pending_events(document.token)["processed"] == 1
+
+
+@pytest.mark.django_db
+def test_failure_blocks_later_events_of_same_document(document):
+    first, _ = enqueue_webhook_event(event_payload(document, "link_opened"))
+    second, _ = enqueue_webhook_event(event_payload(document, "signed"))
+
+    with patch(
+        "app.webhook.outbox.apply_webhook_payload", side_effect=Exception("lock timeout")
+    ):
+        summary = process_pending_events(document.token)
+
+    assert summary["blocked"] is True
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert (first.status, first.attempts, first.last_error) == (
+        WebhookEvent.PENDING, 1, "lock timeout"
+    )
+    assert second.attempts == 0
+
+
+@pytest.mark.django_db
+def test_event_fails_after_max_attempts_and_queue_moves_on(settings, document):
+    settings.WEBHOOK_EVENT_MAX_ATTEMPTS = 1
+    first, _ = enqueue_webhook_event(event_payload(document, "link_opened"))
+    enqueue_webhook_event(event_payload(document, "signed"))
+
+    with patch(
+        "app.webhook.outbox.apply_webhook_payload",
+        side_effect=[Exception("erro"), {"found": True}],
+    ):
+        summary = process_pending_events(document.token)
+
+    assert summary["failed"] == 1 and summary["processed"] == 1
+    first.refresh_from_db()
+    assert first.status == WebhookEvent.FAILED
+
+
+@pytest.mark.django_db
+def test_broadcast_happens_after_commit(document, django_capture_on_commit_callbacks):
+    Signer.objects.create(
+        document=document, name="A", email="a@t.com", token="S-1", status="pending"
+    )
+    enqueue_webhook_event(
+        event_payload(document, "pending", signers=[{"token": "S-1", "status": "signed"}])
+    )
+
+    with patch("app.webhook.processing.broadcast_document_changes") as mock_broadcast:
+        with django_capture_on_commit_callbacks() as callbacks:
+            process_pending_events(document.token)
+        mock_broadcast.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        assert mock_broadcast.call_args.args[0][0].id == document.id
+
+
+# ========================================================================
+# Tasks
+# ========================================================================
+@pytest.mark.django_db
+def test_task_requeues_when_another_worker_holds_the_document(document):
+    cache.add(WEBHOOK_LOCK_KEY.format(document_token=document.token), True)
+
+    with patch.object(
+        process_webhook_events_task, "retry", side_effect=Retry()
+    ) as mock_retry:
+        with pytest.raises(Retry):
+            process_webhook_events_task(document.token)
+
+    assert mock_retry.call_args.kwargs["countdown"] == 1
+
+
+@pytest.mark.django_db
+def test_task_gives_up_to_sweep_after_lock_retries(settings, document):
+    settings.WEBHOOK_EVENT_LOCK_RETRIES = 3
+    cache.add(WEBHOOK_LOCK_KEY.format(document_token=document.token), True)
+    enqueue_webhook_event(event_payload(document, "signed"))
+
+    process_webhook_events_task.push_request(retries=3)
+    try:
+        with patch.object(process_webhook_events_task, "retry") as mock_retry:
+            assert process_webhook_events_task.run(document.token) is None
+    finally:
+        process_webhook_events_task.pop_request()
+
+    mock_retry.assert_not_called()
+    assert WebhookEvent.objects.get().status == WebhookEvent.PENDING
+
+
+@pytest.mark.django_db
+def test_task_renews_lock_for_each_event(document):
+    enqueue_webhook_event(event_payload(document, "link_opened"))
+    enqueue_webhook_event(event_payload(document, "signed"))
+
+    with patch("app.webhook.tasks.cache.touch") as mock_touch:
+        summary = process_webhook_events_task(document.token)
+
+    assert summary["processed"] == 2
+    assert mock_touch.call_count == 2
+    assert not cache.get(WEBHOOK_LOCK_KEY.format(document_token=document.token))
+
+
+@pytest.mark.django_db
+@patch("app.webhook.tasks.process_webhook_events_task.delay")
+def test_sweep_requeues_stuck_events_and_prunes_old_ones(mock_delay, document):
+    stuck, _ = enqueue_webhook_event(event_payload(document, "link_opened"))
+    old, _ = enqueue_webhook_event(event_payload(document, "signed"))
+    WebhookEvent.objects.filter(pk=stuck.pk).update(
+        received_at=timezone.now() - timedelta(minutes=5)
+    )
+    WebhookEvent.objects.filter(pk=old.pk).update(
+        status=WebhookEvent.PROCESSED,
+        received_at=timezone.now() - timedelta(days=30),
+    )
+
+    sweep_webhook_events_task()
+
+    mock_delay.assert_called_once_with(document.token)
+    assert list(WebhookEvent.objects.values_list("pk", flat=True)) == [stuck.pk]
@@ -0,0 +1,107 @@
+# TESTES DO CLIENTE ASSÍNCRONO DA ZAPSIGN (AsyncZapSignService)
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.zapsign_async_service import AsyncZapSignClientPool, AsyncZapSignService
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def make_service(handler):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncZapSignService(api_token="async-token", client=client)
+
+
+def test_create_document_sends_same_payload_as_sync_service():
+    captured = {}
+
+    def handler(request):
+        captured["method"] = request.method
+        captured["path"] = request.url.path
+        captured["auth"] = request.headers["Authorization"]
+        captured["body"] = json.loads(request.content)
+        return httpx.Response(200, json={"token": "T-1", "status": "pending"})
+
+    service = make_service(handler)
+    result = run(
+        service.create_document(
+            "Contrato", external_id="E1", url_pdf="http://example.com/c.pdf"
+        )
+    )
+
+    assert result["token"] == "T-1"
+    assert captured["method"] == "POST"
+    assert captured["path"].endswith("/docs")
+    assert captured["auth"] == "Bearer async-token"
+    assert captured["body"]["url_pdf"] == "http://example.com/c.pdf"
+    assert captured["body"]["lang"] == "pt-br"
+
+
+def test_http_error_raises_clean_message():
+    def handler(request):
+        return httpx.Response(400, json={"error": "Documento inválido"})
+
+    service = make_service(handler)
+
+    with pytest.raises(Exception, match="Erro ZapSign: Documento inválido"):
+        run(service.get_document_status("DOC-X"))
+
+
+def test_update_signer_without_changes_skips_request():
+    def handler(request):
+        raise AssertionError("Nenhuma requisição deveria ser feita")
+
+    service = make_service(handler)
+    assert run(service.update_signer("S-1")) == {
+        "message": "Nenhuma alteração enviada."
+    }
+
+
+def test_download_signed_pdf_returns_bytes():
+    def handler(request):
+        return httpx.Response(200, content=b"%PDF-assinado")
+
+    service = make_service(handler)
+    assert run(service.download_signed_pdf("DOC-1")) == b"%PDF-assinado"
+
+
+def test_fan_out_is_bounded_by_semaphore(settings):
+    settings.ZAPSIGN_ASYNC_CONCURRENCY = 3
+    in_flight = {"current": 0, "max": 0}
+
+    async def handler(request):
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        token = request.url.path.rstrip("/").split("/")[-1]
+        if token == "DOC-FAIL":
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"token": token, "status": "signed"})
+
+    service = make_service(handler)
+    tokens = [f"DOC-{i}" for i in range(30)] + ["DOC-FAIL"]
+
+    results = run(service.get_document_statuses(tokens))
+
+    assert in_flight["max"] == 3
+    assert results["DOC-7"]["status"] == "signed"
+    assert isinstance(results["DOC-FAIL"], Exception)
+
+
+def test_pooled_client_transport_uses_configured_limits(settings):
+    settings.ZAPSIGN_ASYNC_MAX_CONNECTIONS = 7
+
+    client = AsyncZapSignClientPool._build_client()
+    try:
+        pool = client._transport._pool
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 7
+    finally:
+        run(client.aclose())
@@ -0,0 +1,82 @@
+# TESTES DO REGISTRO DE CLIENTES DA ZAPSIGN POR EMPRESA
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from app.company.models import Company
+from app.core.local_cache import LocalTTLCache
+from app.services.zapsign_service import ZapSignClientRegistry
+
+
+@pytest.mark.django_db
+def test_client_is_built_once_and_reused():
+    company = Company.objects.create(name="Empresa", apiToken="token-empresa")
+
+    with CaptureQueriesContext(connection) as first:
+        client = ZapSignClientRegistry.for_company(company.id)
+    with CaptureQueriesContext(connection) as second:
+        again = ZapSignClientRegistry.for_company(company.id)
+
+    assert again is client
+    assert client.api_token == "token-empresa"
+    assert (len(first.captured_queries), len(second.captured_queries)) == (1, 0)
+
+
+@pytest.mark.django_db
+def test_global_token_is_used_and_missing_token_returns_none(settings):
+    company = Company.objects.create(name="Sem token", apiToken=None)
+
+    settings.ZAPSIGN_API_TOKEN = "token-global"
+    assert ZapSignClientRegistry.for_company(company.id).api_token == "token-global"
+
+    ZapSignClientRegistry.reset()
+    settings.ZAPSIGN_API_TOKEN = None
+    assert ZapSignClientRegistry.for_company(company.id) is None
+
+
+@pytest.mark.django_db
+def test_api_token_change_invalidates_client():
+    company = Company.objects.create(name="Empresa", apiToken="token-antigo")
+    old_client = ZapSignClientRegistry.for_company(company.id)
+
+    company.apiToken = "token-novo"
+    company.save()
+
+    new_client = ZapSignClientRegistry.for_company(company.id)
+    assert new_client is not old_client
+    assert new_client.api_token == "token-novo"
+
+
+@pytest.mark.django_db
+def test_only_api_token_changes_invalidate_that_company_client():
+    company = Company.objects.create(name="Empresa", apiToken="token-a")
+    other = Company.objects.create(name="Outra", apiToken="token-b")
+    client = ZapSignClientRegistry.for_company(company.id)
+    other_client = ZapSignClientRegistry.for_company(other.id)
+
+    company.name = "Empresa renomeada"
+    company.save()
+    assert ZapSignClientRegistry.for_company(company.id) is client
+
+    company.apiToken = "token-novo"
+    company.save(update_fields=["apiToken"])
+    assert ZapSignClientRegistry.for_company(company.id).api_token == "token-novo"
+    assert ZapSignClientRegistry.for_company(other.id) is other_client
+
+
+@pytest.mark.django_db
+def test_invalidation_from_another_process_drops_only_its_keys(settings):
+    settings.LOCAL_CACHE_GENERATION_CHECK_SECONDS = 0
+    company = Company.objects.create(name="Empresa", apiToken="token-a")
+    other = Company.objects.create(name="Outra", apiToken="token-b")
+    client = ZapSignClientRegistry.for_company(company.id)
+    other_client = ZapSignClientRegistry.for_company(other.id)
+
+    # Mesmo contador de geração, cache local de outro processo
+    LocalTTLCache(
+        ZapSignClientRegistry._cache.generation_key, "ZAPSIGN_CLIENT_CACHE_MAX_ENTRIES"
+    ).invalidate([company.id])
+
+    assert ZapSignClientRegistry.for_company(company.id) is not client
+    assert ZapSignClientRegistry.for_company(other.id) is other_client
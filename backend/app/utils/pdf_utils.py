@@ -1,17 +1,170 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\app\utils\pdf_utils.py
 import io
 import logging
+import mmap
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing, contextmanager
+
+from django.conf import settings
 from PyPDF2 import PdfReader
 
 logger = logging.getLogger(__name__)
 
+PAGE_SEPARATOR = "\n\n"
+
+# Pool de processos único por processo, criado sob demanda e reaproveitado
+# entre as extrações (inclusive entre as threads do worker_io)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@contextmanager
+def _open_pdf_stream(source):
+    """
+    Abre a origem do PDF como stream para o PdfReader:
+    - bytes: BytesIO (compatibilidade com a assinatura antiga);
+    - caminho: arquivo mapeado em memória (mmap), sem copiar o conteúdo;
+    - objeto de arquivo: usado diretamente.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as pdf_file:
+            with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+    else:
+        yield source
+
+
+def _page_text(page, page_num):
+    try:
+        page_text = page.extract_text()
+    except Exception as e:
+        logger.warning(f"Erro ao extrair texto da página {page_num}: {e}")
+        return None
+
+    if page_text:
+        logger.debug(
+            f"Texto extraído da página {page_num}: {len(page_text)} caracteres"
+        )
+    return page_text
+
+
+def _extract_page_range(pdf_path, start, stop):
+    """Executado em um processo do pool: extrai as páginas [start, stop)."""
+    with _open_pdf_stream(pdf_path) as stream:
+        pages = PdfReader(stream).pages
+        return [
+            (page_index + 1, _page_text(pages[page_index], page_index + 1))
+            for page_index in range(start, stop)
+        ]
+
+
+def _can_use_process_pool():
+    # Processos daemon (ex: workers prefork do Celery) não podem criar filhos
+    return not multiprocessing.current_process().daemon
+
+
+def _mp_context():
+    # Nunca usa fork: copiar um worker com várias threads ativas (locks de
+    # logging, conexões) pode travar o filho. O forkserver parte de um
+    # processo limpo; onde não existe (Windows), usa spawn.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = max(getattr(settings, "PDF_EXTRACT_WORKERS", 1), workers)
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=_mp_context()
+            )
+            logger.info(f"Pool de extração de PDF criado com {max_workers} processos")
+        return _executor
 
-def extract_text_from_pdf(pdf_content: bytes) -> str:
+
+def _discard_executor(executor):
+    # Pool quebrado (processo filho morto): a próxima extração cria outro
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_pdf_pages(source, max_pages=None, workers=None):
+    """
+    Gera (número da página, texto) página a página, sem montar a lista
+    completa em memória. Com `workers` > 1 e uma origem em arquivo, as faixas
+    de páginas são distribuídas em um pool de processos; a ordem é mantida.
+    """
+    workers = workers or getattr(settings, "PDF_EXTRACT_WORKERS", 1)
+    min_parallel_pages = getattr(settings, "PDF_EXTRACT_PARALLEL_MIN_PAGES", 50)
+
+    with _open_pdf_stream(source) as stream:
+        pages = PdfReader(stream).pages
+        total_pages = len(pages)
+        if max_pages:
+            total_pages = min(total_pages, max_pages)
+
+        parallel = (
+            workers > 1
+            and isinstance(source, (str, os.PathLike))
+            and total_pages >= min_parallel_pages
+            and _can_use_process_pool()
+        )
+
+        if not parallel:
+            for page_index in range(total_pages):
+                yield page_index + 1, _page_text(pages[page_index], page_index + 1)
+            return
+
+    range_size = -(-total_pages // workers)  # divisão com arredondamento para cima
+    page_ranges = [
+        (start, min(start + range_size, total_pages))
+        for start in range(0, total_pages, range_size)
+    ]
+    logger.info(
+        f"Extraindo {total_pages} páginas em {len(page_ranges)} processos paralelos"
+    )
+
+    executor = _get_executor(workers)
+    futures = []
+    try:
+        futures = [
+            executor.submit(_extract_page_range, source, start, stop)
+            for start, stop in page_ranges
+        ]
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        _discard_executor(executor)
+        raise
+    finally:
+        # Se o consumidor parar antes (limite de caracteres), descarta o resto;
+        # o pool continua vivo para as próximas extrações
+        for future in futures:
+            future.cancel()
+
+
+def extract_text_from_pdf(
+    source, max_pages: int = None, max_chars: int = None, workers: int = None
+) -> str:
     """
-    Extrai texto de um arquivo PDF a partir de bytes.
+    Extrai texto de um arquivo PDF.
 
     Args:
-        pdf_content: Conteúdo binário do PDF
+        source: Caminho do arquivo (lido via mmap), bytes ou objeto de arquivo
+        max_pages: Limite de páginas (padrão: settings.PDF_EXTRACT_MAX_PAGES)
+        max_chars: Limite de caracteres (padrão: settings.PDF_EXTRACT_MAX_CHARS)
+        workers: Processos para extração paralela (padrão: settings.PDF_EXTRACT_WORKERS)
 
     Returns:
         Texto extraído do PDF
@@ -19,29 +172,38 @@ def extract_text_from_pdf(pdf_content: bytes) -> str:
     Raises:
         Exception: Se houver erro ao processar o PDF
     """
+    max_pages = max_pages or getattr(settings, "PDF_EXTRACT_MAX_PAGES", None)
+    max_chars = max_chars or getattr(settings, "PDF_EXTRACT_MAX_CHARS", None)
+
     try:
-        # Criar um objeto de arquivo em memória a partir dos bytes
-        pdf_file = io.BytesIO(pdf_content)
-
-        # Criar um leitor de PDF
-        pdf_reader = PdfReader(pdf_file)
-
-        # Extrair texto de todas as páginas
-        text_content = []
-        for page_num, page in enumerate(pdf_reader.pages, start=1):
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content.append(page_text)
-                    logger.debug(
-                        f"Texto extraído da página {page_num}: {len(page_text)} caracteres"
+        buffer = io.StringIO()
+        total_chars = 0
+
+        pages = iter_pdf_pages(source, max_pages=max_pages, workers=workers)
+        with closing(pages):
+            for page_num, page_text in pages:
+                if not page_text:
+                    continue
+
+                separator = PAGE_SEPARATOR if total_chars else ""
+
+                # Orçamento de caracteres (contando o separador): interrompe a
+                # leitura das demais páginas, sem deixar um separador solto no fim
+                if max_chars and total_chars + len(separator) + len(page_text) >= max_chars:
+                    remaining = max_chars - total_chars - len(separator)
+                    if remaining > 0:
+                        buffer.write(separator)
+                        buffer.write(page_text[:remaining])
+                    logger.info(
+                        f"Limite de {max_chars} caracteres atingido na página {page_num}"
                     )
-            except Exception as e:
-                logger.warning(f"Erro ao extrair texto da página {page_num}: {e}")
-                continue
+                    break
+
+                buffer.write(separator)
+                buffer.write(page_text)
+                total_chars += len(separator) + len(page_text)
 
-        # Juntar todo o texto
-        full_text = "\n\n".join(text_content)
+        full_text = buffer.getvalue()
 
         if not full_text.strip():
             raise ValueError("Nenhum texto foi extraído do PDF")
@@ -1,3 +1,10 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\webhook\admin.py
 from django.contrib import admin
+from .models import WebhookEvent
 
-# Register your models here.
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "document_token", "event_type", "status", "attempts", "received_at")
+    list_filter = ("status", "event_type")
+    search_fields = ("document_token",)
@@ -0,0 +1,123 @@
+import json
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.core.management.base import BaseCommand
+
+from app.company.models import Company
+from app.document.models import Document
+from app.signer.models import Signer
+from app.webhook.views import ZapSignWebhookView
+
+SIGNER_STATUS_FLOW = ("pending", "link_opened", "signed")
+
+
+def load_recorded_burst(path) -> list:
+    """Aceita uma lista JSON de payloads ou um payload por linha (NDJSON)."""
+    with open(path, "r", encoding="utf-8") as burst_file:
+        content = burst_file.read().strip()
+    if content.startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def build_synthetic_burst(documents: int, signers: int) -> list:
+    """Cria documentos temporários e uma rajada de eventos de assinatura."""
+    company = Company.objects.create(name="Benchmark Webhook", apiToken="benchmark")
+    burst = []
+    for doc_index in range(documents):
+        document = Document.objects.create(
+            name=f"Benchmark {doc_index}",
+            company=company,
+            token=f"BENCH-DOC-{doc_index}",
+            status="pending",
+        )
+        signer_tokens = [f"BENCH-{doc_index}-SIGNER-{index}" for index in range(signers)]
+        Signer.objects.bulk_create(
+            Signer(
+                document=document,
+                name=f"Signatário {index}",
+                email=f"s{index}@benchmark.com",
+                token=token,
+                status="pending",
+            )
+            for index, token in enumerate(signer_tokens)
+        )
+
+        # ZapSign reenvia o estado completo dos signatários a cada evento
+        for step, signer_status in enumerate(SIGNER_STATUS_FLOW[1:], start=1):
+            burst.append(
+                {
+                    "token": document.token,
+                    "event_type": "signer_update",
+                    "status": "signed" if step == len(SIGNER_STATUS_FLOW) - 1 else "pending",
+                    "signers": [
+                        {"token": token, "status": signer_status}
+                        for token in signer_tokens
+                    ],
+                }
+            )
+            # Reentrega do mesmo evento (sem mudanças)
+            burst.append(burst[-1])
+    return burst
+
+
+class Command(BaseCommand):
+    help = (
+        "Reproduz uma rajada de webhooks da ZapSign contra o ZapSignWebhookView "
+        "e mede latência e consultas por evento. Tudo roda em uma transação "
+        "desfeita ao final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--file",
+            default=None,
+            help="Rajada gravada (lista JSON ou NDJSON de payloads).",
+        )
+        parser.add_argument("--documents", type=int, default=20)
+        parser.add_argument("--signers", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=1)
+
+    def handle(self, *args, **kwargs):
+        view = ZapSignWebhookView.as_view()
+        factory = RequestFactory()
+
+        with transaction.atomic():
+            if kwargs["file"]:
+                burst = load_recorded_burst(kwargs["file"])
+            else:
+                burst = build_synthetic_burst(kwargs["documents"], kwargs["signers"])
+
+            timings = []
+            query_counts = []
+            for _ in range(kwargs["repeat"]):
+                for payload in burst:
+                    request = factory.post(
+                        "/api/webhook/zapsign/",
+                        data=json.dumps(payload),
+                        content_type="application/json",
+                    )
+                    with CaptureQueriesContext(connection) as queries:
+                        started_at = time.perf_counter()
+                        view(request)
+                        timings.append((time.perf_counter() - started_at) * 1000)
+                    query_counts.append(len(queries.captured_queries))
+
+            transaction.set_rollback(True)
+
+        timings.sort()
+        total_seconds = sum(timings) / 1000
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(timings)} eventos em {total_seconds:.2f}s "
+                f"({len(timings) / total_seconds:.0f} eventos/s) | "
+                f"p50 {statistics.median(timings):.2f} ms | "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:.2f} ms | "
+                f"consultas/evento: média {statistics.mean(query_counts):.1f}, "
+                f"máx {max(query_counts)}"
+            )
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-18 10:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('document_token', models.CharField(max_length=255)),
+                ('event_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('payload', models.JSONField()),
+                ('payload_hash', models.CharField(max_length=64, unique=True)),
+                ('event_at', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('pending', 'Pendente'), ('processed', 'Processado'), ('stale', 'Fora de ordem'), ('ignored', 'Ignorado'), ('failed', 'Falhou')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['document_token', 'status', 'id'], name='webhook_event_token_status_idx'), models.Index(fields=['status', 'received_at'], name='webhook_event_status_idx')],
+            },
+        ),
+    ]
@@ -1,3 +1,49 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\webhook\models.py
 from django.db import models
 
-# Create your models here.
+
+class WebhookEvent(models.Model):
+    """
+    Fila durável (outbox) de eventos de webhook da ZapSign. O endpoint apenas
+    grava o evento e responde; os workers processam os eventos de cada
+    documento na ordem de chegada.
+    """
+
+    PENDING = "pending"
+    PROCESSED = "processed"
+    STALE = "stale"  # evento mais antigo que um já aplicado (fora de ordem)
+    IGNORED = "ignored"  # documento não existe localmente
+    FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (PENDING, "Pendente"),
+        (PROCESSED, "Processado"),
+        (STALE, "Fora de ordem"),
+        (IGNORED, "Ignorado"),
+        (FAILED, "Falhou"),
+    ]
+
+    document_token = models.CharField(max_length=255)
+    event_type = models.CharField(max_length=100, null=True, blank=True)
+    payload = models.JSONField()
+    # SHA-256 do payload: reenvios idênticos da ZapSign são descartados
+    payload_hash = models.CharField(max_length=64, unique=True)
+    # Momento do evento informado pela ZapSign (quando presente no payload)
+    event_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["document_token", "status", "id"],
+                name="webhook_event_token_status_idx",
+            ),
+            models.Index(fields=["status", "received_at"], name="webhook_event_status_idx"),
+        ]
+
+    def __str__(self):
+        return f"Webhook {self.event_type or '-'} {self.document_token} ({self.status})"
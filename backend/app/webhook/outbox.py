@@ -0,0 +1,139 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\webhook\outbox.py
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from app.webhook.models import WebhookEvent
+from app.webhook.processing import apply_webhook_payload
+
+logger = logging.getLogger(__name__)
+
+# Momento do evento (detecção de fora de ordem): o webhook da ZapSign envia o
+# detalhe do documento, com "last_update_at" em ISO 8601 (ex:
+# "2025-01-02T10:00:00.123456Z"). Payloads sem o campo não são verificados.
+EVENT_TIMESTAMP_FIELD = "last_update_at"
+
+
+def hash_payload(payload: dict) -> str:
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _event_timestamp(payload: dict):
+    value = payload.get(EVENT_TIMESTAMP_FIELD)
+    if not isinstance(value, str):
+        return None
+    parsed = parse_datetime(value)
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+# ========================================================================
+# Recebimento
+# ========================================================================
+def enqueue_webhook_event(payload: dict) -> tuple:
+    """
+    Grava o evento na fila. Retorna (evento, criado); criado=False indica um
+    reenvio idêntico já recebido (duplicado), que não é processado de novo.
+    """
+    payload_hash = hash_payload(payload)
+    try:
+        with transaction.atomic():
+            event = WebhookEvent.objects.create(
+                document_token=payload["token"],
+                event_type=payload.get("event_type"),
+                payload=payload,
+                payload_hash=payload_hash,
+                event_at=_event_timestamp(payload),
+            )
+        return event, True
+    except IntegrityError:
+        return WebhookEvent.objects.get(payload_hash=payload_hash), False
+
+
+# ========================================================================
+# Processamento (workers)
+# ========================================================================
+def _is_out_of_order(event) -> bool:
+    """Evento com momento anterior ao último já aplicado para o mesmo documento."""
+    if event.event_at is None:
+        return False
+    latest_applied = WebhookEvent.objects.filter(
+        document_token=event.document_token,
+        status=WebhookEvent.PROCESSED,
+        event_at__isnull=False,
+    ).aggregate(latest=Max("event_at"))["latest"]
+    return latest_applied is not None and event.event_at < latest_applied
+
+
+def process_event(event) -> str:
+    """Aplica um evento e grava o resultado (status final) na mesma transação."""
+    with transaction.atomic():
+        if _is_out_of_order(event):
+            logger.info(
+                f"[Webhook] Evento {event.id} de {event.document_token} fora de ordem; descartado."
+            )
+            event.status = WebhookEvent.STALE
+        else:
+            result = apply_webhook_payload(event.payload)
+            event.status = (
+                WebhookEvent.PROCESSED if result["found"] else WebhookEvent.IGNORED
+            )
+
+        event.attempts += 1
+        event.processed_at = timezone.now()
+        event.last_error = None
+        event.save(update_fields=["status", "attempts", "processed_at", "last_error"])
+    return event.status
+
+
+def process_pending_events(document_token: str, heartbeat=None) -> dict:
+    """
+    Processa, em ordem de chegada, os eventos pendentes de um documento.
+    Uma falha interrompe o processamento dos eventos seguintes (a ordem é
+    preservada); o evento é tentado de novo até WEBHOOK_EVENT_MAX_ATTEMPTS.
+    `heartbeat` é chamado antes de cada evento (renovação do lock do worker).
+    """
+    max_attempts = getattr(settings, "WEBHOOK_EVENT_MAX_ATTEMPTS", 5)
+    summary = {"processed": 0, "stale": 0, "ignored": 0, "failed": 0, "blocked": False}
+
+    while True:
+        event = (
+            WebhookEvent.objects.filter(
+                document_token=document_token, status=WebhookEvent.PENDING
+            )
+            .order_by("id")
+            .first()
+        )
+        if event is None:
+            return summary
+
+        if heartbeat is not None:
+            heartbeat()
+
+        try:
+            status = process_event(event)
+        except Exception as e:
+            event.attempts += 1
+            event.last_error = str(e)
+            if event.attempts >= max_attempts:
+                event.status = WebhookEvent.FAILED
+                summary["failed"] += 1
+            event.save(update_fields=["status", "attempts", "last_error"])
+            logger.error(
+                f"[Webhook] Falha ao processar evento {event.id} "
+                f"(tentativa {event.attempts}): {e}"
+            )
+            if event.status == WebhookEvent.PENDING:
+                summary["blocked"] = True
+                return summary
+            continue
+
+        summary[status] += 1
@@ -0,0 +1,101 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\webhook\processing.py
+import logging
+
+from django.db import transaction
+
+from app.automations.signals import track_saved_statuses
+from app.document.models import Document
+from app.document.status_sync import apply_remote_state, broadcast_document_changes
+from app.signer.models import Signer
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_UPDATE_FIELDS = ["status", "signed_file_url", "signed_at", "last_updated_at"]
+
+
+def _diff_signers(document, remote_signers) -> list:
+    """
+    Carrega em uma consulta os signatários citados no payload e retorna os
+    que tiveram o status alterado (já atualizados em memória).
+    """
+    remote_statuses = {
+        remote_signer.get("token"): remote_signer.get("status")
+        for remote_signer in remote_signers
+        if remote_signer.get("token") and remote_signer.get("status")
+    }
+    if not remote_statuses:
+        return []
+
+    changed_signers = []
+    local_signers = document.signers.filter(token__in=remote_statuses).only(
+        "id", "token", "status", "name", "document_id"
+    )
+    for local_signer in local_signers:
+        signer_status = remote_statuses[local_signer.token]
+        if local_signer.status != signer_status:
+            local_signer.status = signer_status
+            changed_signers.append(local_signer)
+            logger.info(
+                "[Webhook] Signatário %s atualizado para %s",
+                local_signer.name,
+                signer_status,
+            )
+    return changed_signers
+
+
+def apply_webhook_payload(payload: dict) -> dict:
+    """
+    Aplica um evento de webhook da ZapSign em uma única transação:
+    - o documento só é gravado se algum campo mudou;
+    - os signatários são carregados em uma consulta, comparados em memória
+      e gravados com um único bulk_update.
+    Retorna um resumo: documento encontrado, documento alterado e quantidade
+    de signatários alterados.
+    """
+    doc_token = payload.get("token")
+
+    with transaction.atomic():
+        # Lock da linha: eventos simultâneos do mesmo documento são serializados
+        document = (
+            Document.objects.select_for_update()
+            .only(
+                "id",
+                "token",
+                "status",
+                "signed_file_url",
+                "signed_at",
+                "created_at",
+                "last_updated_at",
+                "company_id",
+            )
+            .filter(token=doc_token)
+            .first()
+        )
+        if document is None:
+            return {"found": False, "document_changed": False, "signers_changed": 0}
+
+        document_changed = apply_remote_state(document, payload)
+        if document_changed:
+            logger.info(
+                "[Webhook] Documento %s atualizado: status=%s",
+                doc_token,
+                document.status,
+            )
+            document.save(update_fields=DOCUMENT_UPDATE_FIELDS)
+
+        changed_signers = _diff_signers(document, payload.get("signers") or [])
+        if changed_signers:
+            Signer.objects.bulk_update(changed_signers, ["status"])
+            # bulk_update não dispara signals: atualiza os rollups explicitamente
+            track_saved_statuses(changed_signers)
+
+        # Broadcast só após o commit: clientes nunca veem estado não gravado
+        if document_changed or changed_signers:
+            transaction.on_commit(lambda: broadcast_document_changes([document]))
+
+    return {
+        "found": True,
+        "document_changed": document_changed,
+        "signers_changed": len(changed_signers),
+        "document_id": document.id,
+    }
@@ -0,0 +1,84 @@
+# D:\Projetos\DesafioTecnico\ZapSign\backend\app\webhook\tasks.py
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from app.webhook.models import WebhookEvent
+from app.webhook.outbox import process_pending_events
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_LOCK_KEY = "webhook_events:lock:{document_token}"
+
+
+@shared_task(bind=True, max_retries=None, ignore_result=True)
+def process_webhook_events_task(self, document_token: str):
+    """
+    Processa os eventos pendentes de um documento. Um lock por token garante
+    um único worker por documento (ordem preservada) e é renovado a cada
+    evento. Se outro worker estiver com o lock, a task é reagendada com
+    espera crescente até WEBHOOK_EVENT_LOCK_RETRIES vezes; depois disso os
+    eventos ficam para a varredura periódica (sweep_webhook_events_task).
+    """
+    lock_key = WEBHOOK_LOCK_KEY.format(document_token=document_token)
+    lock_timeout = getattr(settings, "WEBHOOK_EVENT_LOCK_SECONDS", 60)
+    if not cache.add(lock_key, True, timeout=lock_timeout):
+        lock_retries = getattr(settings, "WEBHOOK_EVENT_LOCK_RETRIES", 10)
+        if self.request.retries >= lock_retries:
+            logger.info(
+                f"[Webhook] Documento {document_token} ainda em processamento após "
+                f"{lock_retries} tentativas; eventos ficam para a varredura."
+            )
+            return None
+        raise self.retry(countdown=min(2 ** self.request.retries, 30))
+
+    try:
+        summary = process_pending_events(
+            document_token,
+            heartbeat=lambda: cache.touch(lock_key, lock_timeout),
+        )
+    finally:
+        cache.delete(lock_key)
+
+    if summary["blocked"]:
+        # Evento com falha ainda dentro do limite de tentativas
+        raise self.retry(countdown=getattr(settings, "WEBHOOK_EVENT_RETRY_SECONDS", 30))
+    return summary
+
+
+@shared_task(ignore_result=True)
+def sweep_webhook_events_task():
+    """
+    Task periódica (Celery beat): reenfileira documentos com eventos pendentes
+    há mais tempo que o esperado (ex: worker reiniciado) e remove eventos
+    finalizados mais antigos que o período de retenção.
+    """
+    now = timezone.now()
+    stuck_before = now - timedelta(
+        seconds=getattr(settings, "WEBHOOK_EVENT_STUCK_SECONDS", 60)
+    )
+    stuck_tokens = list(
+        WebhookEvent.objects.filter(
+            status=WebhookEvent.PENDING, received_at__lt=stuck_before
+        )
+        .values_list("document_token", flat=True)
+        .distinct()
+    )
+    for document_token in stuck_tokens:
+        process_webhook_events_task.delay(document_token)
+
+    retention_days = getattr(settings, "WEBHOOK_EVENT_RETENTION_DAYS", 7)
+    deleted, _ = (
+        WebhookEvent.objects.exclude(status=WebhookEvent.PENDING)
+        .filter(received_at__lt=now - timedelta(days=retention_days))
+        .delete()
+    )
+    if stuck_tokens or deleted:
+        logger.info(
+            f"[Webhook] {len(stuck_tokens)} documentos reenfileirados, "
+            f"{deleted} eventos antigos removidos"
+        )
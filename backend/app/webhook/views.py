@@ -1,14 +1,18 @@
 import json
 import logging
 
+from django.conf import settings
+from django.db import transaction
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from rest_framework.exceptions import ParseError
 from rest_framework import serializers
 
-from app.document.models import Document
-from app.signer.models import Signer
+from app.webhook.outbox import enqueue_webhook_event
+from app.webhook.processing import apply_webhook_payload
+from app.webhook.tasks import process_webhook_events_task
 
 from drf_spectacular.utils import extend_schema, OpenApiResponse, inline_serializer
 
@@ -35,7 +39,8 @@ logger = logging.getLogger(__name__)
         },
     ),
     responses={
-        200: OpenApiResponse(description="Evento processado com sucesso."),
+        200: OpenApiResponse(description="Evento processado com sucesso (ou duplicado)."),
+        202: OpenApiResponse(description="Evento enfileirado (ZAPSIGN_WEBHOOK_ASYNC)."),
         400: OpenApiResponse(description="Payload inválido."),
         500: OpenApiResponse(description="Erro interno."),
     },
@@ -61,6 +66,9 @@ class ZapSignWebhookView(APIView):
             )
             raise ParseError("Payload não é um JSON válido")
 
+        if not isinstance(payload, dict):
+            raise ParseError("Payload deve ser um objeto JSON")
+
         doc_token = payload.get("token")
         event_type = payload.get("event_type")
 
@@ -74,57 +82,29 @@ class ZapSignWebhookView(APIView):
             return Response({"error": "Token ausente"}, status=400)
 
         # =========================================================
-        # 2. Atualizar Documento
+        # 2a. Modo assíncrono: grava na fila e responde imediatamente
         # =========================================================
-        try:
-            document = Document.objects.get(token=doc_token)
-        except Document.DoesNotExist:
+        if getattr(settings, "ZAPSIGN_WEBHOOK_ASYNC", False):
+            event, created = enqueue_webhook_event(payload)
+            if not created:
+                logger.info("[Webhook] Evento duplicado ignorado (%s)", event.id)
+                return Response({"duplicate": True, "event_id": event.id}, status=200)
+
+            transaction.on_commit(
+                lambda: process_webhook_events_task.delay(doc_token)
+            )
+            return Response({"queued": True, "event_id": event.id}, status=202)
+
+        # =========================================================
+        # 2b. Modo síncrono: atualiza Documento e Signatários (uma transação)
+        # =========================================================
+        result = apply_webhook_payload(payload)
+
+        if not result["found"]:
             logger.warning(
                 "[Webhook] Documento %s não encontrado localmente",
                 doc_token,
             )
             return Response({"ignored": "Document not found"}, status=200)
 
-        new_status = payload.get("status")
-        signed_file_url = payload.get("signed_file")
-
-        if new_status and document.status != new_status:
-            document.status = new_status
-            logger.info(
-                "[Webhook] Status do documento atualizado para %s",
-                new_status,
-            )
-
-        if signed_file_url and document.signed_file_url != signed_file_url:
-            document.signed_file_url = signed_file_url
-            logger.info("[Webhook] URL do PDF assinado atualizada")
-
-        document.save()
-
-        # =========================================================
-        # 3. Atualizar Signatários
-        # =========================================================
-        remote_signers = payload.get("signers", [])
-
-        for r_signer in remote_signers:
-            signer_token = r_signer.get("token")
-            signer_status = r_signer.get("status")
-
-            if not signer_token:
-                continue
-
-            local_signer = Signer.objects.filter(
-                token=signer_token,
-                document=document,
-            ).first()
-
-            if local_signer and signer_status and local_signer.status != signer_status:
-                local_signer.status = signer_status
-                local_signer.save()
-                logger.info(
-                    "[Webhook] Signatário %s atualizado para %s",
-                    local_signer.name,
-                    signer_status,
-                )
-
         return Response({"success": True}, status=200)
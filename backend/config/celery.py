@@ -1,6 +1,8 @@
 # D:\Projetos\DesafioTecnico\ZapSign\backend\config\celery.py
 import os
+import time
 from celery import Celery
+from celery.signals import worker_process_init
 
 # Define o módulo de configurações padrão do Django para o programa 'celery'.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -17,6 +19,26 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
 
 
+@worker_process_init.connect
+def warm_up_ai_services(**kwargs):
+    # Cada processo filho constrói seus clientes de IA uma única vez, após o fork
+    from app.ai.ai_service import AIServiceRegistry
+
+    AIServiceRegistry.warm_up()
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     print(f"Request: {self.request!r}")
+
+
+# Tasks usadas por `manage.py benchmark_task_queues` (fila definida no envio)
+@app.task(ignore_result=True)
+def benchmark_busy_task(seconds):
+    time.sleep(seconds)
+
+
+@app.task
+def benchmark_ping_task(sent_at):
+    # Tempo entre o envio e o início da execução (espera na fila)
+    return time.time() - sent_at
@@ -67,6 +67,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "app.authapi.middleware.ApiKeyMiddleware",  # Disabled for JWT Migration
+    "app.core.middleware.tenant.TenantMiddleware",
 ]
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -154,7 +155,8 @@ STORAGES = {
 # ========================================================================
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWT com usuário, perfil e empresa em cache (request.tenant)
+        "app.authapi.authentication.TenantJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -162,15 +164,158 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# Paginação por cursor da listagem de documentos
+DOCUMENT_LIST_PAGE_SIZE = int(get_env("DOCUMENT_LIST_PAGE_SIZE", 50))
+DOCUMENT_LIST_MAX_PAGE_SIZE = int(get_env("DOCUMENT_LIST_MAX_PAGE_SIZE", 200))
+
+# Extração de texto de PDFs (0 = sem limite)
+PDF_EXTRACT_MAX_PAGES = int(get_env("PDF_EXTRACT_MAX_PAGES", 0))
+PDF_EXTRACT_MAX_CHARS = int(get_env("PDF_EXTRACT_MAX_CHARS", 0))
+# Processos para extrair páginas em paralelo (1 = sequencial). O pool é único
+# por processo (forkserver, nunca fork) e compartilhado pelas threads do
+# worker_io (--pool=threads); num worker prefork a extração é sequencial.
+PDF_EXTRACT_WORKERS = int(get_env("PDF_EXTRACT_WORKERS", min(os.cpu_count() or 1, 4)))
+PDF_EXTRACT_PARALLEL_MIN_PAGES = int(get_env("PDF_EXTRACT_PARALLEL_MIN_PAGES", 50))
+
+# Tamanho do bloco lido do banco nos relatórios em streaming (NDJSON/CSV)
+REPORT_STREAM_CHUNK_SIZE = int(get_env("REPORT_STREAM_CHUNK_SIZE", 500))
+
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Caches em memória por processo (API Keys, tenant, clientes ZapSign): intervalo
+# máximo entre consultas ao contador de invalidação no Redis
+LOCAL_CACHE_GENERATION_CHECK_SECONDS = float(
+    get_env("LOCAL_CACHE_GENERATION_CHECK_SECONDS", 1)
+)
+
+# Cache em memória (por processo) da validação de API Keys. Criar ou remover
+# uma chave invalida o cache de todos os processos (contador no cache Redis).
+API_KEY_CACHE_TTL_SECONDS = int(get_env("API_KEY_CACHE_TTL_SECONDS", 300))
+# Chaves inválidas ficam menos tempo para não atrasar uma chave recém-criada
+API_KEY_NEGATIVE_CACHE_TTL_SECONDS = int(
+    get_env("API_KEY_NEGATIVE_CACHE_TTL_SECONDS", 30)
+)
+API_KEY_CACHE_MAX_ENTRIES = int(get_env("API_KEY_CACHE_MAX_ENTRIES", 1024))
+
+# Contexto do tenant (usuário -> perfil -> empresa) por user_id do JWT, em
+# memória; alterações em usuário, perfil ou empresa invalidam o cache.
+TENANT_CACHE_TTL_SECONDS = int(get_env("TENANT_CACHE_TTL_SECONDS", 60))
+TENANT_CACHE_MAX_ENTRIES = int(get_env("TENANT_CACHE_MAX_ENTRIES", 4096))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 ZAPSIGN_API_TOKEN = os.getenv("ZAPSIGN_API_TOKEN")
 
+# Pool de conexões HTTP (keep-alive) usado pelo ZapSignService
+ZAPSIGN_HTTP_POOL_SIZE = int(get_env("ZAPSIGN_HTTP_POOL_SIZE", 10))
+# Sessões (uma por API Token) mantidas por processo; as menos usadas são fechadas
+ZAPSIGN_HTTP_MAX_SESSIONS = int(get_env("ZAPSIGN_HTTP_MAX_SESSIONS", 256))
+ZAPSIGN_HTTP_CONNECT_TIMEOUT = float(get_env("ZAPSIGN_HTTP_CONNECT_TIMEOUT", 5))
+ZAPSIGN_HTTP_READ_TIMEOUT = float(get_env("ZAPSIGN_HTTP_READ_TIMEOUT", 15))
+# Retry de transporte (apenas verbos idempotentes) com backoff exponencial
+ZAPSIGN_HTTP_RETRIES = int(get_env("ZAPSIGN_HTTP_RETRIES", 3))
+ZAPSIGN_HTTP_BACKOFF_FACTOR = float(get_env("ZAPSIGN_HTTP_BACKOFF_FACTOR", 0.5))
+# Cliente da ZapSign por empresa (token já resolvido), reutilizado entre requisições
+ZAPSIGN_CLIENT_CACHE_TTL_SECONDS = int(get_env("ZAPSIGN_CLIENT_CACHE_TTL_SECONDS", 300))
+ZAPSIGN_CLIENT_CACHE_MAX_ENTRIES = int(get_env("ZAPSIGN_CLIENT_CACHE_MAX_ENTRIES", 1024))
+# Cliente assíncrono (AsyncZapSignService): conexões e chamadas simultâneas
+ZAPSIGN_ASYNC_MAX_CONNECTIONS = int(get_env("ZAPSIGN_ASYNC_MAX_CONNECTIONS", 50))
+ZAPSIGN_ASYNC_CONCURRENCY = int(get_env("ZAPSIGN_ASYNC_CONCURRENCY", 20))
+
+# ========================================================================
+# DOCUMENT TEXT STORE (texto extraído endereçado pelo SHA-256 do PDF)
+# ========================================================================
+DOCUMENT_TEXT_STORE_PATH = os.getenv(
+    "DOCUMENT_TEXT_STORE_PATH", str(BASE_DIR / "storage" / "texts")
+)
+
+
+# ========================================================================
+# CACHE (Redis compartilhado entre web e workers; memória local nos testes)
+# ========================================================================
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_CACHE_URL", "redis://redis:6379/1"),
+    }
+}
+
+if "pytest" in sys.modules:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# ========================================================================
+# CACHE DE ANÁLISES DE IA
+# ========================================================================
+AI_ANALYSIS_CACHE_ENABLED = get_env("AI_ANALYSIS_CACHE_ENABLED", "true") == "true"
+AI_ANALYSIS_CACHE_TTL_SECONDS = int(
+    get_env("AI_ANALYSIS_CACHE_TTL_SECONDS", 7 * 24 * 3600)
+)
+AI_ANALYSIS_CACHE_MAX_ENTRIES = int(get_env("AI_ANALYSIS_CACHE_MAX_ENTRIES", 10000))
+# Intervalo mínimo entre evicções (expiradas + LRU); 0 = a cada nova entrada
+AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS = int(
+    get_env("AI_ANALYSIS_CACHE_EVICT_INTERVAL_SECONDS", 300)
+)
+# Vazio = versão derivada do conteúdo dos templates de prompt em app/ai/
+AI_PROMPT_TEMPLATE_VERSION = get_env("AI_PROMPT_TEMPLATE_VERSION")
+
+# Análise em blocos (map-reduce) para documentos acima do orçamento de tokens
+AI_CHUNKING_ENABLED = get_env("AI_CHUNKING_ENABLED", "true") == "true"
+AI_CHUNK_MAX_TOKENS = int(get_env("AI_CHUNK_MAX_TOKENS", 30000))
+AI_CHUNK_CONCURRENCY = int(get_env("AI_CHUNK_CONCURRENCY", 4))
+AI_CHARS_PER_TOKEN = float(get_env("AI_CHARS_PER_TOKEN", 4))
+AI_OPENAI_MAX_OUTPUT_TOKENS = int(get_env("AI_OPENAI_MAX_OUTPUT_TOKENS", 2000))
+# Streaming da resposta da IA: resultados parciais enviados pelo WebSocket
+# do documento, agrupados em no máximo uma mensagem a cada intervalo
+AI_STREAMING_ENABLED = get_env("AI_STREAMING_ENABLED", "true") == "true"
+AI_STREAM_BROADCAST_INTERVAL_MS = int(get_env("AI_STREAM_BROADCAST_INTERVAL_MS", 100))
+# Modelos pré-carregados em cada processo worker do Celery (separados por vírgula)
+AI_WARMUP_MODELS = [
+    model.strip()
+    for model in get_env("AI_WARMUP_MODELS", "gemini").split(",")
+    if model.strip()
+]
+
+# Rate limit (token bucket) das chamadas de IA, por provedor e por empresa.
+# rpm = requisições/minuto, tpm = tokens/minuto; 0 desativa o orçamento.
+AI_RATE_LIMIT_ENABLED = get_env("AI_RATE_LIMIT_ENABLED", "true") == "true"
+AI_RATE_LIMITS = {
+    "gemini": {
+        "rpm": int(get_env("AI_GEMINI_RPM", 60)),
+        "tpm": int(get_env("AI_GEMINI_TPM", 1000000)),
+    },
+    "openai": {
+        "rpm": int(get_env("AI_OPENAI_RPM", 60)),
+        "tpm": int(get_env("AI_OPENAI_TPM", 200000)),
+    },
+}
+AI_COMPANY_RATE_LIMITS = {
+    "rpm": int(get_env("AI_COMPANY_RPM", 20)),
+    "tpm": int(get_env("AI_COMPANY_TPM", 300000)),
+}
+# Tokens de saída reservados por chamada ao estimar o custo da análise
+AI_RATE_LIMIT_OUTPUT_TOKENS = int(get_env("AI_RATE_LIMIT_OUTPUT_TOKENS", 2000))
+# Esperas até este limite são feitas no worker; acima, a task é reagendada
+AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS = float(
+    get_env("AI_RATE_LIMIT_MAX_INLINE_WAIT_SECONDS", 5)
+)
+AI_RATE_LIMIT_MAX_REQUEUES = int(get_env("AI_RATE_LIMIT_MAX_REQUEUES", 20))
+AI_RATE_LIMIT_JITTER_SECONDS = float(get_env("AI_RATE_LIMIT_JITTER_SECONDS", 5))
+AI_RATE_LIMIT_PROVIDER_BACKOFF_SECONDS = float(
+    get_env("AI_RATE_LIMIT_PROVIDER_BACKOFF_SECONDS", 30)
+)
+# Tempo máximo em que uma execução de análise fica registrada como em
+# andamento (pedidos repetidos são anexados a ela durante esse período)
+AI_ANALYSIS_INFLIGHT_TTL_SECONDS = int(
+    get_env("AI_ANALYSIS_INFLIGHT_TTL_SECONDS", 1800)
+)
+
 
 # ========================================================================
 # CELERY CONFIGURATION
@@ -183,6 +328,92 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "America/Sao_Paulo"  # Ou o fuso horário do seu projeto
 CELERY_TASK_TRACK_STARTED = True  # Para rastrear o status 'STARTED' das tarefas
 
+# ========================================================================
+# FILAS, ROTEAMENTO E PRIORIDADES DO CELERY
+# ========================================================================
+# ai: análises lentas (LLM) | zapsign_io: chamadas HTTP e ingestão |
+# realtime: tarefas curtas (eventos de webhook) | celery: demais tarefas.
+# Cada fila tem seus próprios workers (docker-compose), então uma fila de
+# análises cheia não atrasa as tarefas rápidas.
+CELERY_TASK_DEFAULT_QUEUE = "celery"
+CELERY_TASK_CREATE_MISSING_QUEUES = True
+CELERY_TASK_ROUTES = {
+    "app.ai.tasks.*": {"queue": "ai"},
+    "app.document.tasks.fetch_document_pdf_task": {"queue": "zapsign_io"},
+    "app.document.tasks.extract_document_text_task": {"queue": "zapsign_io"},
+    "app.document.tasks.reconcile_document_statuses_task": {"queue": "zapsign_io"},
+    "app.webhook.tasks.*": {"queue": "realtime"},
+}
+
+# Prioridades no broker Redis: 0 é a MAIS alta. Criações interativas (usuário
+# aguardando na tela) passam à frente de reanálises em lote (n8n).
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+TASK_PRIORITY_INTERACTIVE = int(get_env("TASK_PRIORITY_INTERACTIVE", 2))
+TASK_PRIORITY_BULK = int(get_env("TASK_PRIORITY_BULK", 7))
+CELERY_TASK_DEFAULT_PRIORITY = int(get_env("TASK_PRIORITY_DEFAULT", 5))
+# Prioridade fixa por empresa, ex: "12:0,15:1" (id da empresa:prioridade)
+TASK_PRIORITY_COMPANY_OVERRIDES = {
+    int(company_id): int(priority)
+    for company_id, priority in (
+        item.split(":")
+        for item in get_env("TASK_PRIORITY_COMPANY_OVERRIDES", "").split(",")
+        if item.strip()
+    )
+}
+
+# Padrão para as filas rápidas; o worker da fila "ai" usa
+# --prefetch-multiplier=1 (ver docker-compose), reservando uma task por vez.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(
+    get_env("CELERY_WORKER_PREFETCH_MULTIPLIER", 4)
+)
+# Tasks com acks_late (análise de IA) voltam para a fila se o worker morrer
+CELERY_TASK_REJECT_ON_WORKER_LOST = True
+
+# ========================================================================
+# RECONCILIAÇÃO PERIÓDICA DE STATUS COM A ZAPSIGN (Celery beat)
+# ========================================================================
+ZAPSIGN_RECONCILE_INTERVAL_SECONDS = int(
+    get_env("ZAPSIGN_RECONCILE_INTERVAL_SECONDS", 300)
+)
+ZAPSIGN_RECONCILE_BATCH_SIZE = int(get_env("ZAPSIGN_RECONCILE_BATCH_SIZE", 200))
+# None: o detalhe do documento serve sempre o status local.
+# Número de segundos: consulta a ZapSign se o status local for mais antigo.
+ZAPSIGN_STATUS_STALENESS_SECONDS = (
+    int(get_env("ZAPSIGN_STATUS_STALENESS_SECONDS"))
+    if get_env("ZAPSIGN_STATUS_STALENESS_SECONDS")
+    else None
+)
+
+# ========================================================================
+# FILA DE WEBHOOKS DA ZAPSIGN (outbox no banco)
+# ========================================================================
+# true: o endpoint grava o evento e responde 202; workers da fila "realtime"
+# aplicam os eventos em ordem por documento.
+ZAPSIGN_WEBHOOK_ASYNC = get_env("ZAPSIGN_WEBHOOK_ASYNC", "false") == "true"
+WEBHOOK_EVENT_MAX_ATTEMPTS = int(get_env("WEBHOOK_EVENT_MAX_ATTEMPTS", 5))
+WEBHOOK_EVENT_RETRY_SECONDS = int(get_env("WEBHOOK_EVENT_RETRY_SECONDS", 30))
+# Lock por documento (renovado a cada evento) e reagendamentos enquanto ocupado
+WEBHOOK_EVENT_LOCK_SECONDS = int(get_env("WEBHOOK_EVENT_LOCK_SECONDS", 60))
+WEBHOOK_EVENT_LOCK_RETRIES = int(get_env("WEBHOOK_EVENT_LOCK_RETRIES", 10))
+# Pendentes há mais tempo que isso são reenfileirados pela varredura periódica
+WEBHOOK_EVENT_STUCK_SECONDS = int(get_env("WEBHOOK_EVENT_STUCK_SECONDS", 60))
+WEBHOOK_EVENT_RETENTION_DAYS = int(get_env("WEBHOOK_EVENT_RETENTION_DAYS", 7))
+
+CELERY_BEAT_SCHEDULE = {
+    "reconcile-document-statuses": {
+        "task": "app.document.tasks.reconcile_document_statuses_task",
+        "schedule": ZAPSIGN_RECONCILE_INTERVAL_SECONDS,
+    },
+    "sweep-webhook-events": {
+        "task": "app.webhook.tasks.sweep_webhook_events_task",
+        "schedule": WEBHOOK_EVENT_STUCK_SECONDS,
+    },
+}
+
 # ========================================================================
 # LOGGING
 # ========================================================================
@@ -195,17 +426,47 @@ LOGGING = {
             "style": "{",
         },
     },
+    "filters": {
+        # Eventos por requisição abaixo de WARNING são amostrados
+        "request_sampling": {
+            "()": "app.core.request_logging.SamplingFilter",
+            "rate": float(get_env("REQUEST_LOG_SAMPLE_RATE", 0.01)),
+        },
+    },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "formatter": "verbose",
         },
+        # Escrita em thread separada: a requisição só enfileira o registro
+        "request_console": {
+            "class": "app.core.request_logging.AsyncStreamHandler",
+            "formatter": "verbose",
+            "filters": ["request_sampling"],
+            "queue_size": int(get_env("REQUEST_LOG_QUEUE_SIZE", 10000)),
+        },
+        # Mesma escrita em thread, sem amostragem
+        "security_console": {
+            "class": "app.core.request_logging.AsyncStreamHandler",
+            "formatter": "verbose",
+            "queue_size": int(get_env("REQUEST_LOG_QUEUE_SIZE", 10000)),
+        },
     },
     "loggers": {
         "django": {
             "handlers": ["console"],
             "level": "INFO",
         },
+        "app.request": {
+            "handlers": ["request_console"],
+            "level": get_env("REQUEST_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+        "app.security": {
+            "handlers": ["security_console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
 
@@ -261,6 +522,12 @@ if "pytest" in sys.argv:
 # ========================================================================
 # DRF SPECTACULAR CONFIGURATION (Para suportar JWT)
 # ========================================================================
+# Versão do código (ex: SHA do commit no deploy). Vazio = derivada do conteúdo
+# dos arquivos .py; o schema OpenAPI em cache é regenerado quando ela muda.
+APP_CODE_VERSION = get_env("APP_CODE_VERSION")
+# Arquivo gerado por `manage.py generate_openapi_schema` (build/deploy)
+OPENAPI_SCHEMA_FILE = get_env("OPENAPI_SCHEMA_FILE", str(BASE_DIR / "openapi-schema.json"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "ZapSign Technical Challenge API",
     "DESCRIPTION": "Documentação interativa da API para o desafio técnico.",
@@ -1,6 +1,8 @@
 from django.urls import path, include
 from django.contrib import admin
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
+
+from app.core.openapi import CachedSpectacularAPIView
 
 
 urlpatterns = [
@@ -11,11 +13,11 @@ urlpatterns = [
     path("auth/", include("app.authapi.urls")),
     path("api/automations/", include("app.automations.urls")),
     path("webhook/", include("app.webhook.urls")),
-    # ROTAS DE DOCUMENTAÇÃO DINÂMICA (SWAGGER/OPENAPI)
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    # ROTAS DE DOCUMENTAÇÃO (SWAGGER/OPENAPI): schema gerado uma vez e cacheado
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema.json",
-        SpectacularAPIView.as_view(),
+        CachedSpectacularAPIView.as_view(),
         {"format": "json"},
         name="schema-json",
     ),
@@ -51,7 +51,7 @@ export class HeaderComponent implements OnInit, OnDestroy {
         // Polling para o contador de documentos pendentes (a cada 30 segundos)
         this.pendingDocumentsCount$ = interval(30000).pipe(
             startWith(0), // Inicia imediatamente
-            switchMap(() => this.documentService.getAllDocuments().pipe(
+            switchMap(() => this.documentService.getAllDocuments({ status: 'pending,new', fields: 'id,status' }).pipe(
                 map((documents: Document[]) => {
                     // Conta documentos com status 'pending' ou 'new'
                     return documents.filter(doc => doc.status === 'pending' || doc.status === 'new').length;
@@ -69,7 +69,7 @@ describe('NotificationPanelComponent', () => {
     });
 
     it('2. should call documentService.getAllDocuments on init', () => {
-        expect(documentServiceMock.getAllDocuments).toHaveBeenCalled();
+        expect(documentServiceMock.getAllDocuments).toHaveBeenCalledWith({ status: 'pending,new', fields: 'id,status,created_at' });
         expect(component.loading).toBe(false);
         expect(component.error).toBeNull();
     });
@@ -34,7 +34,7 @@ export class NotificationPanelComponent implements OnInit {
 
   loadRiskSummary(): void {
     this.loading = true;
-    this.documentService.getAllDocuments().subscribe({
+    this.documentService.getAllDocuments({ status: 'pending,new', fields: 'id,status,created_at' }).subscribe({
       next: (data) => {
         const now = new Date();
         const pendingDocs = data.filter(doc => doc.status === 'pending' || doc.status === 'new');
@@ -27,4 +27,22 @@ export interface Document {
     ai_analysis?: DocumentAnalysis; // Análise de IA
     url_pdf?: string; // Adicionado para a criação de documentos
     signed_file_url?: string; // <--- ADICIONADO: URL do PDF assinado (S3)
-}
\ No newline at end of file
+}
+
+// Página da listagem de documentos (paginação por cursor do backend)
+export interface DocumentPage {
+    next: string | null;
+    previous: string | null;
+    results: Document[];
+}
+
+export interface DocumentListParams {
+    cursor?: string;
+    page_size?: number;
+    status?: string;
+    ai_status?: string;
+    created_after?: string;
+    created_before?: string;
+    externalID?: string;
+    fields?: string;
+}
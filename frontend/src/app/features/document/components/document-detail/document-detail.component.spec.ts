@@ -170,4 +170,15 @@ describe('DocumentDetailComponent', () => {
         expect(component.document!.ai_analysis!.status).toBe('processing');
         expect(component.document!.ai_analysis!.summary).toBe('Simulated update');
     });
+
+    it('should apply partial analysis streamed over WS', () => {
+        component.document = { ...mockDocument, ai_analysis: { ...mockAnalysisPending } } as Document;
+        const wsData = { status: 'streaming', partial: { summary: 'Resumo parc', insights: ['Multa'] } };
+
+        (component as any).updateAnalysisPartialFromWs(wsData);
+
+        expect(component.document!.ai_analysis!.status).toBe('processing');
+        expect(component.document!.ai_analysis!.summary).toBe('Resumo parc');
+        expect(component.document!.ai_analysis!.insights).toEqual(['Multa']);
+    });
 });
\ No newline at end of file
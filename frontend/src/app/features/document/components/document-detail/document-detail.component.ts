@@ -130,6 +130,8 @@ export class DocumentDetailComponent implements OnInit, OnDestroy {
           this.updateDocumentFromWs(message.data);
           this.isReanalyzeProcessing = false;
           this.closeWebSocket();
+        } else if (message.event_type === 'analysis_partial') {
+          this.updateAnalysisPartialFromWs(message.data);
         } else if (message.event_type === 'analysis_status_update') {
           this.updateAnalysisStatusFromWs(message.data);
 
@@ -172,6 +174,19 @@ export class DocumentDetailComponent implements OnInit, OnDestroy {
     }
   }
 
+  // Resultado parcial (streaming da IA): resumo e insights chegam em lotes
+  updateAnalysisPartialFromWs(data: any): void {
+    if (this.document && data.partial) {
+      if (!this.document.ai_analysis) {
+        this.document.ai_analysis = {} as DocumentAnalysis;
+      }
+      this.document.ai_analysis.status = 'processing';
+      this.document.ai_analysis.summary = data.partial.summary ?? this.document.ai_analysis.summary;
+      this.document.ai_analysis.insights = data.partial.insights ?? this.document.ai_analysis.insights;
+      this.document.ai_analysis.missing_topics = data.partial.missing_topics ?? this.document.ai_analysis.missing_topics;
+    }
+  }
+
 
   updateDocumentFromWs(data: any): void {
     // Recarrega o documento completo para obter todos os dados da análise
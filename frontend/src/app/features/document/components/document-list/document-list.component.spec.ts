@@ -35,7 +35,8 @@ describe('DocumentListComponent', () => {
 
     beforeEach(async () => {
         documentServiceMock = {
-            getAllDocuments: jest.fn().mockReturnValue(of(mockDocuments)),
+            getDocumentsPage: jest.fn().mockReturnValue(of({ next: null, previous: null, results: mockDocuments })),
+            nextCursor: jest.fn().mockReturnValue(null),
             deleteDocument: jest.fn().mockReturnValue(of({})),
             syncDocumentStatus: jest.fn().mockReturnValue(of({ new_status: 'signed', message: 'synced' })),
         };
@@ -84,7 +85,10 @@ describe('DocumentListComponent', () => {
         fixture.detectChanges();
         expect(component).toBeTruthy();
         expect(companyServiceMock.getAllCompanies).toHaveBeenCalled();
-        expect(documentServiceMock.getAllDocuments).toHaveBeenCalled();
+        expect(documentServiceMock.getDocumentsPage).toHaveBeenCalledWith({
+            page_size: 50,
+            fields: 'id,name,company,status,token,created_at'
+        });
         expect(component.loading).toBe(false);
     });
 
@@ -103,7 +107,7 @@ describe('DocumentListComponent', () => {
     });
 
     it('4. should handle error when loading Documents', () => {
-        documentServiceMock.getAllDocuments.mockReturnValue(throwError(() => new Error('Doc Load Error')));
+        documentServiceMock.getDocumentsPage.mockReturnValue(throwError(() => new Error('Doc Load Error')));
         fixture.detectChanges();
         expect(component.error).toBe('Doc Load Error');
         expect(component.loading).toBe(false);
@@ -312,4 +316,34 @@ describe('DocumentListComponent', () => {
         expect(component.documents.length).toBe(3);
         expect(component.documents.some(d => d.id === 106)).toBe(false);
     });
+
+    // --- GRUPO 5: Paginação sob demanda ---
+
+    it('31. should load the next page only when loadMore is called', () => {
+        const nextPage = [
+            { id: 107, name: 'Aditivo C', company: 10, status: 'new', token: 'C-107', created_at: '2024-02-01T10:00:00Z' } as Document
+        ];
+        documentServiceMock.nextCursor.mockReturnValueOnce('cD0y').mockReturnValueOnce(null);
+        fixture.detectChanges();
+
+        expect(documentServiceMock.getDocumentsPage).toHaveBeenCalledTimes(1);
+        expect(component.nextCursor).toBe('cD0y');
+
+        documentServiceMock.getDocumentsPage.mockReturnValue(of({ next: null, previous: null, results: nextPage }));
+        component.loadMore();
+
+        expect(documentServiceMock.getDocumentsPage).toHaveBeenLastCalledWith({
+            page_size: 50,
+            fields: 'id,name,company,status,token,created_at',
+            cursor: 'cD0y'
+        });
+        expect(component.allDocuments.length).toBe(6);
+        expect(component.nextCursor).toBeNull();
+    });
+
+    it('32. should not request more pages after the last one', () => {
+        fixture.detectChanges();
+        component.loadMore();
+        expect(documentServiceMock.getDocumentsPage).toHaveBeenCalledTimes(1);
+    });
 });
\ No newline at end of file
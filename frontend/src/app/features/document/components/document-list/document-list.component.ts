@@ -25,7 +25,13 @@ export class DocumentListComponent implements OnInit, OnDestroy {
   documents: Document[] = [];
   companies: Company[] = [];
   loading = true;
+  loadingMore = false;
   error: string | null = null;
+  // Cursor da próxima página (null: todas as páginas já carregadas)
+  nextCursor: string | null = null;
+  // Apenas as colunas exibidas na tabela
+  private readonly listFields = 'id,name,company,status,token,created_at';
+  private readonly pageSize = 50;
   private ws: WebSocket | null = null;
   private pollingSubscription: Subscription | null = null;
 
@@ -57,9 +63,10 @@ export class DocumentListComponent implements OnInit, OnDestroy {
     this.companyService.getAllCompanies().subscribe({
       next: (companiesData) => {
         this.companies = companiesData;
-        this.documentService.getAllDocuments().subscribe({
-          next: (documentsData) => {
-            this.allDocuments = documentsData;
+        this.documentService.getDocumentsPage({ page_size: this.pageSize, fields: this.listFields }).subscribe({
+          next: (page) => {
+            this.allDocuments = page.results;
+            this.nextCursor = this.documentService.nextCursor(page);
             this.applyFilterAndSort();
             this.loading = false;
 
@@ -83,6 +90,34 @@ export class DocumentListComponent implements OnInit, OnDestroy {
     });
   }
 
+  // Carrega a próxima página (botão "Carregar mais")
+  loadMore(): void {
+    if (!this.nextCursor || this.loadingMore) {
+      return;
+    }
+    this.loadingMore = true;
+
+    this.documentService.getDocumentsPage({
+      page_size: this.pageSize,
+      fields: this.listFields,
+      cursor: this.nextCursor
+    }).subscribe({
+      next: (page) => {
+        // Documentos já recebidos via WebSocket não são duplicados
+        const loadedIds = new Set(this.allDocuments.map(d => d.id));
+        this.allDocuments = [...this.allDocuments, ...page.results.filter(d => !loadedIds.has(d.id))];
+        this.nextCursor = this.documentService.nextCursor(page);
+        this.applyFilterAndSort();
+        this.loadingMore = false;
+      },
+      error: (err) => {
+        this.error = err.message || 'Falha ao carregar mais documentos.';
+        this.loadingMore = false;
+        console.error('Erro ao carregar mais documentos:', err);
+      }
+    });
+  }
+
   // --- Lógica de Pesquisa e Ordenação ---
 
   applyFilterAndSort(): void {
@@ -74,7 +74,7 @@ describe('DocumentRiskManagementComponent', () => {
     });
 
     it('2. should call loadPendingDocuments on init', () => {
-        expect(documentServiceMock.getAllDocuments).toHaveBeenCalled();
+        expect(documentServiceMock.getAllDocuments).toHaveBeenCalledWith({ status: 'pending,new', fields: 'id,name,status,created_at' });
         expect(component.loading).toBe(false);
         expect(component.error).toBeNull();
     });
@@ -39,7 +39,7 @@ export class DocumentRiskManagementComponent implements OnInit {
     loadPendingDocuments(): void {
         this.loading = true;
         this.error = null;
-        this.documentService.getAllDocuments().subscribe({
+        this.documentService.getAllDocuments({ status: 'pending,new', fields: 'id,name,status,created_at' }).subscribe({
             next: (data) => {
                 const now = new Date();
                 this.allPendingDocuments = data
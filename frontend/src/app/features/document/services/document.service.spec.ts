@@ -140,6 +140,44 @@ describe('DocumentService', () => {
         });
     });
 
+    describe('getAllDocuments', () => {
+        it('should follow the next cursor until the last page', async () => {
+            const secondDocument = { ...mockDocument, id: 2 } as Document;
+            apiServiceMock.get
+                .mockReturnValueOnce(of({
+                    next: 'http://localhost:8000/api/document/?cursor=abc&page_size=200',
+                    previous: null,
+                    results: [mockDocument]
+                }))
+                .mockReturnValueOnce(of({ next: null, previous: null, results: [secondDocument] }));
+
+            const result = await firstValueFrom(service.getAllDocuments());
+
+            expect(result.map(document => document.id)).toEqual([1, 2]);
+            expect(apiServiceMock.get).toHaveBeenCalledTimes(2);
+            expect(apiServiceMock.get).toHaveBeenLastCalledWith(documentPath, { page_size: 200, cursor: 'abc' });
+        });
+
+        it('should keep filters and fields on every page', async () => {
+            apiServiceMock.get
+                .mockReturnValueOnce(of({ next: 'http://localhost:8000/api/document/?cursor=abc', previous: null, results: [] }))
+                .mockReturnValueOnce(of({ next: null, previous: null, results: [] }));
+
+            await firstValueFrom(service.getAllDocuments({ status: 'pending,new', fields: 'id,status' }));
+
+            expect(apiServiceMock.get).toHaveBeenLastCalledWith(documentPath, {
+                status: 'pending,new', fields: 'id,status', page_size: 200, cursor: 'abc'
+            });
+        });
+    });
+
+    describe('nextCursor', () => {
+        it('should read the cursor from page.next and return null on the last page', () => {
+            expect(service.nextCursor({ next: '/api/document/?cursor=xyz', previous: null, results: [] })).toBe('xyz');
+            expect(service.nextCursor({ next: null, previous: null, results: [] })).toBeNull();
+        });
+    });
+
     describe('Type safety', () => {
         it('should return typed Document for getDocumentById', async () => {
             apiServiceMock.get.mockReturnValue(of(mockDocument));
@@ -155,7 +193,7 @@ describe('DocumentService', () => {
 
         it('should return typed Document array for getAllDocuments', async () => {
             const mockDocuments = [mockDocument];
-            apiServiceMock.get.mockReturnValue(of(mockDocuments));
+            apiServiceMock.get.mockReturnValue(of({ next: null, previous: null, results: mockDocuments }));
 
             const result = await firstValueFrom(service.getAllDocuments());
 
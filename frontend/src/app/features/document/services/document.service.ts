@@ -1,7 +1,8 @@
 // D:\Projetos\DesafioTecnico\ZapSign\frontend\src\app\features\document\services\document.service.ts
 import { Injectable } from '@angular/core';
-import { Observable } from 'rxjs';
-import { Document } from '../../../core/models/document.model';
+import { EMPTY, Observable } from 'rxjs';
+import { expand, reduce } from 'rxjs/operators';
+import { Document, DocumentListParams, DocumentPage } from '../../../core/models/document.model';
 import { ApiService } from '../../../core/services/api.service';
 
 @Injectable({
@@ -16,8 +17,32 @@ export class DocumentService {
 
   constructor(private apiService: ApiService) { }
 
-  getAllDocuments(): Observable<Document[]> {
-    return this.apiService.get<Document[]>(this.documentPath);
+  // Listagem paginada por cursor (use page.next para a próxima página)
+  getDocumentsPage(params: DocumentListParams = {}): Observable<DocumentPage> {
+    return this.apiService.get<DocumentPage>(this.documentPath, params);
+  }
+
+  // Todos os documentos do filtro: segue o cursor de page.next até a última
+  // página (páginas no tamanho máximo aceito pelo backend). Use filtros e
+  // `fields` para trazer só o necessário; listagens exibidas na tela devem
+  // paginar sob demanda com getDocumentsPage + nextCursor.
+  getAllDocuments(params: DocumentListParams = {}): Observable<Document[]> {
+    const pageSize = 200;
+    return this.getDocumentsPage({ ...params, page_size: pageSize }).pipe(
+      expand(page => {
+        const cursor = this.nextCursor(page);
+        return cursor ? this.getDocumentsPage({ ...params, page_size: pageSize, cursor }) : EMPTY;
+      }),
+      reduce((documents, page) => documents.concat(page.results), [] as Document[])
+    );
+  }
+
+  // Extrai o parâmetro "cursor" da URL absoluta de page.next (null na última página)
+  nextCursor(page: DocumentPage): string | null {
+    if (!page.next) {
+      return null;
+    }
+    return new URL(page.next, window.location.origin).searchParams.get('cursor');
   }
 
   getDocumentById(id: number): Observable<Document> {